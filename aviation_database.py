@@ -1,23 +1,348 @@
 import sqlite3
+import heapq
+from itertools import islice
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Sequence, Tuple
 import os
-import bcrypt
 import uuid
+from schedule_indexes import create_schedule_indexes, optimize
+from sqlite_profiles import DEFAULT_PROFILE
+from connection_pool import ConnectionPool, prepare_once
+from schedule_times import utc_fields, to_epoch, register_sqlite_functions
+from schedule_partitions import SchedulePartitions, WEEK
+from schedule_delta import ScheduleDelta, schedule_fingerprint, ensure_schedule_delta_schema
+from dimension_cache import DimensionCache
+from schedule_sink import ScheduleSink
+from schedule_mapping import extract_schedule
+from query_cache import QueryCache, cached, writes
+from schedule_rollups import ROLLUP_TABLES, ensure_schedule_rollups, rebuild_rollups, check_rollups
+from keyset import Cursor, keyset_condition, projection, iter_rows, keyed, take_page
+
+# Version of the schema create_tables() builds, stored in PRAGMA user_version.
+# Bump it whenever create_tables() gains a table, index or migration, so that
+# databases stamped with an older version run the DDL again on open.
+SCHEMA_VERSION = 3
+
+# Columns that identify one flight leg in flight_schedules
+SCHEDULE_NATURAL_KEY = ('airline_iata', 'flight_number', 'departure_iata',
+                        'departure_scheduled_time', 'flight_type')
+# The natural key as indexed: a missing column compares as '' rather than as
+# a NULL distinct from every other, so flights lacking e.g. an airline still
+# upsert onto their stored row
+SCHEDULE_NATURAL_KEY_SQL = ', '.join(f"COALESCE({column}, '')" for column in SCHEDULE_NATURAL_KEY)
+
+# Insert a schedule row; a flight seen again only refreshes the fields that
+# change as it progresses (status, actual times, gate and delay)
+SCHEDULE_UPSERT_SQL = f'''
+    INSERT INTO flight_schedules (
+        airline_iata, airline_id, flight_number,
+        departure_iata, departure_airport_id, departure_terminal,
+        departure_scheduled_time, departure_actual_time,
+        arrival_iata, arrival_airport_id, arrival_terminal,
+        arrival_scheduled_time, arrival_actual_time,
+        status, flight_type, codeshare_airline, codeshare_flight,
+        aircraft_registration, gate, delay_minutes,
+        departure_epoch, departure_utc_offset, arrival_epoch, arrival_utc_offset, fingerprint
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT ({SCHEDULE_NATURAL_KEY_SQL})
+    DO UPDATE SET
+        status = excluded.status,
+        departure_actual_time = COALESCE(excluded.departure_actual_time, flight_schedules.departure_actual_time),
+        arrival_actual_time = COALESCE(excluded.arrival_actual_time, flight_schedules.arrival_actual_time),
+        gate = COALESCE(excluded.gate, flight_schedules.gate),
+        delay_minutes = excluded.delay_minutes,
+        fingerprint = excluded.fingerprint,
+        query_timestamp = CURRENT_TIMESTAMP
+'''
+
+
+def schedule_storage_row(row: Tuple, airlines, airports) -> Tuple:
+    """
+    Turn a flattened schedule row into the values of SCHEDULE_UPSERT_SQL.
+    
+    flight_schedules keeps the IATA codes but stores the airline and airports
+    as ids into the dimension tables instead of repeating their ICAO codes and
+    names, so the codes must already be ensured in the DimensionCaches.
+    """
+    return ((row[0], airlines.id(row[0]), row[3], row[4], airports.id(row[4])) + row[6:9]
+            + (row[9], airports.id(row[9])) + row[11:])
+
+
+def schedule_details_query(table: str = 'flight_schedules') -> str:
+    """
+    SELECT over a flight_schedules table with the airline and airport ICAO
+    codes and names joined back in, in the columns' original order.
+    
+    Args:
+        table: Schedules table, e.g. a schema-qualified partition table
+    """
+    return f'''
+        SELECT flight_schedules.id, airline_iata, airline.icao_code AS airline_icao,
+               airline.name AS airline_name, flight_number,
+               departure_iata, departure_airport.icao_code AS departure_icao, departure_terminal,
+               departure_scheduled_time, departure_actual_time,
+               arrival_iata, arrival_airport.icao_code AS arrival_icao, arrival_terminal,
+               arrival_scheduled_time, arrival_actual_time,
+               status, flight_type, codeshare_airline, codeshare_flight,
+               aircraft_registration, gate, delay_minutes,
+               departure_epoch, departure_utc_offset, arrival_epoch, arrival_utc_offset, fingerprint,
+               query_timestamp, flight_schedules.created_at
+        FROM {table} AS flight_schedules
+        LEFT JOIN airlines AS airline ON airline.id = flight_schedules.airline_id
+        LEFT JOIN airports AS departure_airport ON departure_airport.id = flight_schedules.departure_airport_id
+        LEFT JOIN airports AS arrival_airport ON arrival_airport.id = flight_schedules.arrival_airport_id
+    '''
+
+
+def compact_schedules(conn: sqlite3.Connection) -> int:
+    """
+    Remove duplicate flight_schedules rows in place, keeping one row per natural key.
+    
+    The most recently inserted row of each flight is kept, since it carries the
+    latest status and actual times, and it inherits the earliest created_at.
+    
+    Args:
+        conn: Open connection to an aviation database
+        
+    Returns:
+        Number of duplicate rows removed
+    """
+    key = ', '.join(SCHEDULE_NATURAL_KEY)
+    with conn:
+        survivors = conn.execute(f'''
+            SELECT MAX(id), MIN(created_at) FROM flight_schedules
+            GROUP BY {key} HAVING COUNT(*) > 1
+        ''').fetchall()
+        conn.executemany('UPDATE flight_schedules SET created_at = ? WHERE id = ?',
+                         [(created_at, row_id) for row_id, created_at in survivors])
+        cursor = conn.execute(f'''
+            DELETE FROM flight_schedules
+            WHERE id NOT IN (SELECT MAX(id) FROM flight_schedules GROUP BY {key})
+        ''')
+    return cursor.rowcount
+
+
+# UTC columns derived from the local scheduled times at ingestion
+SCHEDULE_EPOCH_COLUMNS = ('departure_epoch', 'departure_utc_offset', 'arrival_epoch', 'arrival_utc_offset')
+
+
+def ensure_schedule_epoch_columns(conn: sqlite3.Connection) -> int:
+    """
+    Add the UTC epoch/offset columns to flight_schedules and backfill them.
+    
+    Databases created before the columns existed get them added, and every
+    existing row is converted from its local scheduled times in one UPDATE.
+    
+    Returns:
+        Number of rows backfilled
+    """
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(flight_schedules)')}
+    missing = [column for column in SCHEDULE_EPOCH_COLUMNS if column not in existing]
+    if not missing:
+        return 0
+    
+    with conn:
+        for column in missing:
+            conn.execute(f'ALTER TABLE flight_schedules ADD COLUMN {column} INTEGER')
+    backfilled = backfill_schedule_epochs(conn)
+    print(f"🕒 Backfilled UTC times for {backfilled:,} flight schedules")
+    return backfilled
+
+
+def ensure_dated_schedule_times(conn: sqlite3.Connection) -> int:
+    """
+    Prefix bare 'HH:MM' scheduled times with their local date.
+    
+    The flightsFuture client used to store bare times, so one flight on two
+    dates shared a natural key. The date is recovered from the UTC epoch and
+    offset; rows without them keep their bare time.
+    
+    Returns:
+        Number of times dated
+    """
+    dated = 0
+    with conn:
+        for prefix in ('departure', 'arrival'):
+            cursor = conn.execute(f'''
+                UPDATE flight_schedules SET {prefix}_scheduled_time =
+                    strftime('%Y-%m-%d', {prefix}_epoch + {prefix}_utc_offset * 60, 'unixepoch')
+                    || 'T' || trim({prefix}_scheduled_time)
+                WHERE length(trim({prefix}_scheduled_time)) <= 8 AND instr({prefix}_scheduled_time, ':')
+                  AND {prefix}_epoch IS NOT NULL AND {prefix}_utc_offset IS NOT NULL
+            ''')
+            dated += cursor.rowcount
+    if dated:
+        print(f"📅 Dated {dated:,} bare flightsFuture schedule times")
+    return dated
+
+
+def backfill_schedule_epochs(conn: sqlite3.Connection, only_missing: bool = True) -> int:
+    """
+    Recompute the UTC epoch/offset columns from the local scheduled times.
+    
+    Args:
+        conn: Open connection to an aviation database
+        only_missing: Only convert rows without a departure epoch, e.g. after
+                adding airports to airport_timezones.csv
+    
+    Returns:
+        Number of rows updated
+    """
+    register_sqlite_functions(conn)
+    query = '''
+        UPDATE flight_schedules SET
+            departure_epoch = utc_epoch(departure_scheduled_time, departure_iata),
+            departure_utc_offset = utc_offset(departure_scheduled_time, departure_iata),
+            arrival_epoch = utc_epoch(arrival_scheduled_time, arrival_iata),
+            arrival_utc_offset = utc_offset(arrival_scheduled_time, arrival_iata)
+    '''
+    if only_missing:
+        query += " WHERE departure_epoch IS NULL OR arrival_epoch IS NULL"
+    with conn:
+        cursor = conn.execute(query)
+    return cursor.rowcount
+
+
+# Text columns replaced by ids into the dimension tables: id column, dimension
+# table, IATA code column, and the columns the dimension table now holds
+SCHEDULE_DIMENSION_KEYS = (
+    ('airline_id', 'airlines', 'airline_iata', ('airline_icao', 'airline_name')),
+    ('departure_airport_id', 'airports', 'departure_iata', ('departure_icao',)),
+    ('arrival_airport_id', 'airports', 'arrival_iata', ('arrival_icao',)),
+)
+
+
+def ensure_schedule_dimension_keys(conn: sqlite3.Connection) -> int:
+    """
+    Move the airline/airport ICAO codes and names of flight_schedules into ids.
+    
+    Databases created before the id columns existed get them added and filled
+    from the airlines and airports tables, after adding any codes those lack,
+    and the repeated text columns are dropped. The flight_schedule_details
+    view is (re)created either way.
+    
+    Returns:
+        Number of rows converted
+    """
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(flight_schedules)')}
+    converted = 0
+    if 'airline_name' in existing:
+        with conn:
+            for id_column, table, code_column, text_columns in SCHEDULE_DIMENSION_KEYS:
+                if id_column not in existing:
+                    conn.execute(f'ALTER TABLE flight_schedules ADD COLUMN {id_column} INTEGER')
+                name = text_columns[1] if len(text_columns) > 1 else 'NULL'
+                # Codes whose ICAO code belongs to another row are added without it
+                for icao in (f'MAX({text_columns[0]})', 'NULL'):
+                    conn.execute(f'''
+                        INSERT INTO {table} (iata_code, icao_code, name)
+                        SELECT {code_column}, {icao}, MAX({name}) FROM flight_schedules
+                        WHERE {code_column} IS NOT NULL
+                          AND {code_column} NOT IN (SELECT iata_code FROM {table} WHERE iata_code IS NOT NULL)
+                        GROUP BY {code_column}
+                        ON CONFLICT DO NOTHING
+                    ''')
+                cursor = conn.execute(f'''
+                    UPDATE flight_schedules SET {id_column} =
+                        (SELECT id FROM {table} WHERE iata_code = flight_schedules.{code_column})
+                ''')
+                converted = max(converted, cursor.rowcount)
+            conn.execute('DROP VIEW IF EXISTS flight_schedule_details')
+            conn.execute('DROP INDEX IF EXISTS idx_schedules_airline_activity')
+            for _, _, _, text_columns in SCHEDULE_DIMENSION_KEYS:
+                for column in text_columns:
+                    conn.execute(f'ALTER TABLE flight_schedules DROP COLUMN {column}')
+        print(f"🔗 Moved airline and airport names of {converted:,} flight schedules into dimension ids")
+    
+    with conn:
+        conn.execute(f'CREATE VIEW IF NOT EXISTS flight_schedule_details AS {schedule_details_query()}')
+    return converted
+
+
+def ensure_schedule_natural_key(conn: sqlite3.Connection) -> int:
+    """
+    Create the unique natural-key index on flight_schedules.
+    
+    Databases written before the index existed may hold duplicates that block
+    it; those are compacted first. An index over the bare columns, which let
+    rows with a NULL key column be inserted again on every poll, is replaced.
+    
+    Returns:
+        Number of duplicate rows removed to create the index
+    """
+    create_index = f'''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_schedules_natural_key
+        ON flight_schedules({SCHEDULE_NATURAL_KEY_SQL})
+    '''
+    existing = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_schedules_natural_key'").fetchone()
+    if existing and 'COALESCE' not in existing[0]:
+        conn.execute('DROP INDEX idx_schedules_natural_key')
+    try:
+        conn.execute(create_index)
+        return 0
+    except sqlite3.IntegrityError:
+        removed = compact_schedules(conn)
+        conn.execute(create_index)
+        print(f"🧹 Removed {removed:,} duplicate flight schedules to enforce the natural key")
+        return removed
+
 
 class AviationDatabase:
     """Database manager for Aviation Edge API data."""
     
-    def __init__(self, db_path: str = "aviation_data.db"):
-        """Initialize the database connection and create tables."""
+    def __init__(self, db_path: str = "aviation_data.db", profile: Optional[str] = DEFAULT_PROFILE,
+                 partitions_dir: Optional[str] = None, readers: int = 0):
+        """
+        Initialize the database connection and create tables.
+        
+        The schema DDL runs only when the database's PRAGMA user_version is
+        older than SCHEMA_VERSION, and is not even checked again when the same
+        file is opened twice in one process.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            profile: Connection profile from sqlite_profiles ('ingest', 'serve' or
+                    'safe'), a dict of pragma overrides, or None for SQLite defaults
+            partitions_dir: Directory of weekly flight_schedules partitions, by
+                           default '<db name>_partitions' next to the database
+            readers: Read-only connections for reads, so one AviationDatabase can
+                    be shared by threads (see connection_pool). With 0, reads use
+                    the writer connection and the object stays single-threaded.
+        """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row  # Enable dict-like access
-        self.create_tables()
+        self.profile = profile
+        self.pool = ConnectionPool(db_path, profile, readers)
+        self.conn = self.pool.writer_conn  # Rows allow dict-like access
+        prepare_once(db_path, self.conn, self.create_tables)
+        self.query_cache = QueryCache(self.conn, writer_lock=self.pool.writer_lock)
+        self.delta = ScheduleDelta(self.conn)
+        self.airline_cache = DimensionCache(self.conn, 'airlines')
+        self.airport_cache = DimensionCache(self.conn, 'airports')
+        self._search_columns = None
+        self._order_columns = None
+        
+        if partitions_dir is None and db_path not in ('', ':memory:'):
+            partitions_dir = os.path.splitext(db_path)[0] + '_partitions'
+        self.partitions = SchedulePartitions(self.conn, partitions_dir) if partitions_dir else None
     
-    def create_tables(self):
-        """Create all necessary tables for aviation data."""
+    def create_tables(self, force: bool = False) -> bool:
+        """
+        Create all necessary tables for aviation data and migrate older layouts.
+        
+        Databases whose PRAGMA user_version is already SCHEMA_VERSION are left
+        alone, so opening an up-to-date database runs no DDL.
+        
+        Args:
+            force: Run the DDL regardless of the version, e.g. to recreate an
+                   index dropped by hand
+        
+        Returns:
+            Whether the DDL ran
+        """
+        if not force and self.conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return False
         cursor = self.conn.cursor()
         
         # Airlines table
@@ -73,16 +398,15 @@ class AviationDatabase:
             CREATE TABLE IF NOT EXISTS flight_schedules (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 airline_iata TEXT,
-                airline_icao TEXT,
-                airline_name TEXT,
+                airline_id INTEGER,
                 flight_number TEXT,
                 departure_iata TEXT,
-                departure_icao TEXT,
+                departure_airport_id INTEGER,
                 departure_terminal TEXT,
                 departure_scheduled_time TEXT,
                 departure_actual_time TEXT,
                 arrival_iata TEXT,
-                arrival_icao TEXT,
+                arrival_airport_id INTEGER,
                 arrival_terminal TEXT,
                 arrival_scheduled_time TEXT,
                 arrival_actual_time TEXT,
@@ -93,11 +417,16 @@ class AviationDatabase:
                 aircraft_registration TEXT,
                 gate TEXT,
                 delay_minutes INTEGER,
+                departure_epoch INTEGER,
+                departure_utc_offset INTEGER,
+                arrival_epoch INTEGER,
+                arrival_utc_offset INTEGER,
+                fingerprint INTEGER,
                 query_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (airline_iata) REFERENCES airlines(iata_code),
-                FOREIGN KEY (departure_iata) REFERENCES airports(iata_code),
-                FOREIGN KEY (arrival_iata) REFERENCES airports(iata_code)
+                FOREIGN KEY (airline_id) REFERENCES airlines(id),
+                FOREIGN KEY (departure_airport_id) REFERENCES airports(id),
+                FOREIGN KEY (arrival_airport_id) REFERENCES airports(id)
             )
         ''')
         
@@ -161,43 +490,44 @@ class AviationDatabase:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_routes_departure ON routes(departure_iata)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_routes_arrival ON routes(arrival_iata)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_routes_airline ON routes(airline_iata)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_departure ON flight_schedules(departure_iata)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_arrival ON flight_schedules(arrival_iata)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_airline ON flight_schedules(airline_iata)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_status ON flight_schedules(status)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_type ON flight_schedules(flight_type)')
+        ensure_schedule_epoch_columns(self.conn)
+        ensure_dated_schedule_times(self.conn)
+        ensure_schedule_delta_schema(self.conn)
+        ensure_schedule_dimension_keys(self.conn)
+        create_schedule_indexes(self.conn)
+        ensure_schedule_natural_key(self.conn)
+        ensure_schedule_rollups(self.conn)
         
         # New table indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_uuid ON users(user_uuid)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_mission_orders_user ON mission_orders(user_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_mission_orders_uuid ON mission_orders(order_uuid)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_mission_orders_status ON mission_orders(status)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_mission_orders_priority ON mission_orders(priority)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_mission_orders_departure_date ON mission_orders(departure_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mission_orders_created ON mission_orders(created_at)')
         
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         self.conn.commit()
+        return True
     
+    @writes('airlines')
     def insert_airline(self, iata_code: str, icao_code: str = None, name: str = None):
-        """Insert or update airline information."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO airlines (iata_code, icao_code, name, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (iata_code, icao_code, name))
-        self.conn.commit()
-        return cursor.lastrowid
+        """Insert or update airline information; returns its id."""
+        with self.conn:
+            self.airline_cache.ensure([(iata_code, icao_code, name)])
+        return self.airline_cache.id(iata_code)
     
+    @writes('airports')
     def insert_airport(self, iata_code: str, icao_code: str = None, name: str = None):
-        """Insert or update airport information."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO airports (iata_code, icao_code, name, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (iata_code, icao_code, name))
-        self.conn.commit()
-        return cursor.lastrowid
+        """Insert or update airport information; returns its id."""
+        with self.conn:
+            self.airport_cache.ensure([(iata_code, icao_code, name)])
+        return self.airport_cache.id(iata_code)
     
+    @writes('routes', 'airlines', 'airports')
     def insert_route(self, route_data: Dict[str, Any]):
         """Insert route data from Aviation Edge routes API."""
         cursor = self.conn.cursor()
@@ -240,65 +570,130 @@ class AviationDatabase:
         return cursor.lastrowid
     
     def insert_schedule(self, schedule_data: Dict[str, Any]):
-        """Insert flight schedule data from Aviation Edge timetable API."""
-        cursor = self.conn.cursor()
-        
-        # Extract nested data
-        airline = schedule_data.get('airline', {})
-        flight = schedule_data.get('flight', {})
-        departure = schedule_data.get('departure', {})
-        arrival = schedule_data.get('arrival', {})
-        codeshare = schedule_data.get('codeshared', {})
-        
-        # Ensure airlines and airports exist
-        airline_iata = airline.get('iataCode')
-        if airline_iata:
-            self.insert_airline(airline_iata, airline.get('icaoCode'), airline.get('name'))
-        
-        dep_iata = departure.get('iataCode')
-        if dep_iata:
-            self.insert_airport(dep_iata, departure.get('icaoCode'))
-        
-        arr_iata = arrival.get('iataCode')
-        if arr_iata:
-            self.insert_airport(arr_iata, arrival.get('icaoCode'))
-        
-        cursor.execute('''
-            INSERT INTO flight_schedules (
-                airline_iata, airline_icao, airline_name, flight_number,
-                departure_iata, departure_icao, departure_terminal,
-                departure_scheduled_time, departure_actual_time,
-                arrival_iata, arrival_icao, arrival_terminal,
-                arrival_scheduled_time, arrival_actual_time,
-                status, flight_type, codeshare_airline, codeshare_flight,
-                aircraft_registration, gate, delay_minutes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            airline.get('iataCode'),
-            airline.get('icaoCode'),
-            airline.get('name'),
-            flight.get('number'),
-            departure.get('iataCode'),
-            departure.get('icaoCode'),
-            departure.get('terminal'),
-            departure.get('scheduledTime'),
-            departure.get('actualTime'),
-            arrival.get('iataCode'),
-            arrival.get('icaoCode'),
-            arrival.get('terminal'),
-            arrival.get('scheduledTime'),
-            arrival.get('actualTime'),
-            schedule_data.get('status'),
-            schedule_data.get('type'),
-            codeshare.get('airline', {}).get('name') if codeshare else None,
-            codeshare.get('flight', {}).get('number') if codeshare else None,
-            schedule_data.get('aircraft', {}).get('registration') if schedule_data.get('aircraft') else None,
-            departure.get('gate'),
-            departure.get('delay')
-        ))
-        self.conn.commit()
-        return cursor.lastrowid
-    
+        """
+        Insert or refresh flight schedule data from Aviation Edge timetable API.
+
+        Returns the row id, or None when the flight is already stored unchanged.
+        """
+        return self.insert_schedule_row(self._schedule_to_row(schedule_data))
+
+    @writes('flight_schedules', 'airlines', 'airports', 'schedule_changes')
+    def insert_schedule_row(self, row: Tuple):
+        """
+        Insert or refresh one flattened schedule row from any API client.
+
+        Returns the row id, or None when the flight is already stored unchanged.
+        """
+        new, changed = self.delta.split([row])
+        if not new and not changed:
+            return None
+
+        with self.conn:
+            # Ensure airlines and airports exist
+            self.airline_cache.ensure([(row[0], row[1], row[2])])
+            self.airport_cache.ensure([(row[4], row[5], None), (row[9], row[10], None)])
+            self.delta.log_changes(changed)
+            # lastrowid is stale when the upsert updates: it is the last row
+            # inserted on the connection, e.g. the schedule_changes entry
+            schedule_id = self.conn.execute(
+                SCHEDULE_UPSERT_SQL + ' RETURNING id',
+                schedule_storage_row(row, self.airline_cache, self.airport_cache)).fetchone()[0]
+        self.delta.remember([row])
+        return schedule_id
+
+    @staticmethod
+    def _schedule_to_row(schedule_data: Dict[str, Any]) -> Tuple:
+        """
+        Flatten a timetable schedule dict into a flight_schedules row tuple.
+        
+        Fields are read with the shared extractor (see schedule_mapping). The
+        local scheduled times are also converted to UTC epoch seconds and
+        UTC offsets using the airport timezone table, and the row ends in the
+        fingerprint of its mutable fields (see schedule_delta).
+        """
+        row = extract_schedule(schedule_data)
+        row += utc_fields(row[4], row[7]) + utc_fields(row[9], row[12])
+        return row + (schedule_fingerprint(row),)
+
+    def bulk_insert_schedules(self, schedules: Iterable[Dict[str, Any]], batch_size: int = 500,
+                              only_changed: bool = True) -> int:
+        """
+        Upsert many timetable schedules using one transaction per batch.
+
+        Airlines and airports referenced by a batch are only written when new
+        or changed (see dimension_cache), then all schedule rows are written
+        with a single executemany call.
+        Flights already stored only have their mutable fields refreshed, and
+        by default only when those changed since the last poll; each change is
+        recorded in schedule_changes.
+
+        Args:
+            schedules: Iterable of schedule dictionaries from the timetable API
+            batch_size: Number of schedules written per transaction
+            only_changed: Skip flights whose fingerprint matches the stored one
+
+        Returns:
+            Number of schedule rows inserted or refreshed
+        """
+        with self.schedule_sink(batch_size, only_changed) as sink:
+            sink.add(self.schedule_rows(schedules))
+        return sink.stats['written']
+
+    @classmethod
+    def schedule_rows(cls, schedules: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+        """Flatten timetable schedule dicts into rows for a ScheduleSink."""
+        return map(cls._schedule_to_row, schedules)
+
+    def schedule_sink(self, batch_size: int = 500, only_changed: bool = True) -> ScheduleSink:
+        """
+        Open a sink that batches schedule rows from any API client into this database.
+
+        Args:
+            batch_size: Number of rows written per transaction
+            only_changed: Skip flights whose fingerprint matches the stored one
+
+        Returns:
+            ScheduleSink; flush() it, or use it as a context manager, to write the last batch
+        """
+        return ScheduleSink(self, batch_size, only_changed)
+
+    @writes('flight_schedules', 'airlines', 'airports', 'schedule_changes')
+    def write_schedule_rows(self, rows: List[Tuple], only_changed: bool = True) -> int:
+        """
+        Write flattened schedule rows, with their airlines and airports, in a single transaction.
+
+        This is the one write path for schedules from every API client; rows
+        come from a client's _schedule_to_row and end in their fingerprint.
+        Status and time changes are logged to schedule_changes either way;
+        only_changed=False also rewrites the rows that did not change.
+
+        Returns:
+            Number of schedule rows inserted or refreshed
+        """
+        new, changed = self.delta.split(rows)
+        if only_changed:
+            rows = new + changed
+        if not rows:
+            return 0
+
+        try:
+            with self.conn:
+                # Only airlines and airports that are new or changed are written
+                self.airline_cache.ensure((row[0], row[1], row[2]) for row in rows)
+                self.airport_cache.ensure(entry for row in rows
+                                          for entry in ((row[4], row[5], None), (row[9], row[10], None)))
+                self.delta.log_changes(changed)
+                self.conn.executemany(SCHEDULE_UPSERT_SQL, [
+                    schedule_storage_row(row, self.airline_cache, self.airport_cache) for row in rows])
+        except Exception:
+            self.airline_cache.reset()
+            self.airport_cache.reset()
+            raise
+        self.delta.remember(rows)
+
+        return len(rows)
+
+    @writes('api_usage')
     def log_api_usage(self, endpoint: str, query_params: Dict[str, Any], response_count: int):
         """Log API usage for tracking purposes."""
         cursor = self.conn.cursor()
@@ -308,126 +703,341 @@ class AviationDatabase:
         ''', (endpoint, json.dumps(query_params), response_count))
         self.conn.commit()
     
+    @cached('routes')
     def get_routes_summary(self):
         """Get summary statistics for routes."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_routes,
-                COUNT(DISTINCT airline_iata) as unique_airlines,
-                COUNT(DISTINCT departure_iata) as unique_departure_airports,
-                COUNT(DISTINCT arrival_iata) as unique_arrival_airports
-            FROM routes
-        ''')
-        return dict(cursor.fetchone())
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_routes,
+                    COUNT(DISTINCT airline_iata) as unique_airlines,
+                    COUNT(DISTINCT departure_iata) as unique_departure_airports,
+                    COUNT(DISTINCT arrival_iata) as unique_arrival_airports
+                FROM routes
+            ''')
+            return dict(cursor.fetchone())
     
+    @cached('flight_schedules')
     def get_schedules_summary(self):
         """Get summary statistics for flight schedules."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_schedules,
-                COUNT(DISTINCT airline_iata) as unique_airlines,
-                COUNT(DISTINCT departure_iata) as unique_departure_airports,
-                COUNT(DISTINCT arrival_iata) as unique_arrival_airports,
-                COUNT(CASE WHEN status = 'active' THEN 1 END) as active_flights,
-                COUNT(CASE WHEN status = 'landed' THEN 1 END) as landed_flights,
-                COUNT(CASE WHEN status = 'scheduled' THEN 1 END) as scheduled_flights,
-                COUNT(CASE WHEN flight_type = 'departure' THEN 1 END) as departures,
-                COUNT(CASE WHEN flight_type = 'arrival' THEN 1 END) as arrivals
-            FROM flight_schedules
-        ''')
-        return dict(cursor.fetchone())
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_schedules,
+                    COUNT(DISTINCT airline_iata) as unique_airlines,
+                    COUNT(DISTINCT departure_iata) as unique_departure_airports,
+                    COUNT(DISTINCT arrival_iata) as unique_arrival_airports,
+                    COUNT(CASE WHEN status = 'active' THEN 1 END) as active_flights,
+                    COUNT(CASE WHEN status = 'landed' THEN 1 END) as landed_flights,
+                    COUNT(CASE WHEN status = 'scheduled' THEN 1 END) as scheduled_flights,
+                    COUNT(CASE WHEN flight_type = 'departure' THEN 1 END) as departures,
+                    COUNT(CASE WHEN flight_type = 'arrival' THEN 1 END) as arrivals
+                FROM flight_schedules
+            ''')
+            return dict(cursor.fetchone())
     
+    @cached('api_usage')
     def get_api_usage_summary(self):
         """Get API usage statistics."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                endpoint,
-                COUNT(*) as call_count,
-                SUM(response_count) as total_records,
-                MIN(query_timestamp) as first_call,
-                MAX(query_timestamp) as last_call
-            FROM api_usage
-            GROUP BY endpoint
-        ''')
-        return [dict(row) for row in cursor.fetchall()]
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    endpoint,
+                    COUNT(*) as call_count,
+                    SUM(response_count) as total_records,
+                    MIN(query_timestamp) as first_call,
+                    MAX(query_timestamp) as last_call
+                FROM api_usage
+                GROUP BY endpoint
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
     
-    def get_airport_traffic(self, limit: int = 10):
-        """Get busiest airports by flight count."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                COALESCE(departure_iata, arrival_iata) as airport_code,
-                COUNT(*) as flight_count,
-                COUNT(CASE WHEN flight_type = 'departure' THEN 1 END) as departures,
-                COUNT(CASE WHEN flight_type = 'arrival' THEN 1 END) as arrivals
-            FROM flight_schedules
-            WHERE departure_iata IS NOT NULL OR arrival_iata IS NOT NULL
-            GROUP BY COALESCE(departure_iata, arrival_iata)
-            ORDER BY flight_count DESC
-            LIMIT ?
-        ''', (limit,))
-        return [dict(row) for row in cursor.fetchall()]
-    
-    def get_airline_activity(self, limit: int = 10):
-        """Get most active airlines by flight count."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                airline_iata,
-                airline_name,
-                COUNT(*) as flight_count,
-                COUNT(CASE WHEN status = 'active' THEN 1 END) as active_flights
-            FROM flight_schedules
-            WHERE airline_iata IS NOT NULL
-            GROUP BY airline_iata, airline_name
-            ORDER BY flight_count DESC
-            LIMIT ?
-        ''', (limit,))
-        return [dict(row) for row in cursor.fetchall()]
+    @cached('flight_schedules', 'airport_daily_traffic')
+    def get_airport_traffic(self, limit: int = 10, start_date: str = None, end_date: str = None):
+        """
+        Get busiest airports by flight count, read from the airport_daily_traffic rollup.
+
+        Args:
+            limit: Maximum number of airports
+            start_date: First local departure date counted (YYYY-MM-DD)
+            end_date: Last local departure date counted (YYYY-MM-DD)
+        """
+        days, params = self._rollup_days(start_date, end_date)
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT 
+                    airport_iata as airport_code,
+                    SUM(flights) as flight_count,
+                    SUM(CASE WHEN flight_type = 'departure' THEN flights ELSE 0 END) as departures,
+                    SUM(CASE WHEN flight_type = 'arrival' THEN flights ELSE 0 END) as arrivals
+                FROM airport_daily_traffic
+                WHERE airport_iata != '' {days}
+                GROUP BY airport_iata
+                ORDER BY flight_count DESC
+                LIMIT ?
+            ''', params + [limit])
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @cached('flight_schedules', 'airlines', 'airline_daily_activity')
+    def get_airline_activity(self, limit: int = 10, start_date: str = None, end_date: str = None):
+        """
+        Get most active airlines by flight count, read from the airline_daily_activity rollup.
+
+        Args:
+            limit: Maximum number of airlines
+            start_date: First local departure date counted (YYYY-MM-DD)
+            end_date: Last local departure date counted (YYYY-MM-DD)
+        """
+        days, params = self._rollup_days(start_date, end_date)
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT 
+                    activity.airline_iata,
+                    airlines.name as airline_name,
+                    activity.flight_count,
+                    activity.active_flights
+                FROM (
+                    SELECT 
+                        airline_iata,
+                        SUM(flights) as flight_count,
+                        SUM(CASE WHEN status = 'active' THEN flights ELSE 0 END) as active_flights
+                    FROM airline_daily_activity
+                    WHERE airline_iata != '' {days}
+                    GROUP BY airline_iata
+                ) AS activity
+                LEFT JOIN airlines ON airlines.iata_code = activity.airline_iata
+                ORDER BY activity.flight_count DESC
+                LIMIT ?
+            ''', params + [limit])
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @cached('flight_schedules', 'route_daily_frequency')
+    def get_route_frequency(self, limit: int = 10, start_date: str = None, end_date: str = None):
+        """
+        Get busiest departure/arrival airport pairs, read from the route_daily_frequency rollup.
+
+        Args:
+            limit: Maximum number of routes
+            start_date: First local departure date counted (YYYY-MM-DD)
+            end_date: Last local departure date counted (YYYY-MM-DD)
+
+        Returns:
+            Routes with flight_count, days operated and flights_per_day over those days
+        """
+        days, params = self._rollup_days(start_date, end_date)
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT 
+                    departure_iata,
+                    arrival_iata,
+                    SUM(flights) as flight_count,
+                    COUNT(CASE WHEN day != '' THEN 1 END) as days,
+                    ROUND(CAST(SUM(CASE WHEN day != '' THEN flights END) AS REAL)
+                          / COUNT(CASE WHEN day != '' THEN 1 END), 2) as flights_per_day
+                FROM route_daily_frequency
+                WHERE departure_iata != '' AND arrival_iata != '' {days}
+                GROUP BY departure_iata, arrival_iata
+                ORDER BY flight_count DESC
+                LIMIT ?
+            ''', params + [limit])
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @staticmethod
+    def _rollup_days(start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, List[str]]:
+        """AND-clause limiting a rollup's day column to a date range, with its params."""
+        conditions, params = [], []
+        if start_date:
+            conditions.append('day >= ?')
+            params.append(str(start_date)[:10])
+        if end_date:
+            conditions.append('day <= ?')
+            params.append(str(end_date)[:10])
+        return ''.join(f' AND {condition}' for condition in conditions), params
+    
+    @writes(*ROLLUP_TABLES)
+    def rebuild_rollups(self) -> Dict[str, int]:
+        """
+        Recompute the rollup tables from flight_schedules.
+
+        Returns:
+            Number of groups per rollup table that differed from flight_schedules
+            before the rebuild (all 0 when the triggers kept them consistent)
+        """
+        drift = check_rollups(self.conn)
+        rebuild_rollups(self.conn)
+        return drift
     
     def search_flights(self, departure_iata: str = None, arrival_iata: str = None, 
-                      airline_iata: str = None, status: str = None):
-        """Search flights with flexible criteria."""
-        cursor = self.conn.cursor()
-        
-        query = "SELECT * FROM flight_schedules WHERE 1=1"
-        params = []
-        
-        if departure_iata:
-            query += " AND departure_iata = ?"
-            params.append(departure_iata)
-        if arrival_iata:
-            query += " AND arrival_iata = ?"
-            params.append(arrival_iata)
-        if airline_iata:
-            query += " AND airline_iata = ?"
-            params.append(airline_iata)
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        
-        query += " ORDER BY departure_scheduled_time"
-        
-        cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+                      airline_iata: str = None, status: str = None,
+                      departs_after=None, departs_before=None,
+                      columns: Optional[Sequence[str]] = None, limit: Optional[int] = None):
+        """
+        Search flights with flexible criteria.
+        
+        departs_after/departs_before bound the departure in UTC (datetime, ISO
+        string or epoch seconds; naive values are UTC) and are answered from
+        the departure_epoch index. Windowed searches also cover the weekly
+        partitions the window overlaps (archived weeks are not searched);
+        unwindowed ones only the live table. Windowed results are ordered by
+        UTC departure, others by the local scheduled time, ties by id.
+        
+        columns limits each result dict to those flight_schedule_details
+        columns and limit caps the number of results. Use iter_flights to
+        stream large results or search_flights_page to page through them.
+        """
+        return list(self.iter_flights(departure_iata, arrival_iata, airline_iata, status,
+                                      departs_after, departs_before, columns=columns, limit=limit))
+    
+    def iter_flights(self, departure_iata: str = None, arrival_iata: str = None,
+                     airline_iata: str = None, status: str = None,
+                     departs_after=None, departs_before=None,
+                     columns: Optional[Sequence[str]] = None, limit: Optional[int] = None,
+                     after: Optional[Cursor] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield search_flights results without holding them all in memory.
+        
+        Rows are fetched batch_size at a time; see search_flights for the
+        criteria and order. after is a cursor from search_flights_page.
+        """
+        if limit is not None:
+            batch_size = max(1, min(batch_size, limit))
+        rows = self._flight_rows(departure_iata, arrival_iata, airline_iata, status,
+                                 departs_after, departs_before, columns, after, batch_size)
+        try:
+            for row, _ in islice(rows, limit):
+                yield row
+        finally:
+            rows.close()
+    
+    def search_flights_page(self, departure_iata: str = None, arrival_iata: str = None,
+                            airline_iata: str = None, status: str = None,
+                            departs_after=None, departs_before=None,
+                            columns: Optional[Sequence[str]] = None, page_size: int = 100,
+                            after: Optional[Cursor] = None) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Get one page of search_flights results using keyset pagination.
+        
+        Pass the returned cursor as after to get the next page. It is the
+        (departure_scheduled_time, id) of the page's last flight, or
+        (departure_epoch, id) for windowed searches, so every page is an
+        index seek however deep it is.
+        
+        Returns:
+            (flights, next_cursor); next_cursor is None on the last page
+        """
+        return take_page(self._flight_rows(departure_iata, arrival_iata, airline_iata, status,
+                                           departs_after, departs_before, columns, after,
+                                           page_size + 1), page_size)
     
+    def _schedule_columns(self, conn: sqlite3.Connection) -> Dict[str, str]:
+        """Columns of flight_schedule_details, which search results are made of."""
+        if self._search_columns is None:
+            described = conn.execute('SELECT * FROM flight_schedule_details LIMIT 0').description
+            self._search_columns = {column[0]: column[0] for column in described}
+        return self._search_columns
+    
+    def _flight_rows(self, departure_iata, arrival_iata, airline_iata, status,
+                     departs_after, departs_before, columns, after, batch_size):
+        """Yield (flight dict, cursor) pairs of a search, in search_flights order."""
+        with self.pool.reader() as conn:
+            yield from self._flight_rows_on(conn, departure_iata, arrival_iata, airline_iata, status,
+                                            departs_after, departs_before, columns, after, batch_size)
+    
+    def _flight_rows_on(self, conn, departure_iata, arrival_iata, airline_iata, status,
+                        departs_after, departs_before, columns, after, batch_size):
+        """_flight_rows on a checked-out connection."""
+        names = [name for name, _ in projection(columns, self._schedule_columns(conn))]
+        windowed = departs_after is not None or departs_before is not None
+        order = 'departure_epoch' if windowed else 'departure_scheduled_time'
+        
+        conditions = []
+        params = []
+        for column, value in (('departure_iata', departure_iata), ('arrival_iata', arrival_iata),
+                              ('airline_iata', airline_iata), ('status', status)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        condition, cursor_params = keyset_condition(order, 'id', after)
+        conditions.append(condition)
+        params.extend(cursor_params)
+        query = (f"SELECT {', '.join(names + [order, 'id'])} FROM {{source}} "
+                 f"WHERE {' AND '.join(conditions)}{{window}} ORDER BY {order}, id")
+        
+        def rows(source, low, high):
+            window = ''
+            window_params = []
+            if low is not None:
+                window += " AND departure_epoch >= ?"
+                window_params.append(low)
+            if high is not None:
+                window += " AND departure_epoch < ?"
+                window_params.append(high)
+            return iter_rows(conn.cursor(), query.format(source=source, window=window),
+                             params + window_params, batch_size)
+        
+        if not windowed:
+            yield from keyed(rows('flight_schedule_details', None, None), names)
+            return
+        
+        # Older weeks live in partition files. Walk the window in order, a
+        # week at a time where a partition covers it, so only one partition
+        # is attached at once and its rows merge with the live table's.
+        low = to_epoch(departs_after) if departs_after is not None else None
+        high = to_epoch(departs_before) if departs_before is not None else None
+        covering = self.partitions.covering(low, high) if self.partitions is not None else []
+        for partition in covering:
+            start = partition.start if low is None else max(low, partition.start)
+            end = partition.start + WEEK if high is None else min(high, partition.start + WEEK)
+            if low is None or low < start:
+                yield from keyed(rows('flight_schedule_details', low, start), names)
+            with self.partitions.attach(partition, conn) as schema:
+                details = schedule_details_query(f'{schema}.flight_schedules')
+                live, archived = rows('flight_schedule_details', start, end), rows(f'({details})', start, end)
+                try:
+                    yield from keyed(heapq.merge(live, archived, key=lambda row: (row[-2], row[-1])), names)
+                finally:
+                    # Finish both statements so the partition can be detached
+                    live.close()
+                    archived.close()
+            low = end
+        if low is None or high is None or low < high:
+            yield from keyed(rows('flight_schedule_details', low, high), names)
+
+    def get_schedule_changes(self, schedule_id: int):
+        """Get the recorded status, time, gate and delay changes of a flight, oldest first."""
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT field, old_value, new_value, changed_at
+                FROM schedule_changes
+                WHERE schedule_id = ?
+                ORDER BY changed_at, id
+            ''', (schedule_id,))
+            return [dict(row) for row in cursor.fetchall()]
+
     # ===========================================
     # USER MANAGEMENT METHODS
     # ===========================================
     
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
+        import bcrypt
         salt = bcrypt.gensalt()
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
     def verify_password(self, password: str, hashed: str) -> bool:
         """Verify a password against its hash."""
+        import bcrypt
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
     
+    @writes('users')
     def create_user(self, email: str, password: str, first_name: str = None, last_name: str = None, is_admin: bool = False):
         """Create a new user with secure password hashing."""
         cursor = self.conn.cursor()
@@ -459,6 +1069,7 @@ class AviationDatabase:
             'is_admin': is_admin
         }
     
+    @writes('users')
     def authenticate_user(self, email: str, password: str):
         """Authenticate user and update last login."""
         cursor = self.conn.cursor()
@@ -491,26 +1102,29 @@ class AviationDatabase:
     
     def get_user_by_id(self, user_id: int):
         """Get user by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT id, user_uuid, email, first_name, last_name, is_active, is_admin, created_at, last_login
-            FROM users WHERE id = ?
-        ''', (user_id,))
-        
-        user = cursor.fetchone()
-        return dict(user) if user else None
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, user_uuid, email, first_name, last_name, is_active, is_admin, created_at, last_login
+                FROM users WHERE id = ?
+            ''', (user_id,))
+            
+            user = cursor.fetchone()
+            return dict(user) if user else None
     
     def get_user_by_uuid(self, user_uuid: str):
         """Get user by UUID."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT id, user_uuid, email, first_name, last_name, is_active, is_admin, created_at, last_login
-            FROM users WHERE user_uuid = ?
-        ''', (user_uuid,))
-        
-        user = cursor.fetchone()
-        return dict(user) if user else None
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, user_uuid, email, first_name, last_name, is_active, is_admin, created_at, last_login
+                FROM users WHERE user_uuid = ?
+            ''', (user_uuid,))
+            
+            user = cursor.fetchone()
+            return dict(user) if user else None
     
+    @writes('users')
     def update_user(self, user_id: int, **kwargs):
         """Update user information."""
         cursor = self.conn.cursor()
@@ -536,6 +1150,7 @@ class AviationDatabase:
         
         return cursor.rowcount > 0
     
+    @writes('users')
     def change_password(self, user_id: int, new_password: str):
         """Change user password."""
         cursor = self.conn.cursor()
@@ -549,27 +1164,57 @@ class AviationDatabase:
         self.conn.commit()
         return cursor.rowcount > 0
     
-    def list_users(self, active_only: bool = True):
-        """List all users."""
-        cursor = self.conn.cursor()
-        
-        query = '''
-            SELECT id, user_uuid, email, first_name, last_name, is_active, is_admin, created_at, last_login
-            FROM users
-        '''
-        
+    # Columns list_users returns; password hashes are never listed
+    USER_LIST_COLUMNS = ('id', 'user_uuid', 'email', 'first_name', 'last_name', 'is_active', 'is_admin',
+                         'created_at', 'last_login')
+    
+    def list_users(self, active_only: bool = True, columns: Optional[Sequence[str]] = None,
+                   limit: Optional[int] = None):
+        """List users, newest first; columns picks from USER_LIST_COLUMNS."""
+        return list(self.iter_users(active_only, columns=columns, limit=limit))
+    
+    def iter_users(self, active_only: bool = True, columns: Optional[Sequence[str]] = None,
+                   limit: Optional[int] = None, after: Optional[Cursor] = None,
+                   batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield list_users results, fetched batch_size at a time."""
+        if limit is not None:
+            batch_size = max(1, min(batch_size, limit))
+        rows = self._user_rows(active_only, columns, after, batch_size)
+        try:
+            for row, _ in islice(rows, limit):
+                yield row
+        finally:
+            rows.close()
+    
+    def list_users_page(self, active_only: bool = True, columns: Optional[Sequence[str]] = None,
+                        page_size: int = 100, after: Optional[Cursor] = None
+                        ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Get one page of list_users results using keyset pagination on (created_at, id).
+        
+        Returns:
+            (users, next_cursor); pass next_cursor as after for the next page, None on the last page
+        """
+        return take_page(self._user_rows(active_only, columns, after, page_size + 1), page_size)
+    
+    def _user_rows(self, active_only, columns, after, batch_size):
+        """Yield (user dict, cursor) pairs, newest first."""
+        selected = projection(columns, {column: column for column in self.USER_LIST_COLUMNS})
+        names = [name for name, _ in selected]
+        # created_at is always filled by its DEFAULT, so the cursor can seek idx_users_created
+        condition, params = keyset_condition('created_at', 'id', after, descending=True, nullable=False)
+        query = f"SELECT {', '.join(names)}, created_at, id FROM users WHERE {condition}"
         if active_only:
-            query += " WHERE is_active = 1"
-        
-        query += " ORDER BY created_at DESC"
-        
-        cursor.execute(query)
-        return [dict(row) for row in cursor.fetchall()]
+            query += " AND is_active = 1"
+        query += " ORDER BY created_at DESC, id DESC"
+        with self.pool.reader() as conn:
+            yield from keyed(iter_rows(conn.cursor(), query, params, batch_size), names)
     
     # ===========================================
     # MISSION ORDER MANAGEMENT METHODS
     # ===========================================
     
+    @writes('mission_orders')
     def create_mission_order(self, user_id: int, title: str, **kwargs):
         """Create a new mission order."""
         cursor = self.conn.cursor()
@@ -628,36 +1273,40 @@ class AviationDatabase:
     
     def get_mission_order_by_id(self, order_id: int):
         """Get mission order by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM mission_orders WHERE id = ?', (order_id,))
-        
-        order = cursor.fetchone()
-        return dict(order) if order else None
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM mission_orders WHERE id = ?', (order_id,))
+            
+            order = cursor.fetchone()
+            return dict(order) if order else None
     
     def get_mission_order_by_uuid(self, order_uuid: str):
         """Get mission order by UUID."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM mission_orders WHERE order_uuid = ?', (order_uuid,))
-        
-        order = cursor.fetchone()
-        return dict(order) if order else None
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM mission_orders WHERE order_uuid = ?', (order_uuid,))
+            
+            order = cursor.fetchone()
+            return dict(order) if order else None
     
     def get_user_mission_orders(self, user_id: int, status: str = None):
         """Get all mission orders for a user."""
-        cursor = self.conn.cursor()
-        
-        query = "SELECT * FROM mission_orders WHERE user_id = ?"
-        params = [user_id]
-        
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        
-        query += " ORDER BY created_at DESC"
-        
-        cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = "SELECT * FROM mission_orders WHERE user_id = ?"
+            params = [user_id]
+            
+            if status:
+                query += " AND status = ?"
+                params.append(status)
+            
+            query += " ORDER BY created_at DESC"
+            
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
     
+    @writes('mission_orders')
     def update_mission_order(self, order_id: int, **kwargs):
         """Update mission order."""
         cursor = self.conn.cursor()
@@ -692,17 +1341,62 @@ class AviationDatabase:
         
         return cursor.rowcount > 0
     
-    def list_mission_orders(self, status: str = None, priority: str = None, limit: int = None):
-        """List mission orders with optional filters."""
-        cursor = self.conn.cursor()
-        
-        query = '''
-            SELECT mo.*, u.email, u.first_name, u.last_name
+    def list_mission_orders(self, status: str = None, priority: str = None, limit: int = None,
+                            columns: Optional[Sequence[str]] = None):
+        """
+        List mission orders with optional filters, newest first.
+        
+        Rows hold the order's columns and its owner's email, first_name and
+        last_name; columns picks a subset of them.
+        """
+        return list(self.iter_mission_orders(status, priority, limit=limit, columns=columns))
+    
+    def iter_mission_orders(self, status: str = None, priority: str = None, limit: int = None,
+                            columns: Optional[Sequence[str]] = None, after: Optional[Cursor] = None,
+                            batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield list_mission_orders results, fetched batch_size at a time."""
+        if limit:
+            batch_size = max(1, min(batch_size, limit))
+        rows = self._mission_order_rows(status, priority, columns, after, batch_size)
+        try:
+            for row, _ in islice(rows, limit or None):
+                yield row
+        finally:
+            rows.close()
+    
+    def list_mission_orders_page(self, status: str = None, priority: str = None,
+                                 columns: Optional[Sequence[str]] = None, page_size: int = 100,
+                                 after: Optional[Cursor] = None
+                                 ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Get one page of list_mission_orders results using keyset pagination on (created_at, id).
+        
+        Returns:
+            (orders, next_cursor); pass next_cursor as after for the next page, None on the last page
+        """
+        return take_page(self._mission_order_rows(status, priority, columns, after, page_size + 1),
+                         page_size)
+    
+    def _mission_order_columns(self) -> Dict[str, str]:
+        """Columns list_mission_orders returns, with the SQL expression of each."""
+        if self._order_columns is None:
+            with self.pool.reader() as conn:
+                order_columns = [row[1] for row in conn.execute('PRAGMA table_info(mission_orders)')]
+            self._order_columns = {column: f'mo.{column}' for column in order_columns}
+            self._order_columns.update({column: f'u.{column}' for column in ('email', 'first_name', 'last_name')})
+        return self._order_columns
+    
+    def _mission_order_rows(self, status, priority, columns, after, batch_size):
+        """Yield (mission order dict, cursor) pairs, newest first."""
+        selected = projection(columns, self._mission_order_columns())
+        names = [name for name, _ in selected]
+        condition, params = keyset_condition('mo.created_at', 'mo.id', after, descending=True, nullable=False)
+        query = f'''
+            SELECT {', '.join(expression for _, expression in selected)}, mo.created_at, mo.id
             FROM mission_orders mo
             JOIN users u ON mo.user_id = u.id
-            WHERE 1=1
+            WHERE {condition}
         '''
-        params = []
         
         if status:
             query += " AND mo.status = ?"
@@ -712,54 +1406,172 @@ class AviationDatabase:
             query += " AND mo.priority = ?"
             params.append(priority)
         
-        query += " ORDER BY mo.created_at DESC"
-        
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
-        
-        cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        query += " ORDER BY mo.created_at DESC, mo.id DESC"
+        with self.pool.reader() as conn:
+            yield from keyed(iter_rows(conn.cursor(), query, params, batch_size), names)
     
     def get_mission_order_statistics(self):
         """Get mission order statistics."""
-        cursor = self.conn.cursor()
-        
-        stats = {}
-        
-        # Total orders
-        cursor.execute('SELECT COUNT(*) as total FROM mission_orders')
-        stats['total_orders'] = cursor.fetchone()['total']
-        
-        # Orders by status
-        cursor.execute('''
-            SELECT status, COUNT(*) as count
-            FROM mission_orders
-            GROUP BY status
-        ''')
-        stats['by_status'] = {row['status']: row['count'] for row in cursor.fetchall()}
-        
-        # Orders by priority
-        cursor.execute('''
-            SELECT priority, COUNT(*) as count
-            FROM mission_orders
-            GROUP BY priority
-        ''')
-        stats['by_priority'] = {row['priority']: row['count'] for row in cursor.fetchall()}
-        
-        # Recent orders (last 30 days)
-        cursor.execute('''
-            SELECT COUNT(*) as recent
-            FROM mission_orders
-            WHERE created_at >= datetime('now', '-30 days')
-        ''')
-        stats['recent_orders'] = cursor.fetchone()['recent']
+        stats = self._mission_order_breakdown()
+        
+        # Recent orders (last 30 days); this moves with the clock, so it is
+        # not cached but counted from idx_mission_orders_created
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*) as recent
+                FROM mission_orders
+                WHERE created_at >= datetime('now', '-30 days')
+            ''')
+            stats['recent_orders'] = cursor.fetchone()['recent']
         
         return stats
     
+    @cached('mission_orders')
+    def _mission_order_breakdown(self):
+        """Order totals by status and priority."""
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            
+            stats = {}
+            
+            # Total orders
+            cursor.execute('SELECT COUNT(*) as total FROM mission_orders')
+            stats['total_orders'] = cursor.fetchone()['total']
+            
+            # Orders by status
+            cursor.execute('''
+                SELECT status, COUNT(*) as count
+                FROM mission_orders
+                GROUP BY status
+            ''')
+            stats['by_status'] = {row['status']: row['count'] for row in cursor.fetchall()}
+            
+            # Orders by priority
+            cursor.execute('''
+                SELECT priority, COUNT(*) as count
+                FROM mission_orders
+                GROUP BY priority
+            ''')
+            stats['by_priority'] = {row['priority']: row['count'] for row in cursor.fetchall()}
+            
+            return stats
+
+    def schedule_frame(self):
+        """
+        Load flight_schedules into a columnar ScheduleFrame for repeated analytics.
+
+        Keep the frame and call its refresh() to append newly collected schedules
+        instead of rescanning the table for every summary. Each load reads
+        through a pooled reader connection. Requires NumPy.
+        """
+        from schedule_frame import ScheduleFrame
+        return ScheduleFrame.from_pool(self.pool)
+
+    def export_parquet(self, path: str, partition_by=("departure_date", "departure_iata"),
+                       table: str = 'flight_schedules') -> int:
+        """
+        Export a table to Parquet in streamed record batches. Requires pyarrow.
+
+        Schedules are exported with their airline and airport ICAO codes and
+        names in place of the ids into this database's dimension tables.
+
+        Args:
+            path: Dataset directory, or a .parquet file when partition_by is empty
+            partition_by: Hive partition columns; table columns or 'departure_date'
+            table: Table to export
+
+        Returns:
+            Number of rows exported
+        """
+        from schedule_parquet import export_parquet
+        with self.pool.reader() as conn:
+            exported = export_parquet(conn, path, table=table, partition_by=partition_by)
+        print(f"📦 Exported {exported:,} rows from {table} to {path}")
+        return exported
+
+    @writes('flight_schedules', 'airlines', 'airports')
+    def import_parquet(self, path: str, table: str = 'flight_schedules', keep_ids: bool = True) -> int:
+        """
+        Bulk-load a Parquet file or dataset written by export_parquet. Requires pyarrow.
+
+        Airlines and airports of the schedules are ensured through this
+        database's dimension caches, so they get ids of its own.
+
+        Args:
+            path: Parquet file or dataset directory
+            table: Table to load into
+            keep_ids: Keep exported ids; pass False when merging into a database with data
+
+        Returns:
+            Number of rows inserted
+        """
+        from schedule_parquet import import_parquet
+        try:
+            imported = import_parquet(self.conn, path, table=table, keep_ids=keep_ids,
+                                      airlines=self.airline_cache, airports=self.airport_cache)
+        except Exception:
+            self.airline_cache.reset()
+            self.airport_cache.reset()
+            raise
+        finally:
+            self.delta.reset()
+        print(f"📥 Imported {imported:,} rows into {table} from {path}")
+        return imported
+
+    @writes('flight_schedules')
+    def apply_retention(self, policy: Optional[Dict[str, Optional[int]]] = None, now=None):
+        """
+        Move old weeks of flight_schedules into partition files and archive them.
+        
+        Args:
+            policy: Overrides of schedule_partitions.RETENTION_POLICY
+                   (hot_weeks, archive_after_weeks, delete_after_weeks)
+            now: Reference time, the current time if None
+            
+        Returns:
+            {'moved': rows, 'archived': [weeks], 'deleted': [weeks]}
+        """
+        if self.partitions is None:
+            return {'moved': 0, 'archived': [], 'deleted': []}
+        result = self.partitions.apply(policy, now)
+        if result['moved']:
+            self.delta.reset()
+        if any(result.values()):
+            print(f"🗄️ Retention: moved {result['moved']:,} schedules to weekly partitions, "
+                  f"archived {len(result['archived'])} weeks, deleted {len(result['deleted'])}")
+        return result
+    
+    def optimize(self, analyze: bool = True):
+        """
+        Refresh query planner statistics with ANALYZE and PRAGMA optimize.
+        
+        Call after bulk loads so the planner picks the composite indexes.
+        """
+        with self.pool.writer():
+            optimize(self.conn, analyze=analyze)
+    
+    @writes('flight_schedules')
+    def compact_schedules(self, vacuum: bool = True) -> int:
+        """
+        Deduplicate flight_schedules in place and reclaim the freed space.
+        
+        Args:
+            vacuum: Run VACUUM afterwards to shrink the database file
+            
+        Returns:
+            Number of duplicate rows removed
+        """
+        removed = compact_schedules(self.conn)
+        ensure_schedule_natural_key(self.conn)
+        self.delta.reset()
+        if vacuum:
+            self.conn.execute('VACUUM')
+        return removed
+    
     def close(self):
-        """Close the database connection."""
-        self.conn.close()
+        """Close the writer and reader connections."""
+        self.pool.close()
     
     def __enter__(self):
         return self
@@ -0,0 +1,540 @@
+"""
+Asyncio variants of the Aviation Edge API clients.
+
+AsyncAviationEdgeScheduleClient and AsyncAviationEdgeFutureSchedulesClient
+mirror the method surface of the synchronous clients, but share one httpx
+connection pool, bound in-flight requests with a semaphore and apply an
+overall per-request timeout that is safe to cancel.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+import httpx
+
+from aviation_edge_schedule_client import AviationEdgeScheduleClient
+from aviation_edge_future_client import AviationEdgeFutureSchedulesClient
+from aviation_database import AviationDatabase
+from http_transport import RETRY_STATUS_CODES, api_key_from_env, backoff_delay, parse_retry_after
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+
+class AsyncAviationEdgeTransport:
+    """Shared httpx connection pool with bounded concurrency, timeouts and retries."""
+
+    def __init__(self,
+                 max_concurrency: int = 10,
+                 connect_timeout: float = 5.0,
+                 read_timeout: float = 30.0,
+                 request_timeout: float = 60.0,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 backoff_max: float = 30.0,
+                 retry_after_max: float = 120.0,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            max_concurrency: Maximum requests in flight at once
+            connect_timeout: Seconds to wait for a TCP/TLS connection
+            read_timeout: Seconds to wait between bytes of the response
+            request_timeout: Overall seconds allowed for one attempt, including the body
+            max_retries: Retries after the first attempt on 429/5xx or connection errors
+            backoff_factor: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound for a computed backoff delay
+            retry_after_max: Upper bound for a server-provided Retry-After delay
+            cache: Optional response cache consulted before the network
+        """
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.cache = cache
+
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(max_connections=max_concurrency,
+                                    max_keepalive_connections=max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'timeouts': 0}
+
+    def _ensure_client(self):
+        # Created lazily so the pool and semaphore bind to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                  rate_limiter: Optional[TokenBucket] = None) -> httpx.Response:
+        """
+        Send a GET request, serving it from the response cache when possible.
+
+        Raises:
+            httpx.HTTPError: If the last attempt fails to connect or times out
+            asyncio.TimeoutError: If the last attempt exceeds request_timeout
+        """
+        if self.cache is None:
+            return await self._send(url, params, rate_limiter)
+
+        endpoint = self.cache.endpoint_for(url)
+        key = self.cache.make_key(endpoint, params)
+        entry = self.cache.lookup(key)
+        if entry and entry['fresh']:
+            return self._cached_response(url, entry)
+
+        response = await self._send(url, params, rate_limiter, self.cache.conditional_headers(entry))
+        ttl = self.cache.ttl_for(endpoint, params)
+        if response.status_code == 304 and entry:
+            self.cache.revalidated(key, ttl)
+            return self._cached_response(url, entry)
+
+        if response.status_code == 200 and not response.content.lstrip().startswith(b'{'):
+            self.cache.store(key, endpoint, response.content, ttl,
+                             response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response
+
+    @staticmethod
+    def _cached_response(url: str, entry: Dict[str, Any]) -> httpx.Response:
+        """Build a response object from a cached body."""
+        return httpx.Response(200, content=entry['body'],
+                              headers={'Content-Type': 'application/json'},
+                              request=httpx.Request('GET', url))
+
+    async def _send(self, url: str, params: Optional[Dict[str, Any]],
+                    rate_limiter: Optional[TokenBucket] = None,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        Send a GET request, retrying transient failures.
+
+        The semaphore slot is released on success, failure and cancellation
+        alike, and the response body is fully read before it is returned.
+        """
+        self._ensure_client()
+        attempt = 0
+        while True:
+            if rate_limiter:
+                await rate_limiter.acquire_async()
+
+            self.stats['requests'] += 1
+            try:
+                async with self._semaphore:
+                    response = await asyncio.wait_for(self._client.get(url, params=params, headers=headers),
+                                                       self.request_timeout)
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                if isinstance(e, (httpx.TimeoutException, asyncio.TimeoutError)):
+                    self.stats['timeouts'] += 1
+                if attempt >= self.max_retries:
+                    self.stats['failures'] += 1
+                    raise
+                delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                delay = parse_retry_after(response.headers.get('Retry-After'), self.retry_after_max)
+                if delay is None:
+                    delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+
+            self.stats['retries'] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+
+class AsyncAviationEdgeScheduleClient:
+    """Asyncio client for Aviation Edge Flight Schedules API (timetable endpoint)."""
+
+    AIRLINE_SEARCH_AIRPORTS = AviationEdgeScheduleClient.AIRLINE_SEARCH_AIRPORTS
+
+    # Pure helpers are shared with the synchronous client
+    filter_by_airline = AviationEdgeScheduleClient.filter_by_airline
+    filter_by_status = AviationEdgeScheduleClient.filter_by_status
+    format_schedule_info = AviationEdgeScheduleClient.format_schedule_info
+
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 transport: Optional[AsyncAviationEdgeTransport] = None):
+        """
+        Initialize the async Aviation Edge Schedule client.
+
+        Args:
+            api_key: API key for Aviation Edge. If not provided, will look for
+                    AVIATION_EDGE_API_KEY environment variable.
+            rate_limiter: Optional token bucket awaited before every request
+            transport: Optional shared async transport. One with the on-disk
+                    response cache is created if not provided.
+        """
+        self.api_key = api_key or api_key_from_env()
+        if not self.api_key:
+            raise ValueError("API key is required. Set AVIATION_EDGE_API_KEY environment variable or pass api_key parameter.")
+
+        self.base_url = "https://aviation-edge.com/v2/public/timetable"
+        self.rate_limiter = rate_limiter
+        self.transport = transport or AsyncAviationEdgeTransport(cache=ResponseCache())
+
+    async def get_schedules(self,
+                            iata_code: Optional[str] = None,
+                            icao_code: Optional[str] = None,
+                            type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get flight schedules from Aviation Edge API.
+
+        Args:
+            iata_code: Three-letter IATA code for airport
+            icao_code: Four-letter ICAO code for airport
+            type: Type of flights - 'departure' or 'arrival'
+
+        Returns:
+            List of schedule dictionaries containing flight information
+        """
+        params = {'key': self.api_key}
+
+        if iata_code:
+            params['iataCode'] = iata_code
+        if icao_code:
+            params['icaoCode'] = icao_code
+        if type:
+            params['type'] = type
+
+        try:
+            response = await self.transport.get(self.base_url, params=params, rate_limiter=self.rate_limiter)
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, asyncio.TimeoutError) as e:
+            print(f"Error making API request: {e!r}")
+            return []
+        except ValueError as e:
+            print(f"Error parsing JSON response: {e}")
+            return []
+
+    async def get_departures(self, airport_code: str) -> List[Dict[str, Any]]:
+        """Get departure schedules for an airport given its IATA or ICAO code."""
+        if len(airport_code) == 3:
+            return await self.get_schedules(iata_code=airport_code, type='departure')
+        return await self.get_schedules(icao_code=airport_code, type='departure')
+
+    async def get_arrivals(self, airport_code: str) -> List[Dict[str, Any]]:
+        """Get arrival schedules for an airport given its IATA or ICAO code."""
+        if len(airport_code) == 3:
+            return await self.get_schedules(iata_code=airport_code, type='arrival')
+        return await self.get_schedules(icao_code=airport_code, type='arrival')
+
+    async def get_all_schedules(self, airport_code: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Get departure and arrival schedules for an airport concurrently."""
+        departures, arrivals = await asyncio.gather(
+            self.get_departures(airport_code),
+            self.get_arrivals(airport_code)
+        )
+        return {'departures': departures, 'arrivals': arrivals}
+
+    async def get_airline_schedules(self, airline_code: str) -> List[Dict[str, Any]]:
+        """
+        Get schedules for an airline by searching the major airports concurrently.
+
+        Args:
+            airline_code: IATA or ICAO airline code
+
+        Returns:
+            List of unique schedules for the specified airline
+        """
+        responses = await asyncio.gather(
+            *(self.get_departures(airport) for airport in self.AIRLINE_SEARCH_AIRPORTS),
+            return_exceptions=True
+        )
+
+        unique_schedules = []
+        seen_flights = set()
+        for airport, departures in zip(self.AIRLINE_SEARCH_AIRPORTS, responses):
+            if isinstance(departures, BaseException):
+                print(f"Warning: Could not get schedules for {airport}: {departures}")
+                continue
+            for schedule in self.filter_by_airline(departures, airline_code):
+                flight_info = schedule.get('flight', {})
+                departure_info = schedule.get('departure', {})
+                key = (
+                    flight_info.get('number', ''),
+                    departure_info.get('scheduledTime', ''),
+                    departure_info.get('iataCode', '')
+                )
+                if key not in seen_flights:
+                    seen_flights.add(key)
+                    unique_schedules.append(schedule)
+
+        return unique_schedules
+
+    async def aclose(self):
+        """Close the underlying transport."""
+        await self.transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+class AsyncAviationEdgeFutureSchedulesClient:
+    """
+    Asyncio client for Aviation Edge Future Schedules API (flightsFuture endpoint).
+
+    Schedules are written through an AviationDatabase in a worker thread
+    (asyncio.to_thread), so the event loop keeps serving requests meanwhile.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, db_path: str = "aviation_data.db",
+                 rate_limiter: Optional[TokenBucket] = None,
+                 transport: Optional[AsyncAviationEdgeTransport] = None,
+                 database: Optional[AviationDatabase] = None):
+        """
+        Initialize the async Aviation Edge Future Schedules client.
+
+        Args:
+            api_key: API key for Aviation Edge. If not provided, will look for
+                    AVIATION_EDGE_API_KEY environment variable.
+            db_path: Path to SQLite database for storing schedule data
+            rate_limiter: Optional token bucket awaited before every request
+            transport: Optional shared async transport. One with the on-disk
+                    response cache is created if not provided.
+            database: Optional AviationDatabase to store schedules in, shared
+                    with other writers. One is opened on db_path if not provided.
+        """
+        self.api_key = api_key or api_key_from_env()
+        if not self.api_key:
+            raise ValueError("API key is required. Set AVIATION_EDGE_API_KEY environment variable or pass api_key parameter.")
+
+        self.base_url = "https://aviation-edge.com/v2/public/flightsFuture"
+        self.db_path = db_path
+        self.rate_limiter = rate_limiter
+        self.transport = transport or AsyncAviationEdgeTransport(cache=ResponseCache())
+        self._owns_database = database is None
+        self.database = database or AviationDatabase(db_path)
+        self._endpoint_available = True
+
+    def is_available(self) -> bool:
+        """Check if the Future Schedules API endpoint is available."""
+        return self._endpoint_available
+
+    def _save_schedules(self, schedules: List[Dict[str, Any]], batch_size: int, date: Optional[str]) -> int:
+        """Write schedules through the database's schedule sink; runs in a worker thread."""
+        with self.database.schedule_sink(batch_size) as sink:
+            sink.add(AviationEdgeFutureSchedulesClient.schedule_rows(schedules, date))
+        return sink.stats['written']
+
+    async def save_schedules_to_db(self, schedules: List[Dict[str, Any]], batch_size: int = 500,
+                                   date: Optional[str] = None) -> int:
+        """
+        Save multiple schedule entries for date (YYYY-MM-DD) to the database.
+
+        The write runs in a worker thread; writes from concurrent calls are
+        serialized by the database's writer connection.
+
+        Returns:
+            Number of schedule rows inserted or refreshed
+        """
+        if not schedules:
+            return 0
+        return await asyncio.to_thread(self._save_schedules, schedules, batch_size, date)
+
+    async def get_future_schedules(self,
+                                   iata_code: str,
+                                   type: str,
+                                   date: str,
+                                   airline_iata: Optional[str] = None,
+                                   airline_icao: Optional[str] = None,
+                                   flight_num: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get future flight schedules from Aviation Edge API.
+
+        Args:
+            iata_code: Three-letter IATA code for airport (required)
+            type: Either "departure" or "arrival" (required)
+            date: Future date in YYYY-MM-DD format (required)
+            airline_iata: Optional IATA code of an airline
+            airline_icao: Optional ICAO code of an airline
+            flight_num: Optional flight number to filter specific flight
+
+        Returns:
+            List of future schedule dictionaries containing flight information
+        """
+        params = AviationEdgeFutureSchedulesClient._build_params(
+            self.api_key, iata_code, type, date, airline_iata, airline_icao, flight_num)
+
+        try:
+            response = await self.transport.get(self.base_url, params=params, rate_limiter=self.rate_limiter)
+            if response.status_code == 404:
+                print(f"❌ Future Schedules API endpoint not available (404)")
+                print(f"   This may require a premium API plan or the endpoint may be inactive")
+                return []
+            response.raise_for_status()
+            data = response.json()
+
+            if isinstance(data, dict) and 'error' in data:
+                print(f"❌ API Error: {data['error']}")
+                return []
+
+            return data if isinstance(data, list) else []
+
+        except (httpx.HTTPError, asyncio.TimeoutError) as e:
+            print(f"Error making API request: {e!r}")
+            return []
+        except ValueError as e:
+            print(f"Error parsing JSON response: {e}")
+            return []
+
+    async def get_future_departures(self, airport_iata: str, date: str,
+                                    airline_iata: Optional[str] = None,
+                                    airline_icao: Optional[str] = None,
+                                    flight_num: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get future departures from a specific airport on a specific date."""
+        return await self.get_future_schedules(airport_iata, "departure", date,
+                                               airline_iata, airline_icao, flight_num)
+
+    async def get_future_arrivals(self, airport_iata: str, date: str,
+                                  airline_iata: Optional[str] = None,
+                                  airline_icao: Optional[str] = None,
+                                  flight_num: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get future arrivals to a specific airport on a specific date."""
+        return await self.get_future_schedules(airport_iata, "arrival", date,
+                                               airline_iata, airline_icao, flight_num)
+
+    async def search_future_routes(self, departure_airport: str, arrival_airport: str,
+                                   date: str) -> List[Dict[str, Any]]:
+        """Search for future routes between two airports on a specific date."""
+        departures = await self.get_future_departures(departure_airport, date)
+        return [flight for flight in departures
+                if flight.get('arrival', {}).get('iataCode', '').upper() == arrival_airport.upper()]
+
+    async def get_airline_future_flights(self, airline_code: str, airport_iata: str,
+                                         date: str, type: str = "departure") -> List[Dict[str, Any]]:
+        """Get future flights for an airline (IATA or ICAO code) from/to an airport."""
+        if len(airline_code) == 2:
+            return await self.get_future_schedules(airport_iata, type, date, airline_iata=airline_code)
+        return await self.get_future_schedules(airport_iata, type, date, airline_icao=airline_code)
+
+    async def get_specific_future_flight(self, airport_iata: str, date: str,
+                                         flight_num: str, type: str = "departure") -> List[Dict[str, Any]]:
+        """Get future schedule for a specific flight number from/to an airport."""
+        return await self.get_future_schedules(airport_iata, type, date, flight_num=flight_num)
+
+    async def get_and_save_future_schedules(self,
+                                            iata_code: str,
+                                            type: str,
+                                            date: str,
+                                            airline_iata: Optional[str] = None,
+                                            airline_icao: Optional[str] = None,
+                                            flight_num: Optional[str] = None,
+                                            save_to_db: bool = True) -> List[Dict[str, Any]]:
+        """Get future schedules and optionally save to database."""
+        schedules = await self.get_future_schedules(iata_code, type, date, airline_iata, airline_icao, flight_num)
+
+        if save_to_db and schedules:
+            saved_count = await self.save_schedules_to_db(schedules, date=date)
+            print(f"💾 Saved {saved_count}/{len(schedules)} schedules to database")
+
+            for schedule in schedules:
+                schedule['saved_to_db'] = True
+                schedule['db_save_timestamp'] = datetime.now().isoformat()
+
+        return schedules
+
+    async def collect_airport_future_data(self, airport_iata: str, date: str,
+                                          save_to_db: bool = True) -> Dict[str, Any]:
+        """
+        Collect departures and arrivals for an airport on a date concurrently.
+
+        Returns:
+            Dictionary with departures, arrivals, and summary statistics
+        """
+        departures, arrivals = await asyncio.gather(
+            self.get_and_save_future_schedules(airport_iata, "departure", date, save_to_db=save_to_db),
+            self.get_and_save_future_schedules(airport_iata, "arrival", date, save_to_db=save_to_db)
+        )
+
+        unique_airlines = set()
+        for flight in departures + arrivals:
+            airline = flight.get('airline', {})
+            if airline.get('iataCode'):
+                unique_airlines.add(airline['iataCode'])
+
+        return {
+            'airport': airport_iata,
+            'date': date,
+            'departures': departures,
+            'arrivals': arrivals,
+            'statistics': {
+                'total_flights': len(departures) + len(arrivals),
+                'total_departures': len(departures),
+                'total_arrivals': len(arrivals),
+                'unique_airlines': len(unique_airlines),
+                'airline_codes': sorted(unique_airlines)
+            },
+            'collection_timestamp': datetime.now().isoformat()
+        }
+
+    async def batch_collect_future_data(self,
+                                        airport_codes: List[str],
+                                        dates: List[str],
+                                        save_to_db: bool = True) -> Dict[str, Any]:
+        """
+        Batch collect future schedule data for every airport and date concurrently.
+
+        Concurrency is bounded by the transport semaphore and the rate limiter.
+
+        Returns:
+            Dictionary with results for each airport-date combination
+        """
+        combinations = [(airport, date) for airport in airport_codes for date in dates]
+        print(f"🚀 Starting async batch collection for {len(airport_codes)} airports × {len(dates)} dates = {len(combinations)} combinations")
+
+        outcomes = await asyncio.gather(
+            *(self.collect_airport_future_data(airport, date, save_to_db) for airport, date in combinations),
+            return_exceptions=True
+        )
+
+        results = {airport: {} for airport in airport_codes}
+        total_flights = 0
+        successful_collections = 0
+        for (airport, date), outcome in zip(combinations, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"❌ Error collecting data for {airport} on {date}: {outcome}")
+                results[airport][date] = {'error': str(outcome), 'airport': airport, 'date': date}
+            else:
+                results[airport][date] = outcome
+                total_flights += outcome['statistics']['total_flights']
+                successful_collections += 1
+
+        print(f"\n🎯 Batch collection complete!")
+        print(f"   ✅ Successful: {successful_collections}/{len(combinations)}")
+        print(f"   📊 Total flights collected: {total_flights}")
+
+        return {
+            'batch_results': results,
+            'summary': {
+                'total_combinations': len(combinations),
+                'successful_collections': successful_collections,
+                'failed_collections': len(combinations) - successful_collections,
+                'total_flights_collected': total_flights,
+                'collection_timestamp': datetime.now().isoformat()
+            }
+        }
+
+    async def aclose(self):
+        """Close the underlying transport, and the database if this client opened it."""
+        await self.transport.aclose()
+        if self._owns_database:
+            self.database.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -1,12 +1,13 @@
-import os
-import requests
-import sqlite3
-from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
+from typing import Optional, Dict, Any, List, Iterable, Iterator
 from datetime import datetime
-
-# Load environment variables
-load_dotenv()
+from rate_limiter import TokenBucket
+from http_transport import AviationEdgeTransport, api_key_from_env
+from response_cache import ResponseCache
+from aviation_database import AviationDatabase
+from schedule_times import utc_fields, dated_schedule_time
+from schedule_delta import schedule_fingerprint
+from schedule_mapping import extract_future_schedule
+from sqlite_profiles import DEFAULT_PROFILE
 
 class AviationEdgeFutureSchedulesClient:
     """
@@ -18,7 +19,11 @@ class AviationEdgeFutureSchedulesClient:
     a premium API plan or the endpoint may not be currently active.
     """
     
-    def __init__(self, api_key: Optional[str] = None, db_path: str = "aviation_data.db"):
+    def __init__(self, api_key: Optional[str] = None, db_path: str = "aviation_data.db",
+                 rate_limiter: Optional[TokenBucket] = None,
+                 transport: Optional[AviationEdgeTransport] = None,
+                 db_profile: Optional[str] = DEFAULT_PROFILE,
+                 database: Optional[AviationDatabase] = None):
         """
         Initialize the Aviation Edge Future Schedules client.
         
@@ -26,192 +31,113 @@ class AviationEdgeFutureSchedulesClient:
             api_key: API key for Aviation Edge. If not provided, will look for 
                     AVIATION_EDGE_API_KEY environment variable.
             db_path: Path to SQLite database for storing schedule data
+            rate_limiter: Optional token bucket acquired before every request
+            transport: Optional shared HTTP transport. A pooled transport with
+                    default timeouts, retries and the on-disk response cache
+                    is created if not provided.
+            db_profile: SQLite connection profile for db_path (see sqlite_profiles)
+            database: Optional AviationDatabase to store schedules in, shared with
+                    other writers. One is opened on db_path on first use if not provided.
         
         Raises:
             ValueError: If no API key is provided
             Warning: If the endpoint is not available
         """
-        self.api_key = api_key or os.getenv('AVIATION_EDGE_API_KEY')
+        self.api_key = api_key or api_key_from_env()
         if not self.api_key:
             raise ValueError("API key is required. Set AVIATION_EDGE_API_KEY environment variable or pass api_key parameter.")
         
         self.base_url = "https://aviation-edge.com/v2/public/flightsFuture"
         self.db_path = db_path
+        self.db_profile = db_profile
+        self.rate_limiter = rate_limiter
+        self.transport = transport or AviationEdgeTransport(cache=ResponseCache())
         
         # Test endpoint availability on initialization - skip for now to fix API access
         self._endpoint_available = True  # Changed from self._test_endpoint_availability()
         
-        # Initialize database connection
-        self._init_database()
+        self._database = database
     
-    def _init_database(self):
-        """Initialize database connection and ensure tables exist."""
-        try:
-            self.conn = sqlite3.connect(self.db_path)
-            self._create_tables_if_not_exist()
-        except Exception as e:
-            print(f"Database initialization error: {e}")
-            self.conn = None
-    
-    def _create_tables_if_not_exist(self):
-        """Create necessary tables if they don't exist."""
-        cursor = self.conn.cursor()
-        
-        # Create airlines table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS airlines (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                iata_code TEXT UNIQUE,
-                icao_code TEXT,
-                name TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create airports table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS airports (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                iata_code TEXT UNIQUE,
-                icao_code TEXT,
-                name TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Ensure flight_schedules table exists (should already exist)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS flight_schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                airline_iata TEXT,
-                airline_icao TEXT,
-                airline_name TEXT,
-                flight_number TEXT,
-                departure_iata TEXT,
-                departure_icao TEXT,
-                departure_terminal TEXT,
-                departure_scheduled_time TEXT,
-                departure_actual_time TEXT,
-                arrival_iata TEXT,
-                arrival_icao TEXT,
-                arrival_terminal TEXT,
-                arrival_scheduled_time TEXT,
-                arrival_actual_time TEXT,
-                status TEXT,
-                flight_type TEXT,
-                codeshare_airline TEXT,
-                codeshare_flight TEXT,
-                aircraft_registration TEXT,
-                gate TEXT,
-                delay_minutes INTEGER,
-                query_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        self.conn.commit()
+    @property
+    def database(self) -> AviationDatabase:
+        """The AviationDatabase that owns the schema and writes this client's schedules."""
+        if self._database is None:
+            self._database = AviationDatabase(self.db_path, self.db_profile)
+        return self._database
     
     def insert_airline(self, iata_code: str, icao_code: Optional[str] = None, name: Optional[str] = None):
-        """Insert or update airline information."""
-        if not self.conn:
-            return
-        
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO airlines (iata_code, icao_code, name, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (iata_code, icao_code, name))
-        self.conn.commit()
+        """Insert or update airline information; returns its id."""
+        return self.database.insert_airline(iata_code, icao_code, name)
     
     def insert_airport(self, iata_code: str, icao_code: Optional[str] = None, name: Optional[str] = None):
-        """Insert or update airport information."""
-        if not self.conn:
-            return
-        
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO airports (iata_code, icao_code, name, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (iata_code, icao_code, name))
-        self.conn.commit()
+        """Insert or update airport information; returns its id."""
+        return self.database.insert_airport(iata_code, icao_code, name)
     
-    def save_schedule_to_db(self, schedule_data: Dict[str, Any]) -> Optional[int]:
-        """Save a single schedule entry to the database."""
-        if not self.conn:
-            return None
-        
-        cursor = self.conn.cursor()
-        
-        # Extract nested data from Future Schedules API response format
-        airline = schedule_data.get('airline', {})
-        flight = schedule_data.get('flight', {})
-        departure = schedule_data.get('departure', {})
-        arrival = schedule_data.get('arrival', {})
-        aircraft = schedule_data.get('aircraft', {})
-        codeshare = schedule_data.get('codeshare', {})
-        
-        # Ensure airlines and airports exist
-        airline_iata = airline.get('iataCode')
-        if airline_iata:
-            self.insert_airline(airline_iata, airline.get('icaoCode'), airline.get('name'))
-        
-        dep_iata = departure.get('iataCode')
-        if dep_iata:
-            self.insert_airport(dep_iata, departure.get('icaoCode'))
-        
-        arr_iata = arrival.get('iataCode')
-        if arr_iata:
-            self.insert_airport(arr_iata, arrival.get('icaoCode'))
-        
-        cursor.execute('''
-            INSERT INTO flight_schedules (
-                airline_iata, airline_icao, airline_name, flight_number,
-                departure_iata, departure_icao, departure_terminal,
-                departure_scheduled_time, departure_actual_time,
-                arrival_iata, arrival_icao, arrival_terminal,
-                arrival_scheduled_time, arrival_actual_time,
-                status, flight_type, codeshare_airline, codeshare_flight,
-                aircraft_registration, gate, delay_minutes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            airline.get('iataCode'),
-            airline.get('icaoCode'),
-            airline.get('name'),
-            flight.get('number'),
-            departure.get('iataCode'),
-            departure.get('icaoCode'),
-            departure.get('terminal'),
-            departure.get('scheduledTime'),
-            departure.get('actualTime'),
-            arrival.get('iataCode'),
-            arrival.get('icaoCode'),
-            arrival.get('terminal'),
-            arrival.get('scheduledTime'),
-            arrival.get('actualTime'),
-            schedule_data.get('status', 'scheduled'),
-            schedule_data.get('type', 'passenger'),
-            codeshare.get('airline', {}).get('name') if codeshare else None,
-            codeshare.get('flight', {}).get('number') if codeshare else None,
-            aircraft.get('reg') if aircraft else None,
-            departure.get('gate'),
-            departure.get('delay')
-        ))
-        self.conn.commit()
-        return cursor.lastrowid
+    @staticmethod
+    def _schedule_to_row(schedule_data: Dict[str, Any], date: Optional[str] = None) -> tuple:
+        """
+        Flatten a Future Schedules API entry into a flight_schedules row tuple.
+        
+        Fields are read with the shared extractor (see schedule_mapping), with
+        'scheduled' and 'passenger' filling a missing status and type. The API
+        reports bare local 'HH:MM' times, so the UTC epoch columns are only
+        filled when the schedule date is known. An arrival that lands before
+        the departure in UTC is on a following day. With a date, the scheduled
+        times are stored as local 'YYYY-MM-DDTHH:MM' timestamps, so the same
+        flight on two dates keeps two rows (the time is part of the natural
+        key). The row ends in the fingerprint of its mutable fields (see
+        schedule_delta).
+        """
+        row = extract_future_schedule(schedule_data)
+        departure_epoch, departure_offset = utc_fields(row[4], row[7], date)
+        arrival_epoch, arrival_offset = utc_fields(row[9], row[12], date)
+        arrival_days = 0
+        if departure_epoch is not None and arrival_epoch is not None:
+            while arrival_epoch <= departure_epoch:
+                arrival_epoch += 86400
+                arrival_days += 1
+        
+        row = (row[:7] + (dated_schedule_time(row[7], date),) + row[8:12]
+               + (dated_schedule_time(row[12], date, arrival_days),) + row[13:])
+        row += (departure_epoch, departure_offset, arrival_epoch, arrival_offset)
+        return row + (schedule_fingerprint(row),)
+    
+    @classmethod
+    def schedule_rows(cls, schedules: Iterable[Dict[str, Any]], date: Optional[str] = None) -> Iterator[tuple]:
+        """Flatten Future Schedules API entries for date (YYYY-MM-DD) into rows for a ScheduleSink."""
+        return (cls._schedule_to_row(schedule, date) for schedule in schedules)
     
-    def save_schedules_to_db(self, schedules: List[Dict[str, Any]]) -> int:
-        """Save multiple schedule entries to the database."""
+    def save_schedule_to_db(self, schedule_data: Dict[str, Any], date: Optional[str] = None) -> Optional[int]:
+        """
+        Save a single schedule entry for date (YYYY-MM-DD) to the database.
+        
+        Returns the row id, or None when the flight is already stored unchanged.
+        """
+        return self.database.insert_schedule_row(self._schedule_to_row(schedule_data, date))
+    
+    def save_schedules_to_db(self, schedules: List[Dict[str, Any]], batch_size: int = 500,
+                             date: Optional[str] = None) -> int:
+        """
+        Save multiple schedule entries to the database.
+        
+        Rows go through the database's schedule sink, the same write path as
+        timetable schedules: one transaction per batch, airlines and airports
+        only written when new or changed, unchanged flights skipped.
+        
+        Args:
+            schedules: List of Future Schedules API entries
+            batch_size: Number of schedules written per transaction
+            date: Schedule date (YYYY-MM-DD) the bare API times belong to
+            
+        Returns:
+            Number of schedule rows inserted or refreshed
+        """
         if not schedules:
             return 0
         
-        saved_count = 0
-        for schedule in schedules:
-            if self.save_schedule_to_db(schedule):
-                saved_count += 1
-        
-        return saved_count
+        with self.database.schedule_sink(batch_size) as sink:
+            sink.add(self.schedule_rows(schedules, date))
+        return sink.stats['written']
     
     def _test_endpoint_availability(self) -> bool:
         """
@@ -221,7 +147,7 @@ class AviationEdgeFutureSchedulesClient:
             bool: True if endpoint is available, False otherwise
         """
         try:
-            test_response = requests.get(self.base_url, params={'key': self.api_key}, timeout=5)
+            test_response = self.transport.get(self.base_url, params={'key': self.api_key})
             if test_response.status_code == 404:
                 print("⚠️  WARNING: Future Schedules API endpoint (/flightsFuture) returned 404.")
                 print("   This endpoint may not be available on your current API plan.")
@@ -240,34 +166,19 @@ class AviationEdgeFutureSchedulesClient:
         """
         return self._endpoint_available
     
-    def get_future_schedules(self, 
-                           iata_code: str,
-                           type: str,
-                           date: str,
-                           airline_iata: Optional[str] = None,
-                           airline_icao: Optional[str] = None,
-                           flight_num: Optional[str] = None) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _build_params(api_key: str,
+                      iata_code: str,
+                      type: str,
+                      date: str,
+                      airline_iata: Optional[str] = None,
+                      airline_icao: Optional[str] = None,
+                      flight_num: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get future flight schedules from Aviation Edge API.
+        Validate future schedule arguments and build the request parameters.
         
-        Args:
-            iata_code: Three-letter IATA code for airport (required)
-            type: Either "departure" or "arrival" (required)
-            date: Future date in YYYY-MM-DD format (required)
-            airline_iata: Optional IATA code of an airline
-            airline_icao: Optional ICAO code of an airline
-            flight_num: Optional flight number to filter specific flight
-            
-        Returns:
-            List of future schedule dictionaries containing flight information.
-            Each response contains:
-            - weekday: Day of the week (as string number)
-            - departure: Departure airport and time details
-            - arrival: Arrival airport and time details
-            - aircraft: Aircraft information
-            - airline: Airline information
-            - flight: Flight details
-            - codeshared: Codeshare information
+        Raises:
+            ValueError: If a required parameter is missing or malformed
         """
         # Validate required parameters
         if not iata_code or len(iata_code) != 3:
@@ -295,7 +206,7 @@ class AviationEdgeFutureSchedulesClient:
                 raise ve
         
         params = {
-            'key': self.api_key,
+            'key': api_key,
             'iataCode': iata_code,
             'type': type,
             'date': date
@@ -309,8 +220,42 @@ class AviationEdgeFutureSchedulesClient:
         if flight_num:
             params['flight_num'] = flight_num
         
+        return params
+    
+    def get_future_schedules(self, 
+                           iata_code: str,
+                           type: str,
+                           date: str,
+                           airline_iata: Optional[str] = None,
+                           airline_icao: Optional[str] = None,
+                           flight_num: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get future flight schedules from Aviation Edge API.
+        
+        Args:
+            iata_code: Three-letter IATA code for airport (required)
+            type: Either "departure" or "arrival" (required)
+            date: Future date in YYYY-MM-DD format (required)
+            airline_iata: Optional IATA code of an airline
+            airline_icao: Optional ICAO code of an airline
+            flight_num: Optional flight number to filter specific flight
+            
+        Returns:
+            List of future schedule dictionaries containing flight information.
+            Each response contains:
+            - weekday: Day of the week (as string number)
+            - departure: Departure airport and time details
+            - arrival: Arrival airport and time details
+            - aircraft: Aircraft information
+            - airline: Airline information
+            - flight: Flight details
+            - codeshared: Codeshare information
+        """
+        import requests
+        params = self._build_params(self.api_key, iata_code, type, date, airline_iata, airline_icao, flight_num)
+        
         try:
-            response = requests.get(self.base_url, params=params)
+            response = self.transport.get(self.base_url, params=params, rate_limiter=self.rate_limiter)
             response.raise_for_status()
             data = response.json()
             
@@ -495,7 +440,7 @@ class AviationEdgeFutureSchedulesClient:
         schedules = self.get_future_schedules(iata_code, type, date, airline_iata, airline_icao, flight_num)
         
         if save_to_db and schedules:
-            saved_count = self.save_schedules_to_db(schedules)
+            saved_count = self.save_schedules_to_db(schedules, date=date)
             print(f"💾 Saved {saved_count}/{len(schedules)} schedules to database")
             
             # Add metadata to each schedule
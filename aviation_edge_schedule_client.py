@@ -1,27 +1,50 @@
-import os
-import requests
-from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
+import time
+from typing import Optional, Dict, Any, List, Iterator
+from rate_limiter import TokenBucket
+from http_transport import AviationEdgeTransport, api_key_from_env
+from response_cache import ResponseCache
+from json_stream import iter_json_array, JSONStreamError
+from schedule_mapping import SCHEDULE_FIELDS, select_fields, compile_mapper
 
-# Load environment variables
-load_dotenv()
+# Fields shown by format_schedule_info, with placeholders for missing ones
+_extract_display = compile_mapper(
+    select_fields(SCHEDULE_FIELDS, ('airline_name', 'airline_iata', 'flight_number',
+                                    'departure_iata', 'departure_scheduled_time', 'departure_terminal',
+                                    'arrival_iata', 'arrival_scheduled_time', 'arrival_terminal',
+                                    'status', 'flight_type', 'codeshare_airline', 'codeshare_flight')),
+    defaults={'airline_name': 'Unknown Airline', 'airline_iata': 'N/A', 'flight_number': 'N/A',
+              'departure_iata': 'N/A', 'departure_scheduled_time': 'N/A', 'departure_terminal': '',
+              'arrival_iata': 'N/A', 'arrival_scheduled_time': 'N/A', 'arrival_terminal': '',
+              'status': 'Unknown', 'flight_type': 'Unknown', 'codeshare_airline': '', 'codeshare_flight': ''},
+    name='extract_display')
 
 class AviationEdgeScheduleClient:
     """Client for Aviation Edge Flight Schedules API (timetable endpoint)."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Major airports searched for airline schedules
+    AIRLINE_SEARCH_AIRPORTS = ['MNL', 'DVO', 'CEB', 'ILO', 'NRT', 'HND', 'ICN', 'BKK', 'SIN', 'HKG']
+    
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 transport: Optional[AviationEdgeTransport] = None):
         """
         Initialize the Aviation Edge Schedule client.
         
         Args:
             api_key: API key for Aviation Edge. If not provided, will look for 
                     AVIATION_EDGE_API_KEY environment variable.
+            rate_limiter: Optional token bucket acquired before every request.
+                    Lets several threads share one client at the API quota.
+            transport: Optional shared HTTP transport. A pooled transport with
+                    default timeouts, retries and the on-disk response cache
+                    is created if not provided.
         """
-        self.api_key = api_key or os.getenv('AVIATION_EDGE_API_KEY')
+        self.api_key = api_key or api_key_from_env()
         if not self.api_key:
             raise ValueError("API key is required. Set AVIATION_EDGE_API_KEY environment variable or pass api_key parameter.")
         
         self.base_url = "https://aviation-edge.com/v2/public/timetable"
+        self.rate_limiter = rate_limiter
+        self.transport = transport or AviationEdgeTransport(cache=ResponseCache())
     
     def get_schedules(self, 
                      iata_code: Optional[str] = None,
@@ -38,6 +61,7 @@ class AviationEdgeScheduleClient:
         Returns:
             List of schedule dictionaries containing flight information
         """
+        import requests
         params = {'key': self.api_key}
         
         # Add optional parameters
@@ -49,7 +73,7 @@ class AviationEdgeScheduleClient:
             params['type'] = type
         
         try:
-            response = requests.get(self.base_url, params=params)
+            response = self.transport.get(self.base_url, params=params, rate_limiter=self.rate_limiter)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -59,6 +83,70 @@ class AviationEdgeScheduleClient:
             print(f"Error parsing JSON response: {e}")
             return []
     
+    def iter_schedules(self,
+                       iata_code: Optional[str] = None,
+                       icao_code: Optional[str] = None,
+                       type: Optional[str] = None,
+                       chunk_size: int = 64 * 1024,
+                       raise_errors: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream flight schedules from Aviation Edge API one at a time.
+        
+        The response array is parsed incrementally while it downloads, so memory
+        stays flat regardless of airport size. Feed the iterator straight into
+        AviationDatabase.bulk_insert_schedules to store it.
+        
+        Args:
+            iata_code: Three-letter IATA code for airport
+            icao_code: Four-letter ICAO code for airport
+            type: Type of flights - 'departure' or 'arrival'
+            chunk_size: Bytes read from the socket per parser step
+            raise_errors: Raise request and parse errors instead of printing them
+                    and ending the stream, so a caller can tell a response cut
+                    off mid-stream from a complete one
+            
+        Yields:
+            Schedule dictionaries containing flight information
+        
+        Raises:
+            requests.exceptions.RequestException, JSONStreamError: Only with raise_errors
+        """
+        import requests
+        params = {'key': self.api_key}
+        
+        if iata_code:
+            params['iataCode'] = iata_code
+        if icao_code:
+            params['icaoCode'] = icao_code
+        if type:
+            params['type'] = type
+        
+        try:
+            response = self.transport.get(self.base_url, params=params,
+                                          rate_limiter=self.rate_limiter, stream=True)
+        except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
+            print(f"Error making API request: {e}")
+            return
+        
+        try:
+            response.raise_for_status()
+            yield from iter_json_array(self.transport.iter_body(response, chunk_size=chunk_size))
+        except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
+            print(f"Error making API request: {e}")
+        except JSONStreamError as e:
+            if raise_errors:
+                raise
+            if isinstance(getattr(e, 'payload', None), dict) and 'error' in e.payload:
+                print(f"API Error: {e.payload['error']}")
+            else:
+                print(f"Error parsing JSON response: {e}")
+        finally:
+            response.close()
+    
     def get_departures(self, airport_code: str) -> List[Dict[str, Any]]:
         """
         Get departure schedules for a specific airport.
@@ -116,11 +204,9 @@ class AviationEdgeScheduleClient:
         Returns:
             List of schedules for the specified airline
         """
-        # Major airports to search for airline schedules
-        major_airports = ['MNL', 'DVO', 'CEB', 'ILO', 'NRT', 'HND', 'ICN', 'BKK', 'SIN', 'HKG']
         all_schedules = []
         
-        for airport in major_airports:
+        for airport in self.AIRLINE_SEARCH_AIRPORTS:
             try:
                 # Get departures for this airport
                 departures = self.get_departures(airport)
@@ -128,9 +214,9 @@ class AviationEdgeScheduleClient:
                 airline_departures = self.filter_by_airline(departures, airline_code)
                 all_schedules.extend(airline_departures)
                 
-                # Small delay to avoid overwhelming API
-                import time
-                time.sleep(0.5)
+                # Small delay to avoid overwhelming API when no rate limiter paces us
+                if not self.rate_limiter:
+                    time.sleep(0.5)
                 
             except Exception as e:
                 print(f"Warning: Could not get schedules for {airport}: {e}")
@@ -197,25 +283,10 @@ class AviationEdgeScheduleClient:
         Returns:
             Formatted string with schedule details
         """
-        airline = schedule.get('airline', {})
-        flight = schedule.get('flight', {})
-        departure = schedule.get('departure', {})
-        arrival = schedule.get('arrival', {})
-        
-        airline_name = airline.get('name', 'Unknown Airline')
-        airline_iata = airline.get('iataCode', 'N/A')
-        flight_number = flight.get('number', 'N/A')
-        
-        dep_airport = departure.get('iataCode', 'N/A')
-        dep_time = departure.get('scheduledTime', 'N/A')
-        dep_terminal = departure.get('terminal', '')
-        
-        arr_airport = arrival.get('iataCode', 'N/A')
-        arr_time = arrival.get('scheduledTime', 'N/A')
-        arr_terminal = arrival.get('terminal', '')
-        
-        status = schedule.get('status', 'Unknown')
-        flight_type = schedule.get('type', 'Unknown')
+        (airline_name, airline_iata, flight_number,
+         dep_airport, dep_time, dep_terminal,
+         arr_airport, arr_time, arr_terminal,
+         status, flight_type, codeshare_airline, codeshare_flight) = _extract_display(schedule)
         
         info = f"{airline_iata} {flight_number} - {airline_name}\n"
         info += f"Route: {dep_airport} → {arr_airport}\n"
@@ -229,11 +300,7 @@ class AviationEdgeScheduleClient:
         info += f"Status: {status}\n"
         info += f"Type: {flight_type}\n"
         
-        if schedule.get('codeshared'):
-            codeshare_info = schedule.get('codeshared', {})
-            airline_name = codeshare_info.get('airline', {}).get('name', '')
-            flight_num = codeshare_info.get('flight', {}).get('number', '')
-            if airline_name and flight_num:
-                info += f"Codeshare: {airline_name} {flight_num}\n"
+        if codeshare_airline and codeshare_flight:
+            info += f"Codeshare: {codeshare_airline} {codeshare_flight}\n"
         
         return info
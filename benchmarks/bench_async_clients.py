@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sync vs threaded vs asyncio fan-out against the local stub server.
+
+Usage:
+    python benchmarks/bench_async_clients.py [airports] [latency_seconds]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_edge_schedule_client import AviationEdgeScheduleClient
+from aviation_edge_async_client import AsyncAviationEdgeScheduleClient, AsyncAviationEdgeTransport
+from http_transport import AviationEdgeTransport
+from benchmarks.stub_server import StubAviationEdgeServer
+
+
+def airport_codes(count: int):
+    return [f"{chr(65 + i // 676 % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}" for i in range(count)]
+
+
+def run_sync(server, airports):
+    client = AviationEdgeScheduleClient(api_key='bench', transport=AviationEdgeTransport())
+    client.base_url = server.url('/timetable')
+    return sum(len(client.get_departures(airport)) for airport in airports)
+
+
+def run_threaded(server, airports, workers):
+    client = AviationEdgeScheduleClient(api_key='bench', transport=AviationEdgeTransport(pool_size=workers))
+    client.base_url = server.url('/timetable')
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(len(result) for result in pool.map(client.get_departures, airports))
+
+
+async def run_async(server, airports, concurrency):
+    transport = AsyncAviationEdgeTransport(max_concurrency=concurrency)
+    async with AsyncAviationEdgeScheduleClient(api_key='bench', transport=transport) as client:
+        client.base_url = server.url('/timetable')
+        results = await asyncio.gather(*(client.get_departures(airport) for airport in airports))
+    return sum(len(result) for result in results)
+
+
+def timed(label, airports, func, *args):
+    start = time.perf_counter()
+    records = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<24} {elapsed:7.2f}s  {len(airports) / elapsed:8.1f} req/s  {records:,} records")
+
+
+def main(count: int, latency: float):
+    airports = airport_codes(count)
+    print(f"📊 Fetching departures for {count} airports ({latency * 1000:.0f} ms stub latency)")
+    with StubAviationEdgeServer(latency=latency, schedules_per_response=50) as server:
+        server.warm('/timetable', airports)
+        timed("sync sequential", airports, run_sync, server, airports)
+        timed("threads (10 workers)", airports, run_threaded, server, airports, 10)
+        timed("asyncio (10 in flight)", airports, lambda: asyncio.run(run_async(server, airports, 10)))
+        timed("asyncio (50 in flight)", airports, lambda: asyncio.run(run_async(server, airports, 50)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.05)
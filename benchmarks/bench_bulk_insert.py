@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row insert_schedule vs bulk_insert_schedules.
+
+Usage:
+    python benchmarks/bench_bulk_insert.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules
+
+
+def run(rows: int):
+    schedules = list(make_schedules(rows))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with AviationDatabase(os.path.join(tmp, "per_row.db")) as db:
+            start = time.perf_counter()
+            for schedule in schedules:
+                db.insert_schedule(schedule)
+            per_row = time.perf_counter() - start
+            dimensions = {'airlines': db.airline_cache.get_stats(), 'airports': db.airport_cache.get_stats()}
+
+        with AviationDatabase(os.path.join(tmp, "bulk.db")) as db:
+            start = time.perf_counter()
+            db.bulk_insert_schedules(schedules)
+            bulk = time.perf_counter() - start
+
+    print(f"📊 Inserting {rows:,} schedules")
+    print(f"   insert_schedule:       {per_row:8.3f}s  {rows / per_row:12,.0f} rows/sec")
+    print(f"   bulk_insert_schedules: {bulk:8.3f}s  {rows / bulk:12,.0f} rows/sec")
+    print(f"   Speedup: {per_row / bulk:.1f}x")
+    for table, stats in dimensions.items():
+        print(f"   {table} cache (per-row run): {stats['hit_ratio']:.1%} hits, "
+              f"{stats['inserts'] + stats['updates']:,} writes for {rows:,} schedules")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
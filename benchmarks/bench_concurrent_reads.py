@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: read latency while the collector is ingesting, with SQLite's
+default connection settings vs the ingest/serve profiles.
+
+One writer thread bulk-loads schedules in batches while reader threads run
+search_flights on their own connections. "alone" is the same ingest with no
+readers; with readers the writer also competes with them for the GIL.
+
+Usage:
+    python benchmarks/bench_concurrent_reads.py [rows] [readers]
+"""
+
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules, AIRPORTS
+
+SCENARIOS = [
+    ('SQLite defaults', None, None),
+    ('ingest + serve', 'ingest', 'serve'),
+    ('safe + safe', 'safe', 'safe'),
+]
+
+
+def reader(db_path, profile, index, writing, latencies, errors):
+    with AviationDatabase(db_path, profile=profile) as db:
+        departure = AIRPORTS[index % len(AIRPORTS)]
+        arrival = AIRPORTS[(index + 7) % len(AIRPORTS)]
+        while writing.is_set():
+            start = time.perf_counter()
+            try:
+                db.search_flights(departure_iata=departure, arrival_iata=arrival)
+                latencies.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                errors.append(time.perf_counter() - start)
+
+
+def ingest_alone(writer_profile, schedules, batch_size=500):
+    with tempfile.TemporaryDirectory() as tmp:
+        with AviationDatabase(os.path.join(tmp, "alone.db"), profile=writer_profile) as writer:
+            start = time.perf_counter()
+            for offset in range(0, len(schedules), batch_size):
+                writer.bulk_insert_schedules(schedules[offset:offset + batch_size])
+            return time.perf_counter() - start
+
+
+def run(label, writer_profile, reader_profile, schedules, readers, batch_size=500):
+    alone = ingest_alone(writer_profile, schedules, batch_size)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "concurrent.db")
+        latencies, errors = [], []
+        writing = threading.Event()
+        writing.set()
+
+        with AviationDatabase(db_path, profile=writer_profile) as writer:
+            threads = [threading.Thread(target=reader,
+                                        args=(db_path, reader_profile, i, writing, latencies, errors))
+                       for i in range(readers)]
+            for thread in threads:
+                thread.start()
+
+            start = time.perf_counter()
+            for offset in range(0, len(schedules), batch_size):
+                writer.bulk_insert_schedules(schedules[offset:offset + batch_size])
+            ingest = time.perf_counter() - start
+
+            writing.clear()
+            for thread in threads:
+                thread.join()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    print(f"   {label:<16} {alone:8.2f}s {ingest:8.2f}s {len(latencies):>8,} "
+          f"{statistics.median(latencies) * 1000 if latencies else 0:>8.2f} {p95 * 1000:>8.2f} "
+          f"{(latencies[-1] if latencies else 0) * 1000:>9.2f} {len(errors):>7}")
+
+
+def main(rows: int, readers: int):
+    schedules = list(make_schedules(rows))
+    print(f"📊 Ingesting {rows:,} schedules while {readers} readers search flights")
+    print(f"   {'profile':<16} {'alone':>9} {'ingest':>9} {'reads':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>9} {'errors':>7}")
+    for label, writer_profile, reader_profile in SCENARIOS:
+        run(label, writer_profile, reader_profile, schedules, readers)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
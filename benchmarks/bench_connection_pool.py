@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request handlers reading while the collector ingests.
+
+Worker threads each serve a number of requests (a route search and the
+airport traffic report) while a writer thread keeps ingesting schedules:
+
+- "open per request + DDL": every request opens its own AviationDatabase and
+  runs the schema DDL, as every construction did before connection_pool.
+- "open per request": the same, with the DDL skipped on an up-to-date database.
+- "shared pool": one AviationDatabase with read-only connections is shared
+  by every thread, so requests only check out a reader.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [rows] [threads] [requests_per_thread]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules, AIRPORTS
+
+
+def serve(db, index):
+    departure = AIRPORTS[index % len(AIRPORTS)]
+    arrival = AIRPORTS[(index + 7) % len(AIRPORTS)]
+    db.search_flights(departure_iata=departure, arrival_iata=arrival)
+    db.get_airport_traffic(10)
+
+
+def run(mode, path, threads, requests, ingest_batches, readers):
+    shared = AviationDatabase(path, readers=readers) if mode == 'shared pool' else None
+    latencies, errors = [], []
+    writing = threading.Event()
+    writing.set()
+    written = [0, 0.0]
+
+    def writer():
+        db = shared or AviationDatabase(path)
+        start = time.perf_counter()
+        try:
+            for batch in ingest_batches:
+                if not writing.is_set():
+                    break
+                written[0] += db.bulk_insert_schedules(batch)
+        finally:
+            written[1] = time.perf_counter() - start
+            if db is not shared:
+                db.close()
+
+    def worker(thread_index):
+        for request in range(requests):
+            start = time.perf_counter()
+            try:
+                if shared is not None:
+                    serve(shared, thread_index + request)
+                else:
+                    with AviationDatabase(path) as db:
+                        if mode == 'open per request + DDL':
+                            db.create_tables(force=True)
+                        serve(db, thread_index + request)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(e)
+
+    ingest = threading.Thread(target=writer)
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    ingest.start()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    writing.clear()
+    ingest.join()
+    pool_stats = shared.pool.get_stats() if shared else None
+    if shared:
+        shared.close()
+
+    latencies.sort()
+    print(f"   {mode:<24} {len(latencies) / elapsed:9.0f} {statistics.median(latencies) * 1000:8.2f} "
+          f"{latencies[int(len(latencies) * 0.95)] * 1000:8.2f} {written[0] / written[1]:13,.0f} {len(errors):>7}")
+    if errors:
+        print(f"      first error: {errors[0]!r}")
+    if pool_stats:
+        print(f"      pool: {pool_stats['readers_open']} readers opened, {pool_stats['reads']:,} checkouts, "
+              f"{pool_stats['read_waits']:,} waited {pool_stats['read_wait_seconds']:.2f}s in total")
+
+
+def main(rows: int, threads: int, requests: int):
+    schedules = list(make_schedules(rows * 2))
+    batches = [schedules[offset:offset + 500] for offset in range(rows, len(schedules), 500)]
+    print(f"📊 {threads} threads × {requests} requests over {rows:,} schedules while ingesting")
+    print(f"   {'mode':<24} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'ingest rows/s':>13} {'errors':>7}")
+    for mode in ('open per request + DDL', 'open per request', 'shared pool'):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pool.db")
+            with AviationDatabase(path, profile='ingest') as db:
+                db.bulk_insert_schedules(schedules[:rows])
+                db.optimize()
+            run(mode, path, threads, requests, batches, readers=threads)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 200)
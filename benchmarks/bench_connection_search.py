@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: connecting-flight search over a synthetic hub-and-spoke network.
+
+Builds a ConnectionSearchEngine over N legs (default 1,000,000 over a week)
+and times earliest-arrival, fewest-legs and one-stop enumeration queries.
+For comparison, the one-stop query is also run as an indexed SQL self-join
+on flight_schedules.
+
+Usage:
+    python benchmarks/bench_connection_search.py [legs] [queries]
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_search import ConnectionSearchEngine
+
+AIRPORT_COUNT = 400
+HUB_COUNT = 25
+BASE = datetime(2025, 10, 1)
+
+ONE_STOP_SQL = '''
+    SELECT a.flight_number, b.flight_number, b.arrival_scheduled_time
+    FROM flight_schedules a
+    JOIN flight_schedules b
+      ON b.departure_iata = a.arrival_iata
+     AND b.departure_scheduled_time >= strftime('%Y-%m-%dT%H:%M:%S', a.arrival_scheduled_time, '+45 minutes')
+    WHERE a.departure_iata = ? AND b.arrival_iata = ?
+      AND a.departure_scheduled_time >= ? AND b.arrival_scheduled_time <= ?
+    ORDER BY b.arrival_scheduled_time
+'''
+
+
+def make_network(count: int, seed: int = 7):
+    """Yield (airline, flight, departure, arrival, departure_time, arrival_time) legs."""
+    rng = random.Random(seed)
+    airports = [f"{chr(65 + i // 676 % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}"
+                for i in range(AIRPORT_COUNT)]
+    hubs = airports[:HUB_COUNT]
+    week = 7 * 24 * 60
+    for number in range(count):
+        if rng.random() < 0.4:
+            departure, arrival = rng.sample(hubs, 2)
+        else:
+            hub, spoke = rng.choice(hubs), rng.choice(airports[HUB_COUNT:])
+            departure, arrival = (hub, spoke) if rng.random() < 0.5 else (spoke, hub)
+        departs = BASE + timedelta(minutes=rng.randrange(0, week, 5))
+        arrives = departs + timedelta(minutes=rng.randrange(50, 12 * 60, 5))
+        yield ('XX', str(number), departure, arrival,
+               departs.strftime('%Y-%m-%dT%H:%M:%S'), arrives.strftime('%Y-%m-%dT%H:%M:%S'))
+
+
+def timed(queries, search):
+    times = []
+    found = 0
+    for origin, destination, depart_after in queries:
+        start = time.perf_counter()
+        result = search(origin, destination, depart_after)
+        times.append(time.perf_counter() - start)
+        found += bool(result)
+    times.sort()
+    return statistics.mean(times) * 1000, times[int(len(times) * 0.95)] * 1000, found
+
+
+def main(leg_count: int, query_count: int):
+    print(f"📊 Connection search over {leg_count:,} synthetic legs")
+    legs = list(make_network(leg_count))
+    airports = sorted({leg[2] for leg in legs} | {leg[3] for leg in legs})
+
+    start = time.perf_counter()
+    engine = ConnectionSearchEngine(legs)
+    print(f"   Graph build: {time.perf_counter() - start:.1f}s for {engine.leg_count:,} legs, "
+          f"{len(engine.airports)} airports, {sum(len(r) for r in engine.routes):,} routes")
+
+    rng = random.Random(1)
+    queries = [(*rng.sample(airports, 2), BASE + timedelta(hours=rng.randrange(0, 96)))
+               for _ in range(query_count)]
+
+    print(f"   {'query':<34} {'mean ms':>9} {'p95 ms':>9} {'found':>7}")
+    for label, search in [
+        ('earliest arrival (≤4 legs)', lambda o, d, t: engine.earliest_arrival(o, d, t, max_legs=4)),
+        ('fewest legs (≤4 legs)', lambda o, d, t: engine.fewest_legs(o, d, t, max_legs=4)),
+        ('pareto legs/arrival (≤4 legs)', lambda o, d, t: engine.pareto_itineraries(o, d, t, max_legs=4)),
+        ('all ≤1-stop within 24h', lambda o, d, t: engine.itineraries(o, d, t, max_stops=1)),
+    ]:
+        mean, p95, found = timed(queries, search)
+        print(f"   {label:<34} {mean:>9.2f} {p95:>9.2f} {found:>7}")
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''
+        CREATE TABLE flight_schedules (
+            airline_iata TEXT, flight_number TEXT, departure_iata TEXT, arrival_iata TEXT,
+            departure_scheduled_time TEXT, arrival_scheduled_time TEXT
+        )
+    ''')
+    conn.executemany('INSERT INTO flight_schedules VALUES (?, ?, ?, ?, ?, ?)', legs)
+    conn.execute('CREATE INDEX idx_dep ON flight_schedules(departure_iata, departure_scheduled_time)')
+    conn.execute('CREATE INDEX idx_route ON flight_schedules(departure_iata, arrival_iata, departure_scheduled_time)')
+    conn.execute('ANALYZE')
+
+    sql_queries = queries[:max(1, query_count // 10)]
+    mean, p95, found = timed(sql_queries, lambda o, d, t: conn.execute(
+        ONE_STOP_SQL, (o, d, t.strftime('%Y-%m-%dT%H:%M:%S'),
+                       (t + timedelta(hours=24)).strftime('%Y-%m-%dT%H:%M:%S'))).fetchall())
+    print(f"   {'SQL self-join, 1-stop within 24h':<34} {mean:>9.2f} {p95:>9.2f} "
+          f"{found:>7}  ({len(sql_queries)} queries)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: re-polling the same schedules with and without delta ingestion.
+
+Simulates an airport polled repeatedly where only a small share of flights
+change status or delay between polls, and compares writing every row with
+writing only the new or changed ones.
+
+Usage:
+    python benchmarks/bench_delta.py [schedules] [polls] [changed_share]
+"""
+
+import copy
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules, STATUSES
+
+
+def polls(schedules, count: int, changed_share: float):
+    """Yield count polls of the schedules, each changing a share of them."""
+    rng = random.Random(7)
+    current = copy.deepcopy(schedules)
+    for _ in range(count):
+        yield current
+        current = copy.deepcopy(current)
+        for schedule in rng.sample(current, int(len(current) * changed_share)):
+            schedule['status'] = rng.choice(STATUSES)
+            schedule['departure']['delay'] = rng.choice([None, 5, 15, 30, 45])
+
+
+def run(tmp: str, name: str, snapshots, only_changed: bool):
+    path = os.path.join(tmp, f"{name}.db")
+    with AviationDatabase(path, profile='ingest') as db:
+        start = time.perf_counter()
+        written = sum(db.bulk_insert_schedules(poll, only_changed=only_changed) for poll in snapshots)
+        elapsed = time.perf_counter() - start
+        changes = db.conn.execute('SELECT COUNT(*) FROM schedule_changes').fetchone()[0]
+        db.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return elapsed, written, changes, os.path.getsize(path)
+
+
+def main(rows: int, count: int, changed_share: float):
+    schedules = list(make_schedules(rows))
+    snapshots = list(polls(schedules, count, changed_share))
+
+    print(f"📊 {count} polls of {rows:,} schedules, {changed_share:.0%} changing per poll")
+    print(f"   {'mode':<14} {'seconds':>8} {'rows written':>13} {'changes logged':>15} {'db MB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, only_changed in (('every row', False), ('delta only', True)):
+            elapsed, written, changes, size = run(tmp, name.replace(' ', '_'), snapshots, only_changed)
+            print(f"   {name:<14} {elapsed:8.2f} {written:13,} {changes:15,} {size / 1e6:7.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+         float(sys.argv[3]) if len(sys.argv) > 3 else 0.05)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: flight_schedules with airline/airport ids vs the repeated text columns.
+
+Builds a database with the current layout, copies it into the previous wide
+layout (airline_icao, airline_name, departure_icao and arrival_icao stored
+on every row, read straight from flight_schedule_details), rebuilds the same
+indexes on both and compares file size, full-table scans and searches.
+
+Usage:
+    python benchmarks/bench_dimension_keys.py [rows]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase, SCHEDULE_NATURAL_KEY
+from schedule_indexes import SCHEDULE_INDEXES
+from benchmarks.synthetic_data import make_schedules, AIRPORTS
+
+SUMMARY = '''
+    SELECT COUNT(*), COUNT(DISTINCT airline_iata), COUNT(DISTINCT departure_iata),
+           COUNT(CASE WHEN status = 'active' THEN 1 END), SUM(delay_minutes)
+    FROM flight_schedules NOT INDEXED
+'''
+
+LAYOUTS = {
+    'ids + view': {
+        'search': 'SELECT * FROM flight_schedule_details WHERE departure_iata = ? ORDER BY departure_scheduled_time',
+        'activity': '''
+            SELECT activity.airline_iata, airlines.name, activity.flight_count
+            FROM (SELECT airline_iata, COUNT(*) AS flight_count FROM flight_schedules
+                  WHERE airline_iata IS NOT NULL GROUP BY airline_iata) AS activity
+            LEFT JOIN airlines ON airlines.iata_code = activity.airline_iata
+            ORDER BY activity.flight_count DESC
+        ''',
+    },
+    'wide text': {
+        'search': 'SELECT * FROM flight_schedules WHERE departure_iata = ? ORDER BY departure_scheduled_time',
+        'activity': '''
+            SELECT airline_iata, airline_name, COUNT(*) AS flight_count FROM flight_schedules
+            WHERE airline_iata IS NOT NULL GROUP BY airline_iata, airline_name
+            ORDER BY flight_count DESC
+        ''',
+    },
+}
+
+
+def build_wide(source: str, target: str):
+    """Copy the schedules into the wide layout with equivalent indexes."""
+    conn = sqlite3.connect(target)
+    conn.execute('ATTACH DATABASE ? AS source', (source,))
+    conn.execute('CREATE TABLE flight_schedules AS SELECT * FROM source.flight_schedule_details')
+    conn.execute('DETACH DATABASE source')
+    indexes = dict(SCHEDULE_INDEXES)
+    indexes['idx_schedules_airline_activity'] = 'flight_schedules(airline_iata, airline_name, status)'
+    indexes['idx_schedules_natural_key'] = f"flight_schedules({', '.join(SCHEDULE_NATURAL_KEY)})"
+    for name, definition in indexes.items():
+        conn.execute(f'CREATE INDEX {name} ON {definition}')
+    conn.execute('ANALYZE')
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+
+
+def best_of(conn, sql, params=(), repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'ids + view': os.path.join(tmp, "ids.db"), 'wide text': os.path.join(tmp, "wide.db")}
+        with AviationDatabase(paths['ids + view'], profile='ingest') as db:
+            db.bulk_insert_schedules(make_schedules(rows))
+            # The activity queries group flight_schedules directly; give both layouts a covering index
+            db.conn.execute('CREATE INDEX idx_schedules_airline_activity ON flight_schedules(airline_iata, status)')
+            db.optimize()
+            db.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            db.conn.execute('VACUUM')
+        build_wide(paths['ids + view'], paths['wide text'])
+
+        print(f"📊 {rows:,} schedules")
+        print(f"   {'layout':<12} {'db MB':>7} {'scan ms':>9} {'search ms':>10} {'activity ms':>12}")
+        for layout, queries in LAYOUTS.items():
+            conn = sqlite3.connect(paths[layout])
+            size = os.path.getsize(paths[layout]) / 1e6
+            scan = best_of(conn, SUMMARY)
+            search = sum(best_of(conn, queries['search'], (code,)) for code in AIRPORTS[:10]) / 10
+            activity = best_of(conn, queries['activity'])
+            conn.close()
+            print(f"   {layout:<12} {size:7.1f} {scan:9.1f} {search:10.2f} {activity:12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Parquet export/import throughput of flight_schedules.
+
+Builds a table of N rows (default 10,000,000) by loading one synthetic week
+of schedules and replicating it into later weeks in SQL, then times a
+single-file export, a partitioned export and imports of both into empty
+databases (including the index rebuild), and checks the round trip,
+including the airline and airport names joined back from the target's own
+dimension tables. Arrow's peak memory is reported after each export.
+
+At the default size a run takes about 45 minutes on one core and needs
+roughly 16 GB of temporary disk for the source and the two imported
+databases; pass a smaller row count for a quick check.
+
+Usage:
+    python benchmarks/bench_parquet.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules
+from schedule_parquet import export_parquet, import_parquet
+
+SEED_ROWS = 100000
+WEEK = 7 * 86400
+
+ROUND_TRIP_SQL = '''
+    SELECT COUNT(*), SUM(departure_epoch), MAX(id),
+           COUNT(airline_name), COUNT(departure_icao), COUNT(arrival_icao)
+    FROM flight_schedule_details
+'''
+
+
+def build(db: AviationDatabase, rows: int):
+    db.bulk_insert_schedules(make_schedules(min(rows, SEED_ROWS)))
+    seed = db.conn.execute('SELECT MAX(id) FROM flight_schedules').fetchone()[0]
+    week = 1
+    while db.conn.execute('SELECT MAX(id) FROM flight_schedules').fetchone()[0] < rows:
+        remaining = rows - db.conn.execute('SELECT MAX(id) FROM flight_schedules').fetchone()[0]
+        with db.conn:
+            db.conn.execute(f'''
+                INSERT INTO flight_schedules (
+                    airline_iata, airline_id, flight_number,
+                    departure_iata, departure_airport_id, departure_terminal,
+                    departure_scheduled_time, arrival_iata, arrival_airport_id, arrival_terminal,
+                    arrival_scheduled_time, status, flight_type, aircraft_registration,
+                    gate, delay_minutes, departure_epoch, departure_utc_offset,
+                    arrival_epoch, arrival_utc_offset
+                )
+                SELECT airline_iata, airline_id, flight_number,
+                       departure_iata, departure_airport_id, departure_terminal,
+                       strftime('%Y-%m-%dT%H:%M:%S.000', departure_scheduled_time, '+{7 * week} days'),
+                       arrival_iata, arrival_airport_id, arrival_terminal,
+                       strftime('%Y-%m-%dT%H:%M:%S.000', arrival_scheduled_time, '+{7 * week} days'),
+                       status, flight_type, aircraft_registration, gate, delay_minutes,
+                       departure_epoch + {WEEK * week}, departure_utc_offset,
+                       arrival_epoch + {WEEK * week}, arrival_utc_offset
+                FROM flight_schedules WHERE id <= ? ORDER BY id LIMIT ?
+            ''', (seed, remaining))
+        week += 1
+
+
+def size_of(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def main(rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, "source.db")
+        with AviationDatabase(source_path, profile='ingest') as source:
+            print(f"📊 Building {rows:,} schedules...")
+            start = time.perf_counter()
+            build(source, rows)
+            count = source.conn.execute('SELECT COUNT(*) FROM flight_schedules').fetchone()[0]
+            print(f"   Built {count:,} rows in {time.perf_counter() - start:.0f}s, "
+                  f"database {os.path.getsize(source_path) / 1e6:,.0f} MB")
+
+            # Arrow's peak is cumulative, so the lighter single-file export runs first
+            print(f"   {'step':<36} {'seconds':>8} {'rows/sec':>11} {'size MB':>9} {'peak MB':>9}")
+            for label, partition_by, name in [
+                ('export, single file', (), 'single.parquet'),
+                ('export, date/airport partitions', ('departure_date', 'departure_iata'), 'partitioned'),
+            ]:
+                path = os.path.join(tmp, name)
+                start = time.perf_counter()
+                exported = export_parquet(source.conn, path, partition_by=partition_by)
+                elapsed = time.perf_counter() - start
+                print(f"   {label:<36} {elapsed:>8.1f} {exported / elapsed:>11,.0f} {size_of(path) / 1e6:>9,.0f} "
+                      f"{pa.default_memory_pool().max_memory() / 1e6:>9,.0f}")
+            expected = source.conn.execute(ROUND_TRIP_SQL).fetchone()
+
+        for label, name in [('import, single file', 'single.parquet'),
+                            ('import, date/airport partitions', 'partitioned')]:
+            with AviationDatabase(os.path.join(tmp, f"import-{name}.db"), profile='ingest') as target:
+                start = time.perf_counter()
+                imported = import_parquet(target.conn, os.path.join(tmp, name))
+                elapsed = time.perf_counter() - start
+                print(f"   {label:<36} {elapsed:>8.1f} {imported / elapsed:>11,.0f}")
+                actual = target.conn.execute(ROUND_TRIP_SQL).fetchone()
+                if tuple(actual) != tuple(expected):
+                    print(f"   ❌ Round trip mismatch: {tuple(actual)} != {tuple(expected)}")
+                    sys.exit(1)
+        print("   ✅ Round trip matches")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
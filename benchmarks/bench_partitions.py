@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: schedule searches on one ever-growing table vs weekly partitions.
+
+Loads N weeks of synthetic schedules, times route searches (the live week)
+and windowed searches (one week, a few weeks back), then applies the
+retention policy and times the same searches against the hot table plus
+the partitions the windows overlap.
+
+Usage:
+    python benchmarks/bench_partitions.py [weeks] [schedules_per_week]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules, AIRPORTS
+
+BASE = datetime(2025, 10, 1)
+
+
+def shifted(schedules, weeks):
+    for schedule in schedules:
+        for side in ('departure', 'arrival'):
+            moment = datetime.fromisoformat(schedule[side]['scheduledTime']) + timedelta(weeks=weeks)
+            schedule[side]['scheduledTime'] = moment.strftime('%Y-%m-%dT%H:%M:%S.000')
+        yield schedule
+
+
+def timed(db, searches, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for search in searches:
+            search(db)
+    return (time.perf_counter() - start) / (repeats * len(searches)) * 1000
+
+
+def main(weeks: int, per_week: int):
+    now = BASE + timedelta(weeks=weeks - 1, days=3)
+    window = (now - timedelta(weeks=4), now - timedelta(weeks=3))
+    live = (now - timedelta(days=2), now + timedelta(days=2))
+    route_searches = [lambda db, i=i: db.search_flights(departure_iata=AIRPORTS[i], arrival_iata=AIRPORTS[i + 1],
+                                                        departs_after=live[0], departs_before=live[1])
+                      for i in range(10)]
+    window_searches = [lambda db, i=i: db.search_flights(departure_iata=AIRPORTS[i],
+                                                         departs_after=window[0], departs_before=window[1])
+                       for i in range(10)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "partitions.db")
+        with AviationDatabase(db_path, profile='ingest') as db:
+            for week in range(weeks):
+                db.bulk_insert_schedules(shifted(make_schedules(per_week, seed=week), week))
+            db.optimize()
+            total = db.conn.execute('SELECT COUNT(*) FROM flight_schedules').fetchone()[0]
+            print(f"📊 {total:,} schedules over {weeks} weeks, database {os.path.getsize(db_path) / 1e6:,.0f} MB")
+            print(f"   {'layout':<28} {'live route ms':>14} {'past week ms':>13}")
+            print(f"   {'single table':<28} {timed(db, route_searches):>14.2f} {timed(db, window_searches):>13.2f}")
+            expected = [row['id'] for search in window_searches for row in search(db)]
+
+            start = time.perf_counter()
+            result = db.apply_retention(now=now)
+            elapsed = time.perf_counter() - start
+            db.conn.execute('VACUUM')
+            db.optimize()
+            hot = db.conn.execute('SELECT COUNT(*) FROM flight_schedules').fetchone()[0]
+            print(f"   {'hot table + partitions':<28} {timed(db, route_searches):>14.2f} {timed(db, window_searches):>13.2f}")
+            print(f"   Retention took {elapsed:.1f}s: {result['moved']:,} rows moved, "
+                  f"{len(result['archived'])} weeks archived; hot table {hot:,} rows, "
+                  f"{os.path.getsize(db_path) / 1e6:,.0f} MB after VACUUM")
+
+            actual = [row['id'] for search in window_searches for row in search(db)]
+            print("   ✅ Windowed results match" if actual == expected else "   ❌ Windowed results differ")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 12,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50000)
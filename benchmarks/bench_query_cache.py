@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a dashboard polling the analytics methods while the collector ingests.
+
+Each round ingests one batch of schedules, then the dashboard refreshes
+every analytics method a number of times. Uncached, every refresh
+re-aggregates the tables; cached, only the first refresh after a write does.
+
+Usage:
+    python benchmarks/bench_query_cache.py [rows] [rounds] [refreshes_per_round]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules
+
+ANALYTICS = [
+    ('get_schedules_summary', ()),
+    ('get_airport_traffic', (10,)),
+    ('get_airline_activity', (10,)),
+    ('get_api_usage_summary', ()),
+    ('get_mission_order_statistics', ()),
+]
+
+
+def refresh(db, cached: bool):
+    for name, args in ANALYTICS:
+        method = getattr(db, name)
+        if cached:
+            method(*args)
+        else:
+            getattr(method, 'uncached', method.__func__)(db, *args)
+
+
+def main(rows: int, rounds: int, refreshes: int):
+    schedules = list(make_schedules(rows))
+    batch = len(schedules) // rounds
+
+    print(f"📊 {rounds} ingests of {batch:,} schedules, {refreshes} dashboard refreshes after each")
+    print(f"   {'mode':<9} {'refresh seconds':>16} {'ms/refresh':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('uncached', 'cached'):
+            with AviationDatabase(os.path.join(tmp, f"{mode}.db")) as db:
+                elapsed = 0.0
+                for start in range(0, batch * rounds, batch):
+                    db.bulk_insert_schedules(schedules[start:start + batch])
+                    db.log_api_usage('/timetable', {}, batch)
+                    began = time.perf_counter()
+                    for _ in range(refreshes):
+                        refresh(db, mode == 'cached')
+                    elapsed += time.perf_counter() - began
+                stats = db.query_cache.get_stats()
+            print(f"   {mode:<9} {elapsed:16.2f} {elapsed / (rounds * refreshes) * 1000:11.2f}")
+        print(f"   Cache: {stats['hits']:,} hits, {stats['misses']:,} misses "
+              f"({stats['hit_ratio']:.1%} hit ratio)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 50)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark and plan check: hot flight_schedules queries under the old
+single-column indexes vs the composite/covering indexes in schedule_indexes.
+
+Each query is captured from the real AviationDatabase method, run through
+EXPLAIN QUERY PLAN and timed. Airport traffic and airline activity read the
+rollup tables (see bench_rollups.py) and are not listed. Exits non-zero if a query still needs a temp
+B-tree or a full table scan with the current indexes.
+
+Usage:
+    python benchmarks/bench_query_plans.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from schedule_indexes import (SCHEDULE_INDEXES, SUPERSEDED_INDEXES, explain_query_plan,
+                              plan_problems, index_used)
+from benchmarks.synthetic_data import make_schedules
+
+LEGACY_INDEXES = {
+    'idx_schedules_departure': 'flight_schedules(departure_iata)',
+    'idx_schedules_arrival': 'flight_schedules(arrival_iata)',
+    'idx_schedules_airline': 'flight_schedules(airline_iata)',
+    'idx_schedules_status': 'flight_schedules(status)',
+    'idx_schedules_type': 'flight_schedules(flight_type)',
+}
+
+HOT_QUERIES = [
+    ('search route', lambda db: db.search_flights(departure_iata='MNL', arrival_iata='SIN'), ()),
+    ('search departures', lambda db: db.search_flights(departure_iata='MNL'), ()),
+    ('search arrivals', lambda db: db.search_flights(arrival_iata='HKG'), ()),
+    ('search airline', lambda db: db.search_flights(airline_iata='PR'), ()),
+    ('search status', lambda db: db.search_flights(status='cancelled'), ()),
+    ('search all', lambda db: db.search_flights(), ()),
+]
+
+
+def use_legacy_indexes(db):
+    for name in SCHEDULE_INDEXES:
+        db.conn.execute(f'DROP INDEX {name}')
+    for name, definition in LEGACY_INDEXES.items():
+        db.conn.execute(f'CREATE INDEX {name} ON {definition}')
+    db.optimize()
+
+
+def capture_sql(db, query):
+    """Run a database method once and return the last SQL statement it executed."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        query(db)
+    finally:
+        db.conn.set_trace_callback(None)
+    return statements[-1]
+
+
+def time_query(db, query, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query(db)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def profile(db):
+    results = {}
+    for label, query, _ in HOT_QUERIES:
+        plan = explain_query_plan(db.conn, capture_sql(db, query))
+        results[label] = (plan, time_query(db, query))
+    return results
+
+
+def main(rows: int):
+    print(f"📊 Hot flight_schedules queries over {rows:,} schedules")
+    with tempfile.TemporaryDirectory() as tmp:
+        with AviationDatabase(os.path.join(tmp, "plans.db")) as db:
+            db.bulk_insert_schedules(make_schedules(rows))
+            db.optimize()
+            current = profile(db)
+            use_legacy_indexes(db)
+            legacy = profile(db)
+
+    failures = 0
+    print(f"   {'query':<18} {'legacy ms':>10} {'composite ms':>13}  index used")
+    for label, _, allowed in HOT_QUERIES:
+        plan, seconds = current[label]
+        print(f"   {label:<18} {legacy[label][1] * 1000:>10.2f} {seconds * 1000:>13.2f}  {index_used(plan)}")
+        for problem in plan_problems(plan, allowed=allowed):
+            print(f"      ❌ {problem}")
+            failures += 1
+        for problem in plan_problems(legacy[label][0], allowed=allowed):
+            print(f"      (legacy: {problem})")
+
+    if failures:
+        print(f"❌ {failures} plan problem(s) with the current indexes")
+    else:
+        print(f"✅ Every hot query is index-ordered with no temp B-tree or table scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
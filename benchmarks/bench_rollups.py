@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: airport traffic and airline activity from rollup tables vs GROUP BY.
+
+Ingests the same schedules twice: into the previous layout (no rollups,
+covering indexes for the two reports) and into the current one, where
+triggers maintain the rollup tables. Reports ingest throughput, the
+latency of each report (uncached) and the cost of a full rebuild + check.
+
+Usage:
+    python benchmarks/bench_rollups.py [rows] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from schedule_rollups import drop_rollups, check_rollups
+from benchmarks.synthetic_data import make_schedules
+
+# The reports as they were computed before the rollups, with their covering indexes
+GROUP_BY_INDEXES = {
+    'idx_schedules_airline_activity': 'flight_schedules(airline_iata, status)',
+    'idx_schedules_airport_traffic':
+        'flight_schedules(COALESCE(departure_iata, arrival_iata), flight_type, departure_iata, arrival_iata)',
+}
+GROUP_BY_REPORTS = {
+    'airport traffic': '''
+        SELECT COALESCE(departure_iata, arrival_iata) as airport_code, COUNT(*) as flight_count,
+               COUNT(CASE WHEN flight_type = 'departure' THEN 1 END) as departures,
+               COUNT(CASE WHEN flight_type = 'arrival' THEN 1 END) as arrivals
+        FROM flight_schedules
+        WHERE departure_iata IS NOT NULL OR arrival_iata IS NOT NULL
+        GROUP BY COALESCE(departure_iata, arrival_iata)
+        ORDER BY flight_count DESC LIMIT 10
+    ''',
+    'airline activity': '''
+        SELECT activity.airline_iata, airlines.name as airline_name,
+               activity.flight_count, activity.active_flights
+        FROM (SELECT airline_iata, COUNT(*) as flight_count,
+                     COUNT(CASE WHEN status = 'active' THEN 1 END) as active_flights
+              FROM flight_schedules WHERE airline_iata IS NOT NULL GROUP BY airline_iata) AS activity
+        LEFT JOIN airlines ON airlines.iata_code = activity.airline_iata
+        ORDER BY activity.flight_count DESC LIMIT 10
+    ''',
+}
+
+
+def best_of(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def ingest(db, schedules):
+    start = time.perf_counter()
+    db.bulk_insert_schedules(schedules, batch_size=2000)
+    return len(schedules) / (time.perf_counter() - start)
+
+
+def main(rows: int, repeats: int):
+    schedules = list(make_schedules(rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        with AviationDatabase(os.path.join(tmp, "group_by.db"), profile='ingest') as db:
+            with db.conn:
+                drop_rollups(db.conn)
+                for name, definition in GROUP_BY_INDEXES.items():
+                    db.conn.execute(f'CREATE INDEX {name} ON {definition}')
+            group_by_rate = ingest(db, schedules)
+            db.optimize()
+            group_by = {label: best_of(lambda: db.conn.execute(sql).fetchall(), repeats)
+                        for label, sql in GROUP_BY_REPORTS.items()}
+
+        with AviationDatabase(os.path.join(tmp, "rollups.db"), profile='ingest') as db:
+            rollup_rate = ingest(db, schedules)
+            db.optimize()
+            rollups = {
+                'airport traffic': best_of(lambda: AviationDatabase.get_airport_traffic.uncached(db), repeats),
+                'airline activity': best_of(lambda: AviationDatabase.get_airline_activity.uncached(db), repeats),
+            }
+            route_frequency = best_of(lambda: AviationDatabase.get_route_frequency.uncached(db), repeats)
+            start = time.perf_counter()
+            drift = db.rebuild_rollups()
+            rebuild = time.perf_counter() - start
+            assert not any(drift.values()) and not any(check_rollups(db.conn).values()), drift
+            groups = sum(db.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in drift)
+
+    print(f"📊 {rows:,} schedules")
+    print(f"   Ingest: {group_by_rate:,.0f} rows/s with GROUP BY indexes, "
+          f"{rollup_rate:,.0f} rows/s maintaining rollups")
+    print(f"   {'report':<18} {'GROUP BY ms':>12} {'rollup ms':>10} {'speedup':>8}")
+    for label in GROUP_BY_REPORTS:
+        print(f"   {label:<18} {group_by[label] * 1000:12.2f} {rollups[label] * 1000:10.3f} "
+              f"{group_by[label] / rollups[label]:7.0f}x")
+    print(f"   {'route frequency':<18} {'-':>12} {route_frequency * 1000:10.3f}")
+    print(f"   Check + rebuild of {groups:,} rollup rows: {rebuild * 1000:.0f} ms, no drift")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)
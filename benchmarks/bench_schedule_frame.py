@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboard summaries from SQL vs a columnar ScheduleFrame snapshot.
+
+Times each SQL summary method against the equivalent ScheduleFrame group-by,
+plus the one-off snapshot load and an incremental refresh after new rows.
+
+Usage:
+    python benchmarks/bench_schedule_frame.py [rows] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules
+
+
+def timed(call, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main(rows: int, repeats: int):
+    schedules = list(make_schedules(rows + rows // 100))
+    print(f"📊 Dashboard summaries over {rows:,} schedules ({repeats} calls each)")
+    with tempfile.TemporaryDirectory() as tmp:
+        with AviationDatabase(os.path.join(tmp, "frame.db")) as db:
+            db.bulk_insert_schedules(schedules[:rows])
+            db.optimize()
+
+            start = time.perf_counter()
+            frame = db.schedule_frame()
+            print(f"   Snapshot load: {(time.perf_counter() - start) * 1000:.0f} ms for {len(frame):,} rows")
+
+            print(f"   {'summary':<22} {'SQL ms':>9} {'frame ms':>9} {'speedup':>8}")
+            for label, sql, vectorized in [
+                ('schedules summary', db.get_schedules_summary, frame.schedules_summary),
+                ('airport traffic', db.get_airport_traffic, frame.airport_traffic),
+                ('airline activity', db.get_airline_activity, frame.airline_activity),
+            ]:
+                sql_ms, frame_ms = timed(sql, repeats), timed(vectorized, repeats)
+                print(f"   {label:<22} {sql_ms:>9.2f} {frame_ms:>9.2f} {sql_ms / frame_ms:>7.1f}x")
+
+            for label, call in [
+                ('hourly departures', lambda: frame.hourly_departures('MNL')),
+                ('route frequency', frame.route_frequency),
+                ('delay percentiles', lambda: frame.delay_percentiles(by='airline')),
+            ]:
+                print(f"   {label:<22} {'-':>9} {timed(call, repeats):>9.2f}")
+
+            db.bulk_insert_schedules(schedules[rows:])
+            start = time.perf_counter()
+            added = frame.refresh()
+            print(f"   Incremental refresh: {(time.perf_counter() - start) * 1000:.1f} ms for {added:,} new rows")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and latency of reading a large search result.
+
+Compares building the whole list (search_flights), streaming it
+(iter_flights), walking it page by page with keyset cursors
+(search_flights_page), and fetching a page deep into the result with
+OFFSET vs a keyset cursor.
+
+Usage:
+    python benchmarks/bench_search_pagination.py [rows] [page_size]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules
+
+
+def measure(function):
+    """Run function twice, returning (result, seconds, peak MB allocated)."""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    # Timed without tracemalloc, which slows allocation-heavy code down
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def walk_pages(db, page_size):
+    count = 0
+    cursor = None
+    while True:
+        page, cursor = db.search_flights_page(page_size=page_size, after=cursor)
+        count += len(page)
+        if cursor is None:
+            return count
+
+
+def main(rows: int, page_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        with AviationDatabase(os.path.join(tmp, "search.db"), profile='ingest') as db:
+            db.bulk_insert_schedules(make_schedules(rows))
+            db.optimize()
+            rows = db.conn.execute('SELECT COUNT(*) FROM flight_schedules').fetchone()[0]
+
+            print(f"📊 Reading all {rows:,} flights of search_flights()")
+            print(f"   {'method':<30} {'seconds':>8} {'peak MB':>8}")
+            for name, function in (
+                    ('search_flights (list)', lambda: len(db.search_flights())),
+                    ('iter_flights (stream)', lambda: sum(1 for _ in db.iter_flights())),
+                    (f'search_flights_page ({page_size})', lambda: walk_pages(db, page_size)),
+                    ('iter_flights, 2 columns', lambda: sum(1 for _ in db.iter_flights(
+                        columns=('flight_number', 'departure_scheduled_time'))))):
+                count, elapsed, peak = measure(function)
+                assert count == rows, (name, count)
+                print(f"   {name:<30} {elapsed:8.2f} {peak:8.1f}")
+
+            # The last page: OFFSET re-reads every row before it, a cursor seeks to it
+            depth = rows - page_size
+            last = db.conn.execute('''
+                SELECT departure_scheduled_time, id FROM flight_schedules
+                ORDER BY departure_scheduled_time, id LIMIT 1 OFFSET ?
+            ''', (depth - 1,)).fetchone()
+            cursor = (last[0], last[1])
+            offset_sql = f'''
+                SELECT * FROM flight_schedule_details
+                ORDER BY departure_scheduled_time, id LIMIT {page_size} OFFSET {depth}
+            '''
+            _, offset_time, _ = measure(lambda: db.conn.execute(offset_sql).fetchall())
+            _, keyset_time, _ = measure(lambda: db.search_flights_page(page_size=page_size, after=cursor))
+            print(f"   Page at row {depth:,}: OFFSET {offset_time * 1000:.1f} ms, "
+                  f"keyset cursor {keyset_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: timetable and future schedules written through two connections
+vs one shared ScheduleSink.
+
+"two writers" is the previous layout: the collector's AviationDatabase and
+the future client's own connection to the same file, each committing its
+pages from its own thread and waiting on the other for the write lock.
+"shared sink" feeds both clients' rows through a queue into one sink on one
+connection, so pages from both endpoints share transactions.
+
+Usage:
+    python benchmarks/bench_shared_sink.py [pages] [page_size]
+"""
+
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from aviation_edge_future_client import AviationEdgeFutureSchedulesClient
+from benchmarks.synthetic_data import make_schedules
+
+
+def make_pages(pages: int, page_size: int):
+    """Row pages for each client, mapped the way the clients map them."""
+    timetable = list(AviationDatabase.schedule_rows(make_schedules(pages * page_size, seed=1)))
+    future = list(AviationEdgeFutureSchedulesClient.schedule_rows(make_schedules(pages * page_size, seed=2)))
+    return {name: [rows[start:start + page_size] for start in range(0, len(rows), page_size)]
+            for name, rows in (('timetable', timetable), ('future', future))}
+
+
+def two_writers(path: str, pages):
+    """Each client commits its own pages on its own connection."""
+    AviationDatabase(path, profile='ingest').close()
+    waits = []
+
+    def write(name):
+        with AviationDatabase(path, profile='ingest') as db:
+            for page in pages[name]:
+                start = time.perf_counter()
+                db.write_schedule_rows(page)
+                waits.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=write, args=(name,)) for name in pages]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, len(waits), max(waits)
+
+
+def shared_sink(path: str, pages, batch_size: int):
+    """Both clients hand their pages to one writer thread and its sink."""
+    results = queue.Queue(maxsize=8)
+    waits = []
+
+    def produce(name):
+        for page in pages[name]:
+            results.put(page)
+        results.put(None)
+
+    with AviationDatabase(path, profile='ingest') as db:
+        sink = db.schedule_sink(batch_size)
+        threads = [threading.Thread(target=produce, args=(name,)) for name in pages]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        finished = 0
+        while finished < len(threads):
+            page = results.get()
+            if page is None:
+                finished += 1
+                continue
+            write_start = time.perf_counter()
+            sink.add(page)
+            waits.append(time.perf_counter() - write_start)
+        sink.flush()
+        elapsed = time.perf_counter() - start
+    return elapsed, sink.get_stats()['batches'], max(waits)
+
+
+def main(pages: int, page_size: int):
+    data = make_pages(pages, page_size)
+    rows = sum(len(page) for client in data.values() for page in client)
+    print(f"📊 {rows:,} schedules in pages of {page_size} from two clients")
+    print(f"   {'layout':<13} {'seconds':>8} {'rows/sec':>10} {'transactions':>13} {'slowest write ms':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in (('two writers', lambda path: two_writers(path, data)),
+                          ('shared sink', lambda path: shared_sink(path, data, 2000))):
+            elapsed, transactions, slowest = run(os.path.join(tmp, name.replace(' ', '_') + '.db'))
+            print(f"   {name:<13} {elapsed:8.2f} {rows / elapsed:10,.0f} {transactions:13,} {slowest * 1000:17.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 600)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup cost of short-lived scripts.
+
+Every measurement runs in a fresh interpreter, as a CLI invocation or cron
+job would:
+
+- importing each module, and which of the deferred dependencies (requests,
+  bcrypt, python-dotenv) the import loaded;
+- opening an existing database with AviationDatabase, once with the schema
+  DDL and migrations run on open (PRAGMA user_version reset to 0, as every
+  open behaved before the version stamp) and once with the stamp current.
+
+Usage:
+    python benchmarks/bench_startup.py [rows] [repeats]
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aviation_database import AviationDatabase
+from benchmarks.synthetic_data import make_schedules
+
+MODULES = ('aviation_database', 'aviation_edge_schedule_client', 'aviation_edge_future_client',
+           'regional_data_collector')
+DEFERRED = ('requests', 'bcrypt', 'dotenv')
+
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, *[name for name in {deferred!r} if name in sys.modules])
+'''
+
+OPEN_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+from aviation_database import AviationDatabase
+imported = time.perf_counter()
+AviationDatabase(sys.argv[1]).close()
+print(imported - start, time.perf_counter() - imported)
+'''
+
+
+def run_script(script, *args):
+    """Run script in a fresh interpreter; returns its output fields and the process wall time."""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script, *args], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return output.split(), time.perf_counter() - start
+
+
+def main(rows: int, repeats: int):
+    print(f"📊 Startup in fresh interpreters, best of {repeats}")
+    print(f"   {'import':<32} {'ms':>7}  deferred dependencies loaded")
+    for module in MODULES:
+        runs = [run_script(IMPORT_SCRIPT.format(module=module, deferred=DEFERRED))[0] for _ in range(repeats)]
+        best = min(float(fields[0]) for fields in runs)
+        print(f"   {module:<32} {best * 1000:7.1f}  {', '.join(runs[0][1:]) or 'none'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup.db")
+        with AviationDatabase(path, profile='ingest') as db:
+            db.bulk_insert_schedules(make_schedules(rows))
+
+        print(f"\n   Opening a database of {rows:,} schedules")
+        print(f"   {'mode':<32} {'import ms':>10} {'open ms':>8} {'process ms':>11}")
+        for mode in ('DDL on every open', 'schema version current'):
+            results = []
+            for _ in range(repeats):
+                if mode == 'DDL on every open':
+                    conn = sqlite3.connect(path)
+                    conn.execute('PRAGMA user_version = 0')
+                    conn.close()
+                (imported, opened), process = run_script(OPEN_SCRIPT, path)
+                results.append((float(imported), float(opened), process))
+            imported, opened, process = (min(column) for column in zip(*results))
+            print(f"   {mode:<32} {imported * 1000:10.1f} {opened * 1000:8.2f} {process * 1000:11.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10)
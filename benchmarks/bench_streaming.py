@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of get_schedules() vs streaming iter_schedules()
+when loading one airport's timetable into the database.
+
+Peak Python heap is measured with tracemalloc against the local stub API.
+
+Usage:
+    python benchmarks/bench_streaming.py [sizes...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviation_database import AviationDatabase
+from aviation_edge_schedule_client import AviationEdgeScheduleClient
+from http_transport import AviationEdgeTransport
+from benchmarks.stub_server import StubAviationEdgeServer
+
+
+def measure(load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = load()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, peak, elapsed
+
+
+def main(sizes):
+    print(f"📊 Peak heap while loading one timetable response into SQLite")
+    print(f"   {'schedules':>10} {'body MB':>8} {'list peak MB':>13} {'stream peak MB':>15} {'list s':>7} {'stream s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            with StubAviationEdgeServer(latency=0, schedules_per_response=size) as server:
+                server.warm('/timetable', ['LHR'])
+                body_mb = len(server._payload('timetable', {'iataCode': 'LHR', 'type': 'departure'})) / 1e6
+
+                client = AviationEdgeScheduleClient(api_key='bench', transport=AviationEdgeTransport())
+                client.base_url = server.url('/timetable')
+
+                with AviationDatabase(os.path.join(tmp, f"list_{size}.db")) as db:
+                    _, list_peak, list_time = measure(
+                        lambda: db.bulk_insert_schedules(client.get_schedules(iata_code='LHR', type='departure')))
+                with AviationDatabase(os.path.join(tmp, f"stream_{size}.db")) as db:
+                    _, stream_peak, stream_time = measure(
+                        lambda: db.bulk_insert_schedules(client.iter_schedules(iata_code='LHR', type='departure')))
+
+            print(f"   {size:>10,} {body_mb:>8.1f} {list_peak / 1e6:>13.1f} {stream_peak / 1e6:>15.1f} "
+                  f"{list_time:>7.2f} {stream_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [2000, 10000, 40000])
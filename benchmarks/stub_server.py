@@ -0,0 +1,141 @@
+"""
+Local stub of the Aviation Edge API for offline benchmarks.
+
+Serves /v2/public/timetable and /v2/public/flightsFuture with synthetic
+schedules and a configurable per-request latency.
+
+    with StubAviationEdgeServer(latency=0.05) as server:
+        client.base_url = server.url('/timetable')
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.synthetic_data import make_schedule
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Write headers and body as one segment; split writes trip Nagle + delayed ACK
+    disable_nagle_algorithm = True
+    wbufsize = 1 << 16
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rsplit('/', 1)[-1]
+        if endpoint not in ('timetable', 'flightsFuture'):
+            self._send(404, {'error': 'Not Found'})
+            return
+
+        time.sleep(self.server.latency)
+        body = self.server.payload(endpoint, params)
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status, payload, etag=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # Accept bursts of concurrent connections without SYN drops
+
+
+class StubAviationEdgeServer:
+    """Threaded HTTP server returning deterministic synthetic schedules."""
+
+    def __init__(self, latency: float = 0.05, schedules_per_response: int = 200, port: int = 0):
+        """
+        Initialize the stub server.
+
+        Args:
+            latency: Seconds each request sleeps before responding
+            schedules_per_response: Schedules returned per request
+            port: Port to bind on 127.0.0.1, or 0 for any free port
+        """
+        self._server = _StubHTTPServer(('127.0.0.1', port), _StubHandler)
+        self._server.latency = latency
+        self._server.payload = self._payload
+        self.schedules_per_response = schedules_per_response
+        self._bodies = {}
+        self._thread = None
+
+    def _payload(self, endpoint, params):
+        """Get the encoded response body, generating it once per request key."""
+        key = (endpoint, params.get('iataCode', 'MNL'), params.get('type', 'departure'), params.get('date'))
+        body = self._bodies.get(key)
+        if body is None:
+            body = json.dumps(self._schedules(*key)).encode('utf-8')
+            self._bodies[key] = body
+        return body
+
+    def _schedules(self, endpoint, airport, flight_type, date):
+        seed = zlib.crc32(f"{endpoint}:{airport}:{flight_type}:{date}".encode())
+        rng = random.Random(seed)
+        base = datetime(2025, 10, 1)
+        schedules = []
+        for _ in range(self.schedules_per_response):
+            schedule = make_schedule(rng, base)
+            side = 'departure' if flight_type == 'departure' else 'arrival'
+            schedule[side]['iataCode'] = airport
+            schedule['type'] = flight_type
+            schedules.append(schedule)
+        return schedules
+
+    def warm(self, endpoint: str, airports, flight_type: str = 'departure', date=None):
+        """Pre-generate response bodies so timed runs only measure the client."""
+        for airport in airports:
+            self._payload(endpoint.strip('/'), {'iataCode': airport, 'type': flight_type, 'date': date})
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def url(self, endpoint: str) -> str:
+        """Get the stub URL for an endpoint path such as '/timetable'."""
+        return f"http://127.0.0.1:{self.port}/v2/public{endpoint}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with StubAviationEdgeServer() as server:
+        print(f"🛰️  Stub Aviation Edge API on {server.url('/timetable')}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
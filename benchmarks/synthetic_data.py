@@ -0,0 +1,60 @@
+"""
+Synthetic Aviation Edge payloads for offline benchmarks.
+
+Generates timetable-shaped schedule dictionaries with realistic code
+distributions so the benchmarks can run without an API key.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator
+
+AIRPORTS = ['MNL', 'CEB', 'DVO', 'ILO', 'NRT', 'HND', 'ICN', 'BKK', 'SIN', 'HKG',
+            'SYD', 'MEL', 'BNE', 'PER', 'AKL', 'POM', 'LHR', 'CDG', 'FRA', 'AMS',
+            'DXB', 'DOH', 'JFK', 'LAX', 'ORD', 'SFO', 'SEA', 'DEL', 'BOM', 'KUL']
+AIRLINES = [('PR', 'PAL', 'Philippine Airlines'), ('5J', 'CEB', 'Cebu Pacific'),
+            ('QF', 'QFA', 'Qantas'), ('SQ', 'SIA', 'Singapore Airlines'),
+            ('CX', 'CPA', 'Cathay Pacific'), ('NH', 'ANA', 'All Nippon Airways'),
+            ('EK', 'UAE', 'Emirates'), ('BA', 'BAW', 'British Airways'),
+            ('PX', 'ANG', 'Air Niugini'), ('JL', 'JAL', 'Japan Airlines')]
+STATUSES = ['scheduled', 'active', 'landed', 'cancelled', 'unknown']
+
+
+def make_schedule(rng: random.Random, base: datetime) -> Dict[str, Any]:
+    """Build one timetable schedule dict."""
+    iata, icao, name = rng.choice(AIRLINES)
+    dep, arr = rng.sample(AIRPORTS, 2)
+    dep_time = base + timedelta(minutes=rng.randrange(0, 7 * 24 * 60, 5))
+    arr_time = dep_time + timedelta(minutes=rng.randrange(45, 14 * 60, 5))
+    number = str(rng.randrange(1, 9999))
+    schedule = {
+        'airline': {'iataCode': iata, 'icaoCode': icao, 'name': name},
+        'flight': {'number': number, 'iataNumber': f"{iata}{number}", 'icaoNumber': f"{icao}{number}"},
+        'departure': {
+            'iataCode': dep, 'icaoCode': f"X{dep}", 'terminal': str(rng.randrange(1, 4)),
+            'gate': f"{rng.choice('ABCD')}{rng.randrange(1, 40)}",
+            'scheduledTime': dep_time.strftime('%Y-%m-%dT%H:%M:%S.000'),
+            'delay': rng.choice([None, None, None, 5, 15, 30])
+        },
+        'arrival': {
+            'iataCode': arr, 'icaoCode': f"X{arr}", 'terminal': str(rng.randrange(1, 4)),
+            'scheduledTime': arr_time.strftime('%Y-%m-%dT%H:%M:%S.000')
+        },
+        'status': rng.choice(STATUSES),
+        'type': rng.choice(['departure', 'arrival'])
+    }
+    if rng.random() < 0.3:
+        partner = rng.choice(AIRLINES)
+        schedule['codeshared'] = {
+            'airline': {'iataCode': partner[0].lower(), 'name': partner[2].lower()},
+            'flight': {'number': str(rng.randrange(1, 9999))}
+        }
+    return schedule
+
+
+def make_schedules(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` synthetic timetable schedules."""
+    rng = random.Random(seed)
+    base = datetime(2025, 10, 1)
+    for _ in range(count):
+        yield make_schedule(rng, base)
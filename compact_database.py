@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Deduplicate flight_schedules in an existing aviation database.
+
+Databases written before flight_schedules had a natural key hold one row per
+collection run for every flight. This removes the duplicates in place, keeps
+the latest row of each flight, adds the unique index and vacuums the file.
+
+Usage:
+    python compact_database.py [db_path]
+"""
+
+import os
+import sqlite3
+import sys
+
+from aviation_database import compact_schedules, ensure_schedule_natural_key
+
+
+def main(db_path: str = "aviation_data.db"):
+    """Compact the flight_schedules table of db_path."""
+    if not os.path.exists(db_path):
+        print(f"❌ Database not found: {db_path}")
+        return 1
+
+    conn = sqlite3.connect(db_path)
+    try:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'flight_schedules'"
+        ).fetchone()
+        if not has_table:
+            print(f"ℹ️  {db_path} has no flight_schedules table, nothing to compact")
+            return 0
+
+        size_before = os.path.getsize(db_path)
+        rows_before = conn.execute('SELECT COUNT(*) FROM flight_schedules').fetchone()[0]
+
+        print(f"🧹 Compacting {db_path}")
+        removed = compact_schedules(conn)
+        ensure_schedule_natural_key(conn)
+        conn.execute('VACUUM')
+
+        size_after = os.path.getsize(db_path)
+        print(f"   Schedules: {rows_before:,} → {rows_before - removed:,} ({removed:,} duplicates removed)")
+        print(f"   File size: {size_before / 1024 / 1024:.1f} MB → {size_after / 1024 / 1024:.1f} MB")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
@@ -0,0 +1,197 @@
+"""
+Thread-safe access to one aviation database from many threads.
+
+A sqlite3.Connection may only be used by the thread that opened it, so the
+thread-pool collector and request handlers each opened their own
+AviationDatabase, re-running the schema DDL every time. ConnectionPool
+instead owns:
+
+- one writer connection, checked out under a lock, since SQLite allows one
+  writer at a time anyway;
+- up to `readers` read-only connections (mode=ro URIs), opened on first use
+  and handed out one per thread. In WAL mode they read the last committed
+  state without waiting for the writer.
+
+    pool = ConnectionPool("aviation_data.db", readers=4)
+    with pool.reader() as conn:
+        conn.execute("SELECT COUNT(*) FROM flight_schedules").fetchone()
+    with pool.writer() as conn:
+        conn.execute("INSERT INTO api_usage (endpoint) VALUES ('/timetable')")
+
+With readers=0, reader() hands out the writer connection without locking,
+which is the single-threaded behaviour of a plain connection.
+
+prepare_once() runs a schema setup function once per database file and
+process, however many pools or AviationDatabase objects open the file.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlite_profiles import connect, connect_readonly, DEFAULT_PROFILE
+
+# (real path, device, inode) of each prepared database file -> its schema_version after setup
+_prepared: Dict[Tuple[str, int, int], int] = {}
+_prepared_lock = threading.Lock()
+
+
+def prepare_once(db_path: str, conn: sqlite3.Connection, setup: Callable[[], Any]) -> bool:
+    """
+    Run setup() unless it already ran in this process for the same database file.
+
+    The file is identified by its real path and inode, so a database deleted
+    and recreated under the same name is set up again, and so is one whose
+    schema changed since (its PRAGMA schema_version moved), e.g. tables
+    dropped by another program. In-memory databases are always set up.
+
+    Args:
+        db_path: Path the database was opened with
+        conn: Connection to it, used to read the schema version
+        setup: Function creating or migrating the schema
+
+    Returns:
+        Whether setup() ran
+    """
+    if db_path in ('', ':memory:') or db_path.startswith('file:'):
+        setup()
+        return True
+    with _prepared_lock:
+        stat = os.stat(db_path)
+        key = (os.path.realpath(db_path), stat.st_dev, stat.st_ino)
+        if _prepared.get(key) == conn.execute('PRAGMA schema_version').fetchone()[0]:
+            return False
+        setup()
+        _prepared[key] = conn.execute('PRAGMA schema_version').fetchone()[0]
+        return True
+
+
+class ConnectionPool:
+    """One writer connection and a pool of read-only connections to a SQLite file."""
+
+    def __init__(self, db_path: str, profile: Union[str, Dict[str, Any], None] = DEFAULT_PROFILE,
+                 readers: int = 4, row_factory=sqlite3.Row):
+        """
+        Open the writer connection; readers are opened on first use.
+
+        Args:
+            db_path: Path to the SQLite database file
+            profile: Connection profile from sqlite_profiles for every connection
+            readers: Maximum number of read-only connections, 0 to read through the writer
+            row_factory: Row factory of every connection
+
+        Raises:
+            ValueError: If readers are requested for an in-memory database
+        """
+        if readers and db_path in ('', ':memory:'):
+            raise ValueError("An in-memory database cannot be shared with read-only connections")
+        self.db_path = db_path
+        self.profile = profile
+        self.max_readers = readers
+        self.row_factory = row_factory
+
+        # Used from whichever thread holds the writer lock
+        self.writer_conn = connect(db_path, profile, check_same_thread=False)
+        self.writer_conn.row_factory = row_factory
+        self._writer_lock = threading.RLock()
+
+        self._readers: List[sqlite3.Connection] = []
+        self._idle: List[sqlite3.Connection] = []
+        self._available = threading.Condition()
+        self._closed = False
+        self.stats = {'writes': 0, 'reads': 0, 'read_waits': 0, 'read_wait_seconds': 0.0}
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Check out the writer connection; other threads wait until the block ends."""
+        with self._writer_lock:
+            self.stats['writes'] += 1
+            yield self.writer_conn
+
+    @property
+    def writer_lock(self) -> threading.RLock:
+        """Lock held while the writer connection is checked out."""
+        return self._writer_lock
+
+    @contextmanager
+    def reader(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a read-only connection for the duration of the block.
+
+        A thread should not check out a second reader while holding one: with
+        every reader taken it would wait for itself.
+
+        Args:
+            timeout: Seconds to wait for a free reader, None to wait indefinitely
+
+        Raises:
+            TimeoutError: If no reader became free within timeout
+        """
+        if not self.max_readers:
+            yield self.writer_conn
+            return
+        conn = self._checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self._checkin(conn)
+
+    def _checkout(self, timeout: Optional[float]) -> sqlite3.Connection:
+        with self._available:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool")
+            self.stats['reads'] += 1
+            if self._idle:
+                return self._idle.pop()
+            if len(self._readers) < self.max_readers:
+                conn = connect_readonly(self.db_path, self.profile, check_same_thread=False)
+                conn.row_factory = self.row_factory
+                self._readers.append(conn)
+                return conn
+
+            self.stats['read_waits'] += 1
+            start = time.perf_counter()
+            if not self._available.wait_for(lambda: self._idle or self._closed, timeout):
+                raise TimeoutError(f"No read-only connection became free within {timeout}s")
+            self.stats['read_wait_seconds'] += time.perf_counter() - start
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool")
+            return self._idle.pop()
+
+    def _checkin(self, conn: sqlite3.Connection):
+        with self._available:
+            if self._closed:
+                conn.close()
+                return
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.append(conn)
+            self._available.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dictionary with writes, reads (checkouts), read_waits (checkouts
+            that found every reader busy), read_wait_seconds, readers_open and readers_idle
+        """
+        with self._available:
+            stats = dict(self.stats)
+            stats['readers_open'] = len(self._readers)
+            stats['readers_idle'] = len(self._idle)
+        return stats
+
+    def close(self):
+        """Close every connection; readers still checked out close when returned."""
+        with self._available:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            self._available.notify_all()
+        with self._writer_lock:
+            self.writer_conn.close()
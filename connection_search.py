@@ -0,0 +1,374 @@
+"""
+Connecting-flight search over flight_schedules.
+
+Legs are loaded once into an in-memory time-expanded graph: for every airport
+pair served, the departure events are kept sorted by time together with a
+suffix minimum of their arrival times. "Earliest arrival at B when leaving A
+no earlier than t" is then a single binary search, so queries never touch
+SQLite and never self-join the schedules table.
+
+Searches run in rounds like RAPTOR: round k holds the earliest arrival at
+every airport using exactly k legs, starting only from airports improved in
+round k-1. That yields the earliest arrival, the fewest-legs itinerary and
+the full legs/arrival trade-off in one pass. Enumerating every itinerary
+within a stop limit is a depth-first search bounded by the time window and
+by the static hop distance to the destination.
+"""
+
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import namedtuple, deque
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Iterable, Tuple
+
+from schedule_times import TimeLike, to_epoch, from_epoch
+
+Leg = namedtuple('Leg', ['airline_iata', 'flight_number', 'departure_iata', 'arrival_iata',
+                         'departure_time', 'arrival_time'])
+
+_INFINITY = float('inf')
+
+
+class Itinerary:
+    """A sequence of connecting legs from an origin to a destination."""
+
+    def __init__(self, legs: List[Leg]):
+        self.legs = legs
+
+    @property
+    def origin(self) -> str:
+        return self.legs[0].departure_iata
+
+    @property
+    def destination(self) -> str:
+        return self.legs[-1].arrival_iata
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def duration(self) -> timedelta:
+        return self.arrival_time - self.departure_time
+
+    @property
+    def stops(self) -> int:
+        return len(self.legs) - 1
+
+    def to_dict(self):
+        """Serialize the itinerary for display or JSON output."""
+        return {
+            'origin': self.origin,
+            'destination': self.destination,
+            'departure_time': self.departure_time.isoformat(),
+            'arrival_time': self.arrival_time.isoformat(),
+            'duration_minutes': int(self.duration.total_seconds() // 60),
+            'stops': self.stops,
+            'legs': [{**leg._asdict(),
+                      'departure_time': leg.departure_time.isoformat(),
+                      'arrival_time': leg.arrival_time.isoformat()} for leg in self.legs]
+        }
+
+    def __repr__(self):
+        path = ' → '.join([self.origin] + [leg.arrival_iata for leg in self.legs])
+        return f"Itinerary({path}, {self.departure_time:%Y-%m-%d %H:%M} → {self.arrival_time:%Y-%m-%d %H:%M})"
+
+
+class _Route:
+    """Departure events from one airport to another, sorted by departure time."""
+
+    __slots__ = ('arrival', 'departures', 'arrivals', 'legs', 'best_arrival', 'best_leg')
+
+    def __init__(self, arrival: int, events: List[Tuple[int, int, int]]):
+        events.sort()
+        self.arrival = arrival
+        self.departures = [event[0] for event in events]
+        self.arrivals = [event[1] for event in events]
+        self.legs = [event[2] for event in events]
+
+        # best_arrival[i]: earliest arrival among events i.. (and the leg achieving it)
+        self.best_arrival = self.arrivals[:]
+        self.best_leg = self.legs[:]
+        for i in range(len(events) - 2, -1, -1):
+            if self.best_arrival[i + 1] < self.best_arrival[i]:
+                self.best_arrival[i] = self.best_arrival[i + 1]
+                self.best_leg[i] = self.best_leg[i + 1]
+
+
+class ConnectionSearchEngine:
+    """In-memory connection search over scheduled flight legs."""
+
+    def __init__(self, legs: Iterable[Tuple]):
+        """
+        Build the time-expanded graph.
+
+        Args:
+            legs: (airline_iata, flight_number, departure_iata, arrival_iata,
+                  departure_time, arrival_time) tuples, optionally followed by the
+                  departure and arrival UTC offsets in minutes. Times are UTC
+                  datetimes, ISO strings or epoch seconds; with offsets, the legs
+                  of returned itineraries carry local times. Legs that do not
+                  arrive after they depart are skipped.
+        """
+        self.airports: List[str] = []
+        self.airport_index: Dict[str, int] = {}
+        self._flights: List[Tuple[str, str]] = []
+        self._leg_endpoints: List[Tuple[int, int, int, int]] = []
+        self._leg_offsets: List[Tuple[Optional[int], Optional[int]]] = []
+
+        events: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+        seen = set()
+        for leg in legs:
+            airline, flight_number, departure, arrival, departure_time, arrival_time = leg[:6]
+            if not departure or not arrival or departure == arrival:
+                continue
+            departs = to_epoch(departure_time)
+            arrives = to_epoch(arrival_time)
+            if arrives <= departs:
+                continue
+            # The same flight is reported by both its departure and arrival airport
+            key = (airline, flight_number, departure, departs)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            u = self._airport(departure)
+            v = self._airport(arrival)
+            leg_id = len(self._flights)
+            self._flights.append((airline, flight_number))
+            self._leg_endpoints.append((u, v, departs, arrives))
+            self._leg_offsets.append((leg[6], leg[7]) if len(leg) >= 8 else (None, None))
+            events.setdefault((u, v), []).append((departs, arrives, leg_id))
+
+        self.routes: List[List[_Route]] = [[] for _ in self.airports]
+        self._inbound: List[List[int]] = [[] for _ in self.airports]
+        for (u, v), route_events in events.items():
+            self.routes[u].append(_Route(v, route_events))
+            self._inbound[v].append(u)
+
+    @classmethod
+    def from_database(cls, db, include_codeshares: bool = False) -> 'ConnectionSearchEngine':
+        """
+        Load every schedulable leg from flight_schedules.
+
+        Legs are placed in time by their UTC epoch columns; rows at airports
+        without a known timezone have no epochs and are skipped.
+
+        Args:
+            db: AviationDatabase or sqlite3 connection
+            include_codeshares: Also load marketing codeshare entries, which
+                    duplicate the operating flight
+        """
+        query = '''
+            SELECT airline_iata, flight_number, departure_iata, arrival_iata,
+                   departure_epoch, arrival_epoch, departure_utc_offset, arrival_utc_offset
+            FROM flight_schedules
+            WHERE departure_iata IS NOT NULL AND arrival_iata IS NOT NULL
+              AND departure_epoch IS NOT NULL AND arrival_epoch IS NOT NULL
+        '''
+        if not include_codeshares:
+            query += " AND codeshare_flight IS NULL"
+        with nullcontext(db) if isinstance(db, sqlite3.Connection) else db.pool.reader() as conn:
+            return cls(tuple(row) for row in conn.execute(query))
+
+    @property
+    def leg_count(self) -> int:
+        return len(self._flights)
+
+    def _airport(self, code: str) -> int:
+        index = self.airport_index.get(code)
+        if index is None:
+            index = self.airport_index[code] = len(self.airports)
+            self.airports.append(code)
+        return index
+
+    def _leg(self, leg_id: int) -> Leg:
+        airline, flight_number = self._flights[leg_id]
+        u, v, departs, arrives = self._leg_endpoints[leg_id]
+        departure_offset, arrival_offset = self._leg_offsets[leg_id]
+        return Leg(airline, flight_number, self.airports[u], self.airports[v],
+                   from_epoch(departs, departure_offset), from_epoch(arrives, arrival_offset))
+
+    def _endpoints(self, origin: str, destination: str) -> Tuple[Optional[int], Optional[int]]:
+        return self.airport_index.get(origin), self.airport_index.get(destination)
+
+    def _rounds(self, origin: str, destination: str, depart_after: TimeLike,
+                min_connection: int, max_legs: int) -> List[Itinerary]:
+        """Best itinerary per leg count that improves on every shorter one."""
+        source, target = self._endpoints(origin, destination)
+        if source is None or target is None or source == target:
+            return []
+
+        start = to_epoch(depart_after)
+        connection = min_connection * 60
+        best = [_INFINITY] * len(self.airports)
+        best[source] = start
+        previous = {source: start}
+        parents: List[Dict[int, int]] = []
+        found = []
+
+        for round_number in range(1, max_legs + 1):
+            arrivals: Dict[int, int] = {}
+            parent: Dict[int, int] = {}
+            for u, arrived in previous.items():
+                ready = arrived if u == source else arrived + connection
+                if ready >= best[target]:
+                    continue
+                for route in self.routes[u]:
+                    i = bisect_left(route.departures, ready)
+                    if i == len(route.departures):
+                        continue
+                    arrival = route.best_arrival[i]
+                    v = route.arrival
+                    # Only keep labels that beat every earlier round here and at the target
+                    if arrival < best[v] and arrival < best[target]:
+                        best[v] = arrival
+                        arrivals[v] = arrival
+                        parent[v] = route.best_leg[i]
+            arrivals.pop(source, None)
+            parents.append(parent)
+            if target in arrivals:
+                found.append(self._unwind(parents, round_number, target))
+            if not arrivals:
+                break
+            previous = arrivals
+
+        return found
+
+    def _unwind(self, parents: List[Dict[int, int]], legs: int, target: int) -> Itinerary:
+        path = []
+        airport = target
+        for round_number in range(legs - 1, -1, -1):
+            leg_id = parents[round_number][airport]
+            path.append(self._leg(leg_id))
+            airport = self._leg_endpoints[leg_id][0]
+        path.reverse()
+        return Itinerary(path)
+
+    def earliest_arrival(self, origin: str, destination: str, depart_after: TimeLike,
+                         min_connection: int = 45, max_legs: int = 4) -> Optional[Itinerary]:
+        """
+        Find the itinerary that reaches the destination soonest.
+
+        Args:
+            origin: Departure airport IATA code
+            destination: Arrival airport IATA code
+            depart_after: Earliest departure time from the origin
+            min_connection: Minimum minutes between arriving and departing at a connection
+            max_legs: Maximum number of flights
+
+        Returns:
+            The earliest-arriving itinerary (fewest legs on ties), or None
+        """
+        found = self._rounds(origin, destination, depart_after, min_connection, max_legs)
+        return found[-1] if found else None
+
+    def fewest_legs(self, origin: str, destination: str, depart_after: TimeLike,
+                    min_connection: int = 45, max_legs: int = 4) -> Optional[Itinerary]:
+        """
+        Find the itinerary with the fewest flights, earliest arriving among those.
+
+        Args:
+            origin: Departure airport IATA code
+            destination: Arrival airport IATA code
+            depart_after: Earliest departure time from the origin
+            min_connection: Minimum minutes between arriving and departing at a connection
+            max_legs: Maximum number of flights
+
+        Returns:
+            The fewest-legs itinerary, or None
+        """
+        found = self._rounds(origin, destination, depart_after, min_connection, max_legs)
+        return found[0] if found else None
+
+    def pareto_itineraries(self, origin: str, destination: str, depart_after: TimeLike,
+                           min_connection: int = 45, max_legs: int = 4) -> List[Itinerary]:
+        """
+        Get the legs/arrival trade-off: for each number of legs, the earliest
+        itinerary that arrives sooner than any itinerary with fewer legs.
+
+        Returns:
+            Itineraries ordered by increasing number of legs
+        """
+        return self._rounds(origin, destination, depart_after, min_connection, max_legs)
+
+    def _hops_to(self, target: int) -> List[float]:
+        """Minimum number of legs from every airport to the target, ignoring time."""
+        hops = [_INFINITY] * len(self.airports)
+        hops[target] = 0
+        queue = deque([target])
+        while queue:
+            v = queue.popleft()
+            for u in self._inbound[v]:
+                if hops[u] == _INFINITY:
+                    hops[u] = hops[v] + 1
+                    queue.append(u)
+        return hops
+
+    def itineraries(self, origin: str, destination: str, depart_after: TimeLike,
+                    max_stops: int = 1, min_connection: int = 45,
+                    arrive_before: Optional[TimeLike] = None,
+                    limit: Optional[int] = None) -> List[Itinerary]:
+        """
+        Enumerate every itinerary within a stop limit and time window.
+
+        Args:
+            origin: Departure airport IATA code
+            destination: Arrival airport IATA code
+            depart_after: Earliest departure time from the origin
+            max_stops: Maximum number of connections (legs - 1)
+            min_connection: Minimum minutes between arriving and departing at a connection
+            arrive_before: Latest arrival at the destination. Defaults to 24 hours
+                    after depart_after.
+            limit: Return at most this many itineraries
+
+        Returns:
+            Itineraries sorted by arrival time, then number of stops
+        """
+        source, target = self._endpoints(origin, destination)
+        if source is None or target is None or source == target:
+            return []
+
+        start = to_epoch(depart_after)
+        end = to_epoch(arrive_before) if arrive_before is not None else start + 24 * 3600
+        connection = min_connection * 60
+        max_legs = max_stops + 1
+        hops = self._hops_to(target)
+        if hops[source] > max_legs:
+            return []
+
+        found: List[Tuple[int, int, List[int]]] = []
+        path: List[int] = []
+        visited = {source}
+
+        def extend(u: int, ready: int):
+            remaining = max_legs - len(path) - 1
+            for route in self.routes[u]:
+                v = route.arrival
+                if v in visited or hops[v] > remaining:
+                    continue
+                first = bisect_left(route.departures, ready)
+                last = bisect_right(route.departures, end)
+                for i in range(first, last):
+                    arrival = route.arrivals[i]
+                    if arrival > end:
+                        continue
+                    path.append(route.legs[i])
+                    if v == target:
+                        found.append((arrival, len(path), path[:]))
+                    elif remaining:
+                        visited.add(v)
+                        extend(v, arrival + connection)
+                        visited.discard(v)
+                    path.pop()
+
+        extend(source, start)
+        found.sort(key=lambda item: (item[0], item[1]))
+        if limit is not None:
+            found = found[:limit]
+        return [Itinerary([self._leg(leg_id) for leg_id in leg_ids]) for _, _, leg_ids in found]
@@ -0,0 +1,125 @@
+"""
+Process-local cache of the airlines and airports dimension tables.
+
+Every schedule references one airline and two airports, and a page of 600
+schedules usually names a few dozen distinct codes. Writing each reference
+with INSERT OR REPLACE rewrites the row, deletes and re-inserts it under a
+UNIQUE conflict and hands it a new id every time. DimensionCache loads the
+known codes of a table once and only writes a code when it is new or its
+ICAO code or name actually changed, with a true UPSERT that keeps the row
+and its id.
+
+NULLs never overwrite a known ICAO code or name, and an ICAO code already
+held by another row is left off rather than stealing it. The cache keeps
+what the upsert actually stored (RETURNING) and remembers the refused ICAO
+code, so the same entry in later batches is a hit, not another rewrite.
+
+The cache assumes this connection is the only writer of the table; call
+reset() if a writing transaction rolls back or rows change behind its back.
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DIMENSION_TABLES = ('airlines', 'airports')
+
+# (iata_code, icao_code, name)
+Entry = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class DimensionCache:
+    """Known codes of an airlines or airports table, with their surrogate ids."""
+
+    def __init__(self, conn: sqlite3.Connection, table: str):
+        if table not in DIMENSION_TABLES:
+            raise ValueError(f"table must be one of {DIMENSION_TABLES}, got {table!r}")
+        self.conn = conn
+        self.table = table
+        self._codes: Optional[Dict[str, List]] = None
+        self.stats = {'hits': 0, 'inserts': 0, 'updates': 0}
+        self._upsert_sql = f'''
+            INSERT INTO {table} (iata_code, icao_code, name) VALUES (?, ?, ?)
+            ON CONFLICT (iata_code) DO UPDATE SET
+                icao_code = CASE
+                    WHEN excluded.icao_code IS NULL OR EXISTS (
+                        SELECT 1 FROM {table} other WHERE other.icao_code = excluded.icao_code)
+                    THEN {table}.icao_code ELSE excluded.icao_code END,
+                name = COALESCE(excluded.name, {table}.name),
+                updated_at = CURRENT_TIMESTAMP
+            ON CONFLICT DO NOTHING
+            RETURNING id, icao_code, name
+        '''
+
+    def _index(self) -> Dict[str, List]:
+        """Load the table's codes on first use: iata_code -> [id, icao_code, name, refused icao_code]."""
+        if self._codes is None:
+            self._codes = {
+                row[1]: [row[0], row[2], row[3], None] for row in self.conn.execute(
+                    f'SELECT id, iata_code, icao_code, name FROM {self.table} WHERE iata_code IS NOT NULL')
+            }
+        return self._codes
+
+    def reset(self):
+        """Drop the cached codes; they are reloaded from the table on next use."""
+        self._codes = None
+
+    def ensure(self, entries: Iterable[Entry]) -> int:
+        """
+        Make sure codes exist with their latest ICAO code and name.
+
+        Runs in the caller's transaction. Entries without an IATA code are
+        ignored; repeated codes are merged, later non-NULL values winning.
+
+        Returns:
+            Number of codes inserted or updated
+        """
+        codes = self._index()
+        pending: Dict[str, List] = {}
+        for iata_code, icao_code, name in entries:
+            if not iata_code:
+                continue
+            merged = pending.get(iata_code)
+            if merged is not None:
+                merged[0] = icao_code or merged[0]
+                merged[1] = name or merged[1]
+            else:
+                pending[iata_code] = [icao_code, name]
+
+        writes = []
+        for iata_code, (icao_code, name) in pending.items():
+            known = codes.get(iata_code)
+            if known is None:
+                self.stats['inserts'] += 1
+            elif (icao_code and icao_code not in (known[1], known[3])) or (name and name != known[2]):
+                self.stats['updates'] += 1
+            else:
+                self.stats['hits'] += 1
+                continue
+            writes.append((iata_code, icao_code, name))
+
+        for iata_code, icao_code, name in writes:
+            stored = self.conn.execute(self._upsert_sql, (iata_code, icao_code, name)).fetchone()
+            if stored is None:
+                # Its ICAO code belongs to another row; store it without it
+                stored = self.conn.execute(self._upsert_sql, (iata_code, None, name)).fetchone()
+            refused = icao_code if icao_code and icao_code != stored[1] else None
+            codes[iata_code] = [stored[0], stored[1], stored[2], refused]
+        return len(writes)
+
+    def id(self, iata_code: Optional[str]) -> Optional[int]:
+        """Surrogate id of a code, or None if it is not stored."""
+        known = self._index().get(iata_code)
+        return known[0] if known else None
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, inserts, updates, entries and hit_ratio
+        """
+        stats = dict(self.stats)
+        stats['entries'] = len(self._codes) if self._codes is not None else 0
+        lookups = stats['hits'] + stats['inserts'] + stats['updates']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,253 @@
+"""
+Shared HTTP transport for the Aviation Edge API clients.
+
+Wraps a pooled requests.Session with keep-alive, connect/read timeouts and
+retry with exponential backoff and jitter on 429/5xx responses.
+
+requests and python-dotenv are imported on first use rather than at import
+time, so modules that only need the retry helpers or the database (CLI
+scripts, cron jobs, the httpx-based async clients) start without them.
+"""
+
+import functools
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Iterator, TYPE_CHECKING
+
+from response_cache import ResponseCache
+
+if TYPE_CHECKING:
+    import requests
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@functools.lru_cache(maxsize=None)
+def _load_dotenv():
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def api_key_from_env() -> Optional[str]:
+    """The AVIATION_EDGE_API_KEY environment variable, loading .env the first time."""
+    _load_dotenv()
+    return os.getenv('AVIATION_EDGE_API_KEY')
+
+
+def backoff_delay(attempt: int, backoff_factor: float, backoff_max: float) -> float:
+    """Exponential backoff with full jitter for a zero-based retry attempt."""
+    return random.uniform(0, min(backoff_max, backoff_factor * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str], retry_after_max: float) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), retry_after_max)
+
+
+class AviationEdgeTransport:
+    """Pooled, retrying HTTP transport shared by the Aviation Edge clients."""
+
+    def __init__(self,
+                 connect_timeout: float = 5.0,
+                 read_timeout: float = 30.0,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 backoff_max: float = 30.0,
+                 retry_after_max: float = 120.0,
+                 pool_size: int = 10,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            connect_timeout: Seconds to wait for a TCP/TLS connection
+            read_timeout: Seconds to wait between bytes of the response
+            max_retries: Retries after the first attempt on 429/5xx or connection errors
+            backoff_factor: Base delay in seconds; attempt n waits up to factor * 2**n
+            backoff_max: Upper bound for a computed backoff delay
+            retry_after_max: Upper bound for a server-provided Retry-After delay
+            pool_size: Keep-alive connections kept per host (use at least the worker count)
+            cache: Optional response cache consulted before the network
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.cache = cache
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, rate_limiter=None,
+            stream: bool = False) -> 'requests.Response':
+        """
+        Send a GET request, serving it from the response cache when possible.
+
+        Fresh cache entries are returned without touching the network or the
+        rate limiter. Stale entries with validators are revalidated with a
+        conditional request, and a 304 reply refreshes the cached copy.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            rate_limiter: Optional token bucket acquired before every network attempt
+            stream: Leave the body unread; consume it with iter_body() so that
+                    bodies up to the cache's max_entry_bytes are still cached.
+
+        Returns:
+            The final response. Callers still call raise_for_status() on it.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt fails to connect
+        """
+        if self.cache is None:
+            return self._send(url, params, rate_limiter, stream=stream)
+
+        endpoint = self.cache.endpoint_for(url)
+        key = self.cache.make_key(endpoint, params)
+        entry = self.cache.lookup(key)
+        if entry and entry['fresh']:
+            return self._cached_response(url, entry)
+
+        response = self._send(url, params, rate_limiter, self.cache.conditional_headers(entry), stream)
+        ttl = self.cache.ttl_for(endpoint, params)
+        if response.status_code == 304 and entry:
+            self.cache.revalidated(key, ttl)
+            return self._cached_response(url, entry)
+
+        if response.status_code == 200:
+            pending = (key, endpoint, ttl, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            if stream:
+                response.cache_pending = pending
+            else:
+                self._store(pending, response.content)
+        return response
+
+    def _store(self, pending, body: bytes):
+        # API errors come back as a JSON object with status 200; only cache schedule lists
+        if not body.lstrip().startswith(b'{'):
+            key, endpoint, ttl, etag, last_modified = pending
+            self.cache.store(key, endpoint, body, ttl, etag, last_modified)
+
+    def iter_body(self, response: 'requests.Response', chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Yield the body of a streamed response in chunks.
+
+        While the body is no larger than the cache's max_entry_bytes the chunks
+        are also collected and stored once the body has been fully read.
+        """
+        pending = getattr(response, 'cache_pending', None)
+        if pending is None:
+            yield from response.iter_content(chunk_size=chunk_size)
+            return
+
+        parts = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if parts is not None:
+                size += len(chunk)
+                if size > self.cache.max_entry_bytes:
+                    parts = None
+                else:
+                    parts.append(chunk)
+            yield chunk
+
+        if parts is not None:
+            self._store(pending, b''.join(parts))
+
+    @staticmethod
+    def _cached_response(url: str, entry: Dict[str, Any]) -> 'requests.Response':
+        """Build a response object from a cached body."""
+        import requests
+        response = requests.Response()
+        response.status_code = 200
+        response._content = entry['body']
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        response.from_cache = True
+        return response
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]], rate_limiter=None,
+              headers: Optional[Dict[str, str]] = None, stream: bool = False) -> 'requests.Response':
+        """Send a GET request over the pooled session, retrying transient failures."""
+        import requests
+        attempt = 0
+        while True:
+            if rate_limiter:
+                rate_limiter.acquire()
+
+            with self._lock:
+                self._counters['requests'] += 1
+
+            try:
+                response = self.session.get(url, params=params, headers=headers,
+                                            timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        self._counters['failures'] += 1
+                    raise
+                delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                delay = parse_retry_after(response.headers.get('Retry-After'), self.retry_after_max)
+                if delay is None:
+                    delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+                response.close()
+
+            with self._lock:
+                self._counters['retries'] += 1
+            attempt += 1
+            time.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get transport counters.
+
+        Returns:
+            Dictionary with requests, retries, failures, connections_opened,
+            connections_reused and, when caching, the cache counters
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        if self.cache is not None:
+            stats['cache'] = self.cache.get_stats()
+
+        # Per-host pools kept by the session; counters cover the pools still alive
+        pool_manager = self._adapter.poolmanager
+        pools = [pool_manager.pools[key] for key in pool_manager.pools.keys() if key in pool_manager.pools]
+
+        opened = sum(pool.num_connections for pool in pools)
+        served = sum(pool.num_requests for pool in pools)
+        stats['connections_opened'] = opened
+        stats['connections_reused'] = max(served - opened, 0)
+        return stats
+
+    def close(self):
+        """Close the session and its pooled connections."""
+        self.session.close()
@@ -0,0 +1,120 @@
+"""
+Incremental parsing of JSON array responses.
+
+Aviation Edge returns schedules as one top-level JSON array. iter_json_array
+decodes it element by element from a stream of byte chunks, so only the
+current chunk and the element being parsed are held in memory.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed response is not a well-formed JSON array."""
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array read from byte chunks.
+
+    A top-level JSON object (how the API reports errors) is raised as
+    JSONStreamError carrying the decoded object in its ``payload`` attribute.
+
+    Args:
+        chunks: Iterable of raw response body chunks
+        encoding: Character encoding of the body
+
+    Raises:
+        JSONStreamError: If the body is not a JSON array or ends early
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = iter(chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+
+    def fill():
+        # Append the next chunk, dropping the consumed prefix; False at end of stream
+        nonlocal buffer, pos, eof
+        for chunk in chunk_iter:
+            if chunk:
+                buffer = buffer[pos:] + text_decoder.decode(chunk)
+                pos = 0
+                return True
+        buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        pos = 0
+        eof = True
+        return False
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer):
+        raise JSONStreamError("Empty response body")
+
+    if buffer[pos] == '{':
+        # Error responses are small JSON objects; read them whole
+        while fill():
+            pass
+        try:
+            payload = json.loads(buffer[pos:])
+        except ValueError as e:
+            raise JSONStreamError(f"Invalid JSON object: {e}") from e
+        error = JSONStreamError(f"Expected a JSON array, got an object: {payload}")
+        error.payload = payload
+        raise error
+
+    if buffer[pos] != '[':
+        raise JSONStreamError(f"Expected a JSON array, got {buffer[pos]!r}")
+    pos += 1
+
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise JSONStreamError("Unexpected end of stream inside array")
+
+        char = buffer[pos]
+        if char == ']':
+            # Read to the end of the stream so callers teeing the chunks see all of them
+            pos += 1
+            skip_whitespace()
+            if pos < len(buffer):
+                raise JSONStreamError(f"Unexpected data after array at offset {pos}")
+            return
+        if started:
+            if char != ',':
+                raise JSONStreamError(f"Expected ',' or ']' at offset {pos}, got {char!r}")
+            pos += 1
+            skip_whitespace()
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Most likely the element continues in the next chunk
+                if eof or not fill():
+                    raise JSONStreamError("Unexpected end of stream or invalid array element")
+                continue
+            # A number cut by a chunk boundary decodes as a shorter number; make
+            # sure a delimiter follows before accepting it
+            if (isinstance(value, (int, float)) and not eof
+                    and (end == len(buffer) or buffer[end] not in ',]' + _WHITESPACE)):
+                if fill():
+                    continue
+            break
+
+        pos = end
+        started = True
+        yield value
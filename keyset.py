@@ -0,0 +1,122 @@
+"""
+Keyset (seek) pagination for SQLite listings.
+
+OFFSET pagination re-reads every skipped row, and fetchall() materializes
+every match at once. Listings here are instead ordered by a sort column with
+the row id as tie-breaker, and a page ends in a cursor, the (sort value, id)
+of its last row. The next page asks for rows after that key, which an index
+ending in the sort column (rowid is implicitly its last column) seeks to
+directly, so every page costs the same however deep it is.
+
+Rows are streamed with fetchmany(), and statements are closed as soon as the
+consumer stops, so an abandoned generator never holds a read open.
+"""
+
+import sqlite3
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# (sort value, id) of the last row of a page
+Cursor = Tuple[Any, int]
+
+
+def keyset_condition(order_column: str, id_column: str, after: Optional[Sequence],
+                     descending: bool = False, nullable: bool = True) -> Tuple[str, List[Any]]:
+    """
+    SQL condition selecting rows past a cursor in ORDER BY order_column, id_column.
+
+    NULL sort values come first in ascending and last in descending SQLite
+    order, and are handled accordingly. A plain row-value comparison lets
+    SQLite seek the index; the extra NULL branch a descending nullable
+    column needs turns that into a scan, so pass nullable=False where the
+    column is never NULL in the rows listed.
+
+    Args:
+        order_column: Sort column
+        id_column: Unique tie-breaker, usually the rowid
+        after: Cursor of the previous page, or None for the first page
+        descending: Whether both columns are sorted DESC
+        nullable: Whether order_column can be NULL
+
+    Returns:
+        (condition, params); the condition is '1=1' for the first page
+    """
+    if after is None:
+        return '1=1', []
+    value, row_id = after
+    if not nullable and value is not None:
+        return f"({order_column}, {id_column}) {'<' if descending else '>'} (?, ?)", [value, row_id]
+    if descending:
+        if value is None:
+            return f"({order_column} IS NULL AND {id_column} < ?)", [row_id]
+        return f"(({order_column}, {id_column}) < (?, ?) OR {order_column} IS NULL)", [value, row_id]
+    if value is None:
+        return f"(({order_column} IS NULL AND {id_column} > ?) OR {order_column} IS NOT NULL)", [row_id]
+    return f"({order_column}, {id_column}) > (?, ?)", [value, row_id]
+
+
+def projection(columns: Optional[Iterable[str]], available: Dict[str, str]) -> List[Tuple[str, str]]:
+    """
+    Resolve requested column names to their SQL expressions.
+
+    Args:
+        columns: Names to return, or None for all available columns
+        available: Column name -> SQL expression, in default order
+
+    Raises:
+        ValueError: If a requested column is not available
+    """
+    if columns is None:
+        return list(available.items())
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}. Use any of: {', '.join(available)}")
+    return [(column, available[column]) for column in columns]
+
+
+def iter_rows(cursor: sqlite3.Cursor, sql: str, params: Sequence[Any],
+              batch_size: int = 1000) -> Iterator[Tuple]:
+    """
+    Execute sql and yield its rows as plain tuples, fetchmany(batch_size) at
+    a time. The cursor is closed when the rows run out or the consumer stops.
+    """
+    cursor.row_factory = None
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def keyed(rows: Iterable[Tuple], names: Sequence[str]) -> Iterator[Tuple[Dict[str, Any], Cursor]]:
+    """
+    Split rows selected as names + (sort value, id) into (dict, cursor) pairs.
+    """
+    width = len(names)
+    for row in rows:
+        yield dict(zip(names, row)), (row[width], row[width + 1])
+
+
+def take_page(pairs: Iterator[Tuple[Dict[str, Any], Cursor]],
+              page_size: int) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+    """
+    Take one page from (dict, cursor) pairs.
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    pairs = iter(pairs)
+    page = list(islice(pairs, page_size + 1))
+    close = getattr(pairs, 'close', None)
+    if close:
+        close()
+    if len(page) > page_size:
+        page = page[:page_size]
+        return [row for row, _ in page], page[-1][1]
+    return [row for row, _ in page], None
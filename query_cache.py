@@ -0,0 +1,165 @@
+"""
+Read-through cache for AviationDatabase analytics.
+
+The summary methods aggregate whole tables, yet between two collection runs
+their answer never changes. Every write method is tagged with the tables it
+touches (@writes) and bumps their write generation; every cached read
+(@cached) remembers the generations of the tables it reads. A cached result
+is returned only while those generations are unchanged, so it is never
+stale, and a hit is a dict lookup instead of a table scan.
+
+Writes that bypass the tagged methods are caught too: a commit from another
+connection changes PRAGMA data_version, and a raw statement on this
+connection changes its total_changes. Either drops every cached result.
+
+Results are copied on the way in and out, so callers may modify them.
+The cache may be shared by threads reading through a ConnectionPool; its
+bookkeeping is locked, and results are computed outside the lock. The
+connection it checks is the pool's writer, so those checks hold the
+writer lock and never run in the middle of another thread's write.
+"""
+
+import functools
+import inspect
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def _copy(value: Any) -> Any:
+    """Copy a result made of dicts, lists and scalars; much cheaper than copy.deepcopy."""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class QueryCache:
+    """Cached query results, invalidated by per-table write generations."""
+
+    def __init__(self, conn: sqlite3.Connection, max_entries: int = 256,
+                 writer_lock: Optional[threading.RLock] = None):
+        """
+        Args:
+            conn: Connection writes go through, checked for untracked writes
+            max_entries: Cached results kept, least recently used dropped first
+            writer_lock: Lock other threads hold while using conn
+        """
+        self.conn = conn
+        self._writer_lock = writer_lock or threading.RLock()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._data_version = None
+        self._total_changes = conn.total_changes
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        self._lock = threading.RLock()
+
+    def bump(self, *tables: str):
+        """Record a write to tables through a tagged method."""
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            self._total_changes = self.conn.total_changes
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self.stats['invalidations'] += 1
+
+    def sync(self):
+        """Clear the cache if anything wrote to the database behind the tagged methods."""
+        # The writer lock first, in the same order as tagged writes take both
+        with self._writer_lock, self._lock:
+            data_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+            if data_version != self._data_version or self.conn.total_changes != self._total_changes:
+                if self._entries:
+                    self.clear()
+                self._data_version = data_version
+                self._total_changes = self.conn.total_changes
+
+    def read(self, key: Hashable, tables: Iterable[str], compute: Callable[[], Any]) -> Any:
+        """Return the cached result for key, computing it if missing or outdated."""
+        self.sync()
+        with self._lock:
+            # Taken before computing: a write committed meanwhile outdates the entry
+            generations = tuple(self._generations.get(table, 0) for table in tables)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generations:
+                self.stats['hits'] += 1
+                self._entries.move_to_end(key)
+                return _copy(entry[1])
+            self.stats['misses'] += 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = (generations, _copy(result))
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, invalidations, entries and hit_ratio
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+def cached(*tables: str):
+    """
+    Serve a method's result from self.query_cache until one of tables is written.
+
+    The key is the method name and its arguments with defaults applied, so
+    f(10) and f(limit=10) share an entry. The uncached method stays
+    available as .uncached.
+    """
+    def decorator(method):
+        # Parameters after self with their defaults; inspect's bind() is too slow for a cache hit
+        parameters = list(inspect.signature(method).parameters.values())[1:]
+        names = [parameter.name for parameter in parameters]
+        defaults = [parameter.default for parameter in parameters]
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if len(args) > len(names) or any(name not in names[len(args):] for name in kwargs):
+                return method(self, *args, **kwargs)  # raises the usual TypeError
+            key = (method.__name__,) + args + tuple(kwargs.get(name, default) for name, default
+                                                    in zip(names[len(args):], defaults[len(args):]))
+            return self.query_cache.read(key, tables, lambda: method(self, *args, **kwargs))
+
+        wrapper.uncached = method
+        return wrapper
+    return decorator
+
+
+def writes(*tables: str):
+    """
+    Bump the write generation of tables after the method runs, even if it fails.
+
+    The method runs holding self.pool's writer connection, so tagged writes
+    from different threads are serialized.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.pool.writer():
+                # Account for untracked writes first, or the bump would hide them
+                self.query_cache.sync()
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    self.query_cache.bump(*tables)
+        return wrapper
+    return decorator
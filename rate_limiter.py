@@ -0,0 +1,120 @@
+"""
+Token-bucket rate limiting for Aviation Edge API endpoints.
+
+Each endpoint gets its own bucket so concurrent workers can run at the
+API quota instead of sleeping a fixed interval after every call.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Requests per second and burst size for each endpoint
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    '/timetable': (2.0, 4),
+    '/flightsFuture': (1.0, 2),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available and take it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """
+        Wait without blocking the event loop until a token is available and take it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class EndpointRateLimiter:
+    """Collection of token buckets keyed by API endpoint path."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        """
+        Initialize per-endpoint buckets.
+
+        Args:
+            limits: Mapping of endpoint path to (requests per second, burst size).
+                    Defaults to DEFAULT_RATE_LIMITS.
+        """
+        limits = limits or DEFAULT_RATE_LIMITS
+        self.buckets = {endpoint: TokenBucket(rate, capacity)
+                        for endpoint, (rate, capacity) in limits.items()}
+
+    def bucket(self, endpoint: str) -> Optional[TokenBucket]:
+        """Get the bucket for an endpoint, or None if it is unlimited."""
+        return self.buckets.get(endpoint)
+
+    def acquire(self, endpoint: str) -> float:
+        """Wait for a token on the given endpoint."""
+        bucket = self.buckets.get(endpoint)
+        return bucket.acquire() if bucket else 0.0
+
+    def rate(self, endpoint: str) -> Optional[float]:
+        """Get the configured requests per second for an endpoint."""
+        bucket = self.buckets.get(endpoint)
+        return bucket.rate if bucket else None
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Check and rebuild the flight_schedules rollup tables of an aviation database.
+
+The rollups behind get_airport_traffic, get_airline_activity and
+get_route_frequency are kept current by triggers. This recomputes them from
+flight_schedules, reporting any groups that had drifted, e.g. after the
+triggers were dropped for a manual bulk load.
+
+Usage:
+    python rebuild_rollups.py [db_path] [--check]
+
+With --check nothing is written: the rollups are only compared, and the
+exit status is 1 if any is missing or drifted.
+"""
+
+import os
+import sqlite3
+import sys
+
+from schedule_rollups import ROLLUP_TABLES, check_rollups, ensure_schedule_rollups, rebuild_rollups
+
+
+def main(db_path: str = "aviation_data.db", check_only: bool = False):
+    """Check, and unless check_only rebuild, the rollups of db_path."""
+    if not os.path.exists(db_path):
+        print(f"❌ Database not found: {db_path}")
+        return 1
+
+    conn = sqlite3.connect(db_path)
+    try:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'flight_schedules'"
+        ).fetchone()
+        if not has_table:
+            print(f"ℹ️  {db_path} has no flight_schedules table, nothing to roll up")
+            return 0
+
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        present = [table for table in ROLLUP_TABLES if table in existing]
+        missing = [table for table in ROLLUP_TABLES if table not in existing]
+        if check_only:
+            for table in missing:
+                print(f"❌ {table}: missing")
+        else:
+            # Builds the missing rollups from flight_schedules, and their triggers
+            ensure_schedule_rollups(conn)
+        drift = check_rollups(conn, present)
+        for table, groups in drift.items():
+            status = "✅" if not groups else "⚠️ "
+            print(f"{status} {table}: {groups:,} drifted groups")
+        if check_only:
+            return 1 if missing or any(drift.values()) else 0
+
+        if present:
+            written = rebuild_rollups(conn, present)
+            print(f"📈 Rebuilt {written:,} rollup rows of {', '.join(present)} from flight_schedules")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != '--check']
+    sys.exit(main(*arguments[:1], check_only='--check' in sys.argv[1:]))
@@ -8,15 +8,42 @@ Now using Future Schedules API and Schedule API only.
 from aviation_edge_schedule_client import AviationEdgeScheduleClient
 from aviation_edge_future_client import AviationEdgeFutureSchedulesClient
 from aviation_database import AviationDatabase
-import time
-from datetime import datetime
+from rate_limiter import EndpointRateLimiter
+from http_transport import AviationEdgeTransport
+from response_cache import ResponseCache
+from request_planner import plan_regions
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import queue
+import threading
 
 class RegionalAviationCollector:
     """Collector for regional aviation data with comprehensive coverage."""
     
-    def __init__(self):
-        self.schedules_client = AviationEdgeScheduleClient()
-        self.future_client = AviationEdgeFutureSchedulesClient()
+    def __init__(self, max_workers: int = 4, rate_limits=None, max_retries: int = 3,
+                 stream_batch_size: int = 500, db_profile: str = 'ingest', write_batch_size: int = 2000):
+        """
+        Initialize the collector.
+        
+        Args:
+            max_workers: Number of concurrent API worker threads
+            rate_limits: Optional mapping of endpoint to (requests per second, burst size)
+            max_retries: Retries per API call on 429/5xx and connection errors
+            stream_batch_size: Streamed schedules handed to the database writer per batch
+            db_profile: SQLite connection profile used while writing (see sqlite_profiles)
+            write_batch_size: Schedules from all endpoints written per transaction
+        """
+        self.max_workers = max_workers
+        self.stream_batch_size = stream_batch_size
+        self.db_profile = db_profile
+        self.write_batch_size = write_batch_size
+        self.rate_limiter = EndpointRateLimiter(rate_limits)
+        self.transport = AviationEdgeTransport(max_retries=max_retries, pool_size=max(max_workers, 10),
+                                               cache=ResponseCache())
+        self.schedules_client = AviationEdgeScheduleClient(
+            rate_limiter=self.rate_limiter.bucket('/timetable'), transport=self.transport)
+        self.future_client = AviationEdgeFutureSchedulesClient(
+            rate_limiter=self.rate_limiter.bucket('/flightsFuture'), transport=self.transport)
         
         # Regional airport definitions
         self.regions = {
@@ -104,6 +131,13 @@ class RegionalAviationCollector:
         print(f"Total Schedules API calls: {total_schedules_calls}")
         print(f"GRAND TOTAL: {total_routes_calls + total_schedules_calls} calls")
         
+        plan = self.build_request_plan()
+        print(f"\n🧮 COLLECTION REQUEST PLAN")
+        print("=" * 70)
+        print(f"Naive collection requests: {plan.naive_calls}")
+        print(f"Planned unique requests: {plan.unique_calls}")
+        print(f"Redundant requests avoided: {plan.naive_calls - plan.unique_calls}")
+        
         return total_routes_calls, total_schedules_calls
     
     def estimate_regional_data(self, routes_calls, schedules_calls):
@@ -147,6 +181,7 @@ class RegionalAviationCollector:
         print("4. 💾 REGIONAL SAVES - Save after each region completion")
         print("5. 📊 PROGRESS TRACKING - Report progress by region")
         print("6. 🛡️  ERROR RESILIENCE - Continue if individual calls fail")
+        print("7. 🧮 REQUEST PLANNING - Fetch each unique request once and share the response")
         
         print(f"\nExecution Order:")
         for i, region in enumerate(self.regions.keys(), 1):
@@ -154,12 +189,188 @@ class RegionalAviationCollector:
             print(f"{i}. {region_name} Region")
         
         print(f"\nBatch Configuration:")
-        print("- Routes batch size: 10 calls")
-        print("- Schedules batch size: 8 calls")
-        print("- Inter-call delay: 1.5 seconds")
-        print("- Inter-batch delay: 5 seconds")
-        print("- Error retry: 3 attempts")
+        print(f"- Concurrent workers: {self.max_workers}")
+        for endpoint, bucket in self.rate_limiter.buckets.items():
+            print(f"- {endpoint} rate limit: {bucket.rate:g} calls/sec (burst {bucket.capacity})")
+        print("- Single database writer fed by a result queue")
+        print(f"- Error retry: {self.transport.max_retries} attempts (exponential backoff with jitter, honours Retry-After)")
+        print(f"- Timeouts: {self.transport.timeout[0]:g}s connect / {self.transport.timeout[1]:g}s read")
+        
+    def build_request_plan(self, future_date=None):
+        """
+        Plan the unique API requests for a full collection run.
+        
+        Args:
+            future_date: Date for Future Schedules requests. Defaults to 7 days from
+                        now when the Future Schedules API is available.
+        
+        Returns:
+            RequestPlan covering every region
+        """
+        if future_date is None and self.future_client.is_available():
+            future_date = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
         
+        return plan_regions(
+            self.regions,
+            self.schedules_client.AIRLINE_SEARCH_AIRPORTS,
+            future_date=future_date
+        )
+    
+    def _fetch(self, request):
+        """Execute one planned request against the matching API client."""
+        if request.endpoint == '/flightsFuture':
+            return self.future_client.get_future_schedules(request.iata_code, request.type, request.date)
+        return self.schedules_client.get_schedules(iata_code=request.iata_code, type=request.type)
+    
+    def _stream_request(self, request, emit):
+        """
+        Worker body: stream one planned request to emit() in batches.
+        
+        Stops early when emit() returns False. Request and parse errors are
+        raised, including ones partway through a streamed response.
+        """
+        if request.endpoint == '/flightsFuture':
+            emit((request, self._fetch(request), True))
+            return
+        
+        batch = []
+        for schedule in self.schedules_client.iter_schedules(iata_code=request.iata_code, type=request.type,
+                                                             raise_errors=True):
+            batch.append(schedule)
+            if len(batch) >= self.stream_batch_size:
+                if not emit((request, batch, False)):
+                    return
+                batch = []
+        emit((request, batch, True))
+    
+    def _run_requests(self, db, sink, plan, requests, total_collected, airline_matches):
+        """
+        Fetch planned requests concurrently and write their results from the calling thread.
+        
+        Worker threads only talk to the API; timetable responses are parsed as they
+        stream in and handed back through a bounded queue in batches, so SQLite only
+        ever sees this single writer and memory stays flat for large airports.
+        Timetable and future schedules go into the same sink and share its
+        transactions. Every response is stored once and fanned out to the
+        airline filters that share it. A response that fails partway is reported
+        as failed; the batches that arrived before the failure are kept.
+        
+        A request is reported as done only once its rows are written. When a
+        write fails, every request with rows in the lost batch is reported as
+        failed. The sink is flushed before returning; if that last write
+        fails, its requests are reported and the error is raised.
+        """
+        results = queue.Queue(maxsize=self.max_workers * 4)
+        cancelled = threading.Event()
+        
+        def emit(message):
+            # Wait for room in the queue, unless the writer loop has stopped
+            while not cancelled.is_set():
+                try:
+                    results.put(message, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def worker(request):
+            try:
+                self._stream_request(request, emit)
+            except Exception as e:
+                emit((request, e, True))
+        
+        received = {}
+        failed = set()
+        buffered = set()  # requests with rows in the sink's unwritten batch
+        unwritten = set()  # finished requests whose rows are still in it
+        
+        def label_of(request):
+            label = f"{request.endpoint} {request.iata_code} {request.type}s"
+            return label + f" on {request.date}" if request.date else label
+        
+        def report(request):
+            print(f"    ✅ {label_of(request)}: {received[request]} records")
+        
+        def write(request, rows):
+            # A failed flush loses the whole batch, with rows of every request
+            # buffered since the last one, so all of those requests fail
+            batches = sink.stats['batches']
+            if request is not None:
+                buffered.add(request)
+            try:
+                if request is None:
+                    sink.flush()
+                else:
+                    sink.add(rows)
+            except Exception as e:
+                for lost in sorted(buffered - {request}, key=label_of):
+                    if lost not in failed:
+                        print(f"    ❌ Error saving {label_of(lost)}: {e}")
+                        failed.add(lost)
+                    unwritten.discard(lost)
+                buffered.clear()
+                raise
+            if sink.stats['batches'] != batches:
+                # Rows still pending after a flush all belong to this request
+                pending = {request} if request is not None and sink.get_stats()['pending'] else set()
+                for written in sorted(unwritten & (buffered - pending), key=label_of):
+                    report(written)
+                unwritten.intersection_update(pending)
+                buffered.intersection_update(pending)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                for request in requests:
+                    pool.submit(worker, request)
+                
+                finished = 0
+                while finished < len(requests):
+                    request, records, done = results.get()
+                    label = label_of(request)
+                    if isinstance(records, Exception):
+                        print(f"    ❌ Error getting {label} after {received.get(request, 0)} records: {records}")
+                        finished += 1
+                        continue
+                    
+                    received[request] = received.get(request, 0) + len(records)
+                    try:
+                        if request.endpoint == '/flightsFuture':
+                            write(request, self.future_client.schedule_rows(records, date=request.date))
+                            total_collected['future_schedules'] = total_collected.get('future_schedules', 0) + len(records)
+                        else:
+                            write(request, db.schedule_rows(records))
+                            total_collected['schedules'] += len(records)
+                        
+                        for consumer in plan.consumers(request):
+                            if consumer.kind == 'airline':
+                                matched = self.schedules_client.filter_by_airline(records, consumer.code)
+                                airline_matches[consumer.code] = airline_matches.get(consumer.code, 0) + len(matched)
+                        
+                        if done and request.endpoint != '/flightsFuture':
+                            db.log_api_usage(request.endpoint, {"iataCode": request.iata_code, "type": request.type},
+                                             received[request])
+                            total_collected['api_calls'] += 1
+                    except Exception as e:
+                        print(f"    ❌ Error saving {label}: {e}")
+                        failed.add(request)
+                    
+                    if done:
+                        finished += 1
+                        # Reported once its rows are written, not while they sit in the batch
+                        if request in failed:
+                            pass
+                        elif request in buffered:
+                            unwritten.add(request)
+                        else:
+                            report(request)
+                
+                # Write the region's last partial batch, so every request is settled here
+                write(None, None)
+            finally:
+                # Release workers blocked on a full queue if the loop stopped early,
+                # or the executor would wait for them forever
+                cancelled.set()
+    
     def collect_regional_data(self, execute=False):
         """Execute the regional data collection."""
         
@@ -171,106 +382,65 @@ class RegionalAviationCollector:
         print(f"\n🚀 STARTING REGIONAL DATA COLLECTION")
         print("=" * 70)
         
+        plan = self.build_request_plan()
+        print(f"🧮 Planned {plan.unique_calls} unique requests (naive collection: {plan.naive_calls})")
+        if not self.future_client.is_available():
+            print(f"⚠️  Future Schedules API not available, using current schedules only")
+        
         total_collected = {'routes': 0, 'schedules': 0, 'api_calls': 0}
+        airline_matches = {}
         
-        with AviationDatabase() as db:
-            for region_name, config in self.regions.items():
+        with AviationDatabase(profile=self.db_profile) as db:
+            sink = db.schedule_sink(self.write_batch_size)
+            for region_name in self.regions:
                 print(f"\n📍 Processing {region_name.replace('_', ' ')} Region...")
                 region_start = datetime.now()
                 
                 try:
-                    # Collect schedules for major airports
-                    for airport in config['major_airports']:
-                        print(f"  📅 Collecting schedules for {airport}...")
-                        
-                        # Departures
-                        try:
-                            departures = self.schedules_client.get_departures(airport)
-                            for schedule in departures:
-                                db.insert_schedule(schedule)
-                            db.log_api_usage("/timetable", {"iataCode": airport, "type": "departure"}, len(departures))
-                            total_collected['schedules'] += len(departures)
-                            total_collected['api_calls'] += 1
-                            time.sleep(1.5)
-                        except Exception as e:
-                            print(f"    ❌ Error getting departures for {airport}: {e}")
-                        
-                        # Arrivals
-                        try:
-                            arrivals = self.schedules_client.get_arrivals(airport)
-                            for schedule in arrivals:
-                                db.insert_schedule(schedule)
-                            db.log_api_usage("/timetable", {"iataCode": airport, "type": "arrival"}, len(arrivals))
-                            total_collected['schedules'] += len(arrivals)
-                            total_collected['api_calls'] += 1
-                            time.sleep(1.5)
-                        except Exception as e:
-                            print(f"    ❌ Error getting arrivals for {airport}: {e}")
-                    
-                    # Collect schedules by departure airports (this replaces routes collection)
-                    for airport in config['major_airports']:
-                        print(f"  🛫 Collecting departures from {airport}...")
-                        try:
-                            departures = self.schedules_client.get_departures(airport)
-                            for schedule in departures:
-                                db.insert_schedule(schedule)
-                            db.log_api_usage("/timetable", {"iataCode": airport, "type": "departure"}, len(departures))
-                            total_collected['schedules'] += len(departures)
-                            total_collected['api_calls'] += 1
-                            time.sleep(1.5)
-                        except Exception as e:
-                            print(f"    ❌ Error getting departures from {airport}: {e}")
-                    
-                    # Collect airline-specific schedules (this replaces airline routes collection)
-                    for airline in config['major_airlines']:
-                        print(f"  ✈️  Collecting schedules for {airline}...")
-                        try:
-                            airline_schedules = self.schedules_client.get_airline_schedules(airline)
-                            for schedule in airline_schedules:
-                                db.insert_schedule(schedule)
-                            db.log_api_usage("/timetable", {"airlineIata": airline}, len(airline_schedules))
-                            total_collected['schedules'] += len(airline_schedules)
-                            total_collected['api_calls'] += 1
-                            time.sleep(1.5)
-                        except Exception as e:
-                            print(f"    ❌ Error getting schedules for {airline}: {e}")
-                    
-                    # Try Future Schedules API if available
-                    if self.future_client.is_available():
-                        print(f"  🔮 Attempting future schedules collection...")
-                        try:
-                            # Collect future schedules for major airports (7 days from now)
-                            from datetime import datetime, timedelta
-                            future_date = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-                            
-                            for airport in config['major_airports'][:3]:  # Limit to first 3 airports
-                                print(f"    🔮 Future schedules for {airport} on {future_date}...")
-                                future_data = self.future_client.collect_airport_future_data(airport, future_date)
-                                if future_data.get('statistics', {}).get('total_flights', 0) > 0:
-                                    print(f"    ✅ Collected {future_data['statistics']['total_flights']} future flights")
-                                    total_collected['future_schedules'] = total_collected.get('future_schedules', 0) + future_data['statistics']['total_flights']
-                                time.sleep(2)  # Longer delay for future API
-                        except Exception as e:
-                            print(f"    ⚠️  Future schedules collection failed: {e}")
-                    else:
-                        print(f"  ⚠️  Future Schedules API not available, using current schedules only")
+                    requests = plan.requests_for_region(region_name)
+                    print(f"  📅 Fetching {len(requests)} requests with {self.max_workers} workers...")
+                    self._run_requests(db, sink, plan, requests, total_collected, airline_matches)
                     
                     region_duration = datetime.now() - region_start
                     print(f"  ✅ {region_name} completed in {region_duration.total_seconds():.1f} seconds")
                     
                 except Exception as e:
                     print(f"  ❌ Error processing {region_name}: {e}")
-                
-                # Brief pause between regions
-                time.sleep(5)
-        
+
+            # Move weeks past the hot window into partition files, then refresh
+            # planner statistics for the freshly loaded schedules
+            db.apply_retention()
+            db.optimize()
+            sink_stats = sink.get_stats()
+            delta_stats = db.delta.get_stats()
+            dimension_stats = {'Airline': db.airline_cache.get_stats(), 'Airport': db.airport_cache.get_stats()}
+
         print(f"\n🎉 COLLECTION COMPLETE!")
         print("=" * 70)
         print(f"Total API calls: {total_collected['api_calls']}")
         print(f"Schedules collected: {total_collected['schedules']:,}")
+        print(f"Schedules written: {sink_stats['written']:,} in {sink_stats['batches']:,} transactions "
+              f"({delta_stats['new']:,} new, {delta_stats['changed']:,} changed, "
+              f"{delta_stats['unchanged']:,} unchanged skipped, {delta_stats['changes_logged']:,} changes logged)")
         if 'future_schedules' in total_collected:
             print(f"Future schedules collected: {total_collected['future_schedules']:,}")
         print(f"Total records: {total_collected['schedules'] + total_collected.get('future_schedules', 0):,}")
+        print(f"Airline schedules matched: {sum(airline_matches.values()):,} across "
+              f"{sum(1 for count in airline_matches.values() if count)} airlines")
+        
+        for label, stats in dimension_stats.items():
+            print(f"{label} cache: {stats['hits']:,} hits, {stats['inserts']:,} inserted, "
+                  f"{stats['updates']:,} updated ({stats['hit_ratio']:.0%} hit ratio)")
+        
+        transport_stats = self.transport.get_stats()
+        print(f"HTTP requests: {transport_stats['requests']} ({transport_stats['retries']} retries, "
+              f"{transport_stats['failures']} failures)")
+        print(f"Connections: {transport_stats['connections_opened']} opened, "
+              f"{transport_stats['connections_reused']} reused")
+        cache_stats = transport_stats['cache']
+        print(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['revalidated']} revalidated, {cache_stats['evictions']} evictions "
+              f"({cache_stats['hit_ratio']:.0%} hit ratio)")
 
 def main():
     """Main function for regional aviation data collection."""
@@ -286,7 +456,8 @@ def main():
     
     # Time and cost estimates
     total_calls = routes_calls + schedules_calls
-    estimated_time = total_calls * 1.5 / 60  # 1.5 seconds per call
+    calls_per_second = collector.rate_limiter.rate('/timetable') or 1 / 1.5
+    estimated_time = total_calls / calls_per_second / 60  # Paced by the rate limiter
     
     print(f"\n⏰ TIME & RESOURCE ESTIMATES")
     print("=" * 70)
@@ -0,0 +1,88 @@
+"""
+Request planning for collection runs.
+
+Expands the regional collection config into the minimal set of unique API
+requests. Every consumer that needs the same response (an airport's
+schedules, an airline filter over a shared airport) is attached to a
+single planned request, so each response is fetched once and fanned out.
+"""
+
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+PlannedRequest = namedtuple('PlannedRequest', ['endpoint', 'iata_code', 'type', 'date'])
+
+# kind is 'airport' or 'airline'; code is the airport or airline code
+Consumer = namedtuple('Consumer', ['kind', 'region', 'code'])
+
+
+class RequestPlan:
+    """Unique API requests for a collection run and the consumers of each response."""
+
+    def __init__(self):
+        self.requests: Dict[PlannedRequest, List[Consumer]] = {}
+        self.naive_calls = 0
+
+    def add(self, request: PlannedRequest, consumer: Consumer):
+        """Register that a consumer needs the response for a request."""
+        self.naive_calls += 1
+        self.requests.setdefault(request, []).append(consumer)
+
+    @property
+    def unique_calls(self) -> int:
+        """Number of API calls the plan actually makes."""
+        return len(self.requests)
+
+    def consumers(self, request: PlannedRequest) -> List[Consumer]:
+        """Get every consumer of a planned request."""
+        return self.requests.get(request, [])
+
+    def requests_for_region(self, region: str) -> List[PlannedRequest]:
+        """Get the requests first needed by a region, in planning order."""
+        return [request for request, consumers in self.requests.items()
+                if consumers[0].region == region]
+
+
+def plan_regions(regions: Dict[str, Dict[str, List[str]]],
+                 airline_search_airports: List[str],
+                 future_date: Optional[str] = None,
+                 future_airports_per_region: int = 3) -> RequestPlan:
+    """
+    Expand regional collection config into a deduplicated request plan.
+
+    Args:
+        regions: Region name to config with 'major_airports' and 'major_airlines'
+        airline_search_airports: Airports whose departures are scanned for airline schedules
+        future_date: Date for Future Schedules requests, or None to skip them
+        future_airports_per_region: Number of major airports per region queried for future schedules
+
+    Returns:
+        RequestPlan with one entry per unique (endpoint, iataCode, type, date)
+    """
+    plan = RequestPlan()
+
+    for region, config in regions.items():
+        # Departures and arrivals for each major airport
+        for airport in config['major_airports']:
+            consumer = Consumer('airport', region, airport)
+            plan.add(PlannedRequest('/timetable', airport, 'departure', None), consumer)
+            plan.add(PlannedRequest('/timetable', airport, 'arrival', None), consumer)
+
+        # Departures again as the replacement for routes collection
+        for airport in config['major_airports']:
+            plan.add(PlannedRequest('/timetable', airport, 'departure', None),
+                     Consumer('airport', region, airport))
+
+        # Airline schedules are filtered out of departures from the search airports
+        for airline in config['major_airlines']:
+            consumer = Consumer('airline', region, airline)
+            for airport in airline_search_airports:
+                plan.add(PlannedRequest('/timetable', airport, 'departure', None), consumer)
+
+        if future_date:
+            for airport in config['major_airports'][:future_airports_per_region]:
+                consumer = Consumer('airport', region, airport)
+                plan.add(PlannedRequest('/flightsFuture', airport, 'departure', future_date), consumer)
+                plan.add(PlannedRequest('/flightsFuture', airport, 'arrival', future_date), consumer)
+
+    return plan
@@ -0,0 +1,205 @@
+"""
+On-disk HTTP response cache for the Aviation Edge API clients.
+
+Responses are stored in a small SQLite file keyed by endpoint and the
+normalized query parameters (the API key is never part of the key).
+Entries expire after a per-endpoint TTL, total size is bounded with LRU
+eviction, and stale entries carrying an ETag or Last-Modified header are
+revalidated with a conditional request instead of being refetched.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+# Seconds a cached response stays fresh, by endpoint
+DEFAULT_TTLS: Dict[str, float] = {
+    '/timetable': 300,          # Live departures/arrivals change minute to minute
+    '/flightsFuture': 3600,     # Future schedules for the coming week
+}
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTLs, byte-bounded LRU eviction and revalidation."""
+
+    def __init__(self,
+                 cache_path: str = "aviation_http_cache.db",
+                 max_bytes: int = 256 * 1024 * 1024,
+                 max_entry_bytes: int = 8 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None,
+                 far_future_days: int = 7,
+                 far_future_ttl: float = 86400):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_path: Path to the SQLite cache file (':memory:' for a process-local cache)
+            max_bytes: Maximum total size of cached bodies before LRU eviction
+            max_entry_bytes: Largest single body worth caching; bigger streamed
+                    responses are not buffered for the cache
+            ttls: Per-endpoint freshness in seconds. Defaults to DEFAULT_TTLS.
+            far_future_days: flightsFuture dates at least this many days out use far_future_ttl
+            far_future_ttl: Freshness in seconds for far-out flightsFuture dates
+        """
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.far_future_days = far_future_days
+        self.far_future_ttl = far_future_ttl
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_http_cache_access ON http_cache(last_access)')
+        self.conn.commit()
+        self._total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+    @staticmethod
+    def endpoint_for(url: str) -> str:
+        """Get the endpoint path such as '/timetable' from a request URL."""
+        return '/' + urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build a cache key from the endpoint and parameters, excluding the API key."""
+        normalized = sorted((name, str(value).strip()) for name, value in (params or {}).items()
+                            if name != 'key' and value is not None)
+        return endpoint + '?' + json.dumps(normalized, separators=(',', ':'))
+
+    def ttl_for(self, endpoint: str, params: Optional[Dict[str, Any]]) -> float:
+        """Get the freshness lifetime for a request."""
+        if endpoint == '/flightsFuture' and params and params.get('date'):
+            try:
+                date = datetime.strptime(params['date'], '%Y-%m-%d')
+                if date - datetime.now() >= timedelta(days=self.far_future_days):
+                    return self.far_future_ttl
+            except ValueError:
+                pass
+        return self.ttls.get(endpoint, 0)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached entry and record the hit, miss or staleness.
+
+        Returns:
+            Dictionary with body, etag, last_modified and fresh, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute('''
+                SELECT body, etag, last_modified, expires_at FROM http_cache WHERE cache_key = ?
+            ''', (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            fresh = row[3] > now
+            if fresh:
+                self.stats['hits'] += 1
+                self.conn.execute('UPDATE http_cache SET last_access = ? WHERE cache_key = ?', (now, key))
+                self.conn.commit()
+            else:
+                self.stats['stale'] += 1
+
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'fresh': fresh}
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a stale entry."""
+        headers = {}
+        if entry and not entry['fresh']:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, key: str, ttl: float):
+        """Mark a stale entry fresh again after a 304 Not Modified response."""
+        now = time.time()
+        with self._lock:
+            self.conn.execute('''
+                UPDATE http_cache SET expires_at = ?, last_access = ? WHERE cache_key = ?
+            ''', (now + ttl, now, key))
+            self.conn.commit()
+            self.stats['revalidated'] += 1
+
+    def store(self, key: str, endpoint: str, body: bytes, ttl: float,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a response body and evict least recently used entries over the byte budget."""
+        size = len(body)
+        if ttl <= 0 or size > self.max_entry_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self.conn.execute('SELECT size FROM http_cache WHERE cache_key = ?', (key,)).fetchone()
+            self.conn.execute('''
+                INSERT OR REPLACE INTO http_cache
+                    (cache_key, endpoint, body, size, etag, last_modified, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (key, endpoint, sqlite3.Binary(body), size, etag, last_modified, now + ttl, now))
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self.stats['stores'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes:
+            rows = self.conn.execute('''
+                SELECT cache_key, size FROM http_cache ORDER BY last_access LIMIT 32
+            ''').fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for cache_key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self.conn.execute('DELETE FROM http_cache WHERE cache_key = ?', (cache_key,))
+                self._total_bytes -= size
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self.conn.execute('DELETE FROM http_cache')
+            self.conn.commit()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, stale, revalidated, stores, evictions,
+            hit_ratio, entries and bytes
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = self.conn.execute('SELECT COUNT(*) FROM http_cache').fetchone()[0]
+            stats['bytes'] = self._total_bytes
+        lookups = stats['hits'] + stats['misses'] + stats['stale']
+        stats['hit_ratio'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Close the cache database."""
+        self.conn.close()
@@ -0,0 +1,170 @@
+"""
+Delta ingestion for flight schedules.
+
+Polling the same airport every few minutes returns mostly the same flights
+with the same status, so rewriting every row is wasted I/O. Each schedule
+row carries a fingerprint: a 64-bit hash of the fields that change as a
+flight progresses (status, actual times, gate and delay). ScheduleDelta
+keeps the fingerprints of the live table in memory, keyed by the flight's
+natural key, and only lets new or changed rows through to the writer.
+
+The fingerprints are persisted in the flight_schedules.fingerprint column,
+so a new process picks up where the last one stopped. Changes to flights
+already stored are recorded field by field in schedule_changes:
+
+    schedule_id  field    old_value  new_value  changed_at
+    1042         status   scheduled  active     1759300200
+    1042         delay_minutes  5    15         1759300200
+
+The in-memory index assumes this connection is the only schedule writer;
+call reset() after rows are removed or loaded behind its back.
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Positions in a flight_schedules row tuple (see AviationDatabase._schedule_to_row)
+NATURAL_KEY_FIELDS = (0, 3, 4, 7, 15)  # airline, flight number, departure, scheduled time, type
+MUTABLE_FIELDS = {
+    'departure_actual_time': 8,
+    'arrival_actual_time': 13,
+    'status': 14,
+    'gate': 19,
+    'delay_minutes': 20,
+}
+# Fields the upsert keeps when the new value is NULL
+_COALESCED_FIELDS = ('departure_actual_time', 'arrival_actual_time', 'gate')
+
+# As in the natural-key index, a missing key column is ''
+_KEY_NAMES = ('airline_iata', 'flight_number', 'departure_iata', 'departure_scheduled_time', 'flight_type')
+_KEY_COLUMNS = ', '.join(f"COALESCE({name}, '')" for name in _KEY_NAMES)
+_KEY_MATCH = ' AND '.join(f"COALESCE({name}, '') = ?" for name in _KEY_NAMES)
+
+Key = Tuple[str, ...]
+
+
+def schedule_fingerprint(row: Sequence) -> int:
+    """Signed 64-bit hash of a schedule row's mutable fields, stable across processes."""
+    values = repr(tuple(row[position] for position in MUTABLE_FIELDS.values())).encode()
+    return int.from_bytes(hashlib.blake2b(values, digest_size=8).digest(), 'big', signed=True)
+
+
+def schedule_key(row: Sequence) -> Key:
+    """Natural key of a schedule row, with missing parts as ''."""
+    return tuple('' if row[position] is None else row[position] for position in NATURAL_KEY_FIELDS)
+
+
+def ensure_schedule_delta_schema(conn: sqlite3.Connection):
+    """Add the fingerprint column and the schedule_changes history table."""
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(flight_schedules)')}
+    with conn:
+        if 'fingerprint' not in existing:
+            conn.execute('ALTER TABLE flight_schedules ADD COLUMN fingerprint INTEGER')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schedule_changes (
+                id INTEGER PRIMARY KEY,
+                schedule_id INTEGER NOT NULL,
+                field TEXT NOT NULL,
+                old_value TEXT,
+                new_value TEXT,
+                changed_at INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_schedule_changes_schedule
+            ON schedule_changes(schedule_id, changed_at)
+        ''')
+
+
+class ScheduleDelta:
+    """In-memory fingerprint index of the live flight_schedules table."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._fingerprints: Optional[Dict[Key, int]] = None
+        self.stats = {'new': 0, 'changed': 0, 'unchanged': 0, 'changes_logged': 0}
+
+    def _index(self) -> Dict[Key, int]:
+        """Load the persisted fingerprints on first use."""
+        if self._fingerprints is None:
+            self._fingerprints = {
+                tuple(row)[:5]: row[5] for row in self.conn.execute(f'''
+                    SELECT {_KEY_COLUMNS}, fingerprint FROM flight_schedules
+                    WHERE fingerprint IS NOT NULL
+                ''')
+            }
+        return self._fingerprints
+
+    def reset(self):
+        """Drop the in-memory index; it is reloaded from the table on next use."""
+        self._fingerprints = None
+
+    def split(self, rows: Sequence[Sequence]) -> Tuple[List[Sequence], List[Sequence]]:
+        """
+        Separate rows that need writing from unchanged ones.
+
+        Rows must end in their fingerprint. A flight repeated within rows is
+        only considered once, with its last version.
+
+        Returns:
+            (new rows, changed rows); unchanged rows are dropped
+        """
+        index = self._index()
+        latest = {schedule_key(row): row for row in rows}
+
+        new, changed = [], []
+        for key, row in latest.items():
+            previous = index.get(key)
+            if previous is None:
+                new.append(row)
+            elif previous != row[-1]:
+                changed.append(row)
+        self.stats['new'] += len(new)
+        self.stats['changed'] += len(changed)
+        self.stats['unchanged'] += len(rows) - len(new) - len(changed)
+        return new, changed
+
+    def log_changes(self, rows: Sequence[Sequence]) -> int:
+        """
+        Record the field changes rows are about to make to stored flights.
+
+        Must run in the writing transaction, before the rows are upserted.
+
+        Returns:
+            Number of field changes recorded
+        """
+        columns = ', '.join(MUTABLE_FIELDS)
+        changed_at = int(time.time())
+        entries = []
+        for row in rows:
+            stored = self.conn.execute(
+                f'SELECT id, {columns} FROM flight_schedules WHERE {_KEY_MATCH}',
+                schedule_key(row)).fetchone()
+            if stored is None:
+                continue
+            stored = tuple(stored)
+            for (field, position), old in zip(MUTABLE_FIELDS.items(), stored[1:]):
+                new = row[position]
+                if new is None and field in _COALESCED_FIELDS:
+                    continue
+                if new != old:
+                    entries.append((stored[0], field, old, new, changed_at))
+        self.conn.executemany('''
+            INSERT INTO schedule_changes (schedule_id, field, old_value, new_value, changed_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', entries)
+        self.stats['changes_logged'] += len(entries)
+        return len(entries)
+
+    def remember(self, rows: Sequence[Sequence]):
+        """Record the fingerprints of rows once they are committed."""
+        index = self._index()
+        for row in rows:
+            index[schedule_key(row)] = row[-1]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Counts of new, changed and skipped rows, and the share of rows skipped."""
+        seen = self.stats['new'] + self.stats['changed'] + self.stats['unchanged']
+        return {**self.stats, 'skip_ratio': self.stats['unchanged'] / seen if seen else 0.0}
@@ -0,0 +1,318 @@
+"""
+Columnar in-memory snapshot of flight_schedules for analytics.
+
+The SQL summaries in AviationDatabase scan the whole table on every call.
+ScheduleFrame loads the table once into NumPy arrays, with text columns
+dictionary-encoded as int32 codes (0 means NULL) and scheduled times as
+int64 UTC epoch seconds, and answers the same summaries as vectorized
+group-bys. refresh() appends only rows added since the last load.
+
+Usage:
+    frame = db.schedule_frame()
+    frame.airport_traffic(10)
+    frame.hourly_departures('MNL')
+    frame.refresh()  # pick up newly collected schedules
+"""
+
+import sqlite3
+from contextlib import nullcontext
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+# Sentinel for missing epoch times in the int64 columns
+NO_TIME = np.iinfo(np.int64).min
+
+_COLUMNS = '''
+    SELECT id, airline_iata, airline_name, departure_iata, arrival_iata,
+           status, flight_type, departure_epoch, departure_utc_offset,
+           arrival_epoch, delay_minutes
+    FROM flight_schedule_details
+    WHERE id > ?
+    ORDER BY id
+'''
+
+
+class Codes:
+    """Dictionary encoding of a text column; code 0 is reserved for NULL."""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self.index: Dict[Optional[str], int] = {None: 0}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, column: Sequence[Optional[str]]) -> np.ndarray:
+        """Encode values, assigning new codes to values not seen before."""
+        index, values = self.index, self.values
+        codes = np.empty(len(column), dtype=np.int32)
+        for position, value in enumerate(column):
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(values)
+                values.append(value)
+            codes[position] = code
+        return codes
+
+    def code(self, value: Optional[str]) -> int:
+        """Get the code of a value, or -1 if it never occurs."""
+        return self.index.get(value, -1)
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code]
+
+
+class ScheduleFrame:
+    """Column arrays over flight_schedules, one element per row, ordered by id."""
+
+    def __init__(self, conn: Optional[sqlite3.Connection] = None, pool=None):
+        # A pool's reader is checked out per load rather than held by the frame
+        self.conn = conn
+        self.pool = pool
+        self.last_seen_id = 0
+        self.airlines = Codes()
+        self.airline_names = Codes()
+        # Departure and arrival share one dictionary so their codes are comparable
+        self.airports = Codes()
+        self.statuses = Codes()
+        self.flight_types = Codes()
+
+        self.ids = np.empty(0, dtype=np.int64)
+        self.airline = np.empty(0, dtype=np.int32)
+        self.airline_name = np.empty(0, dtype=np.int32)
+        self.departure = np.empty(0, dtype=np.int32)
+        self.arrival = np.empty(0, dtype=np.int32)
+        self.status = np.empty(0, dtype=np.int32)
+        self.flight_type = np.empty(0, dtype=np.int32)
+        self.departure_epoch = np.empty(0, dtype=np.int64)
+        self.departure_offset = np.empty(0, dtype=np.int32)
+        self.arrival_epoch = np.empty(0, dtype=np.int64)
+        self.delay = np.empty(0, dtype=np.float64)
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> 'ScheduleFrame':
+        """Load a snapshot of flight_schedules from a connection."""
+        frame = cls(conn)
+        frame.refresh()
+        return frame
+
+    @classmethod
+    def from_pool(cls, pool) -> 'ScheduleFrame':
+        """Load a snapshot of flight_schedules through a ConnectionPool's readers."""
+        frame = cls(pool=pool)
+        frame.refresh()
+        return frame
+
+    def __len__(self):
+        return len(self.ids)
+
+    def refresh(self) -> int:
+        """
+        Append rows with id greater than the last one loaded.
+
+        Rows updated in place by the schedule upsert (status, delay) or removed
+        by compaction are not picked up; use reload() for those.
+
+        Returns:
+            Number of rows appended
+        """
+        with self.pool.reader() if self.pool is not None else nullcontext(self.conn) as conn:
+            rows = conn.execute(_COLUMNS, (self.last_seen_id,)).fetchall()
+        if not rows:
+            return 0
+        (ids, airline, airline_name, departure, arrival, status, flight_type,
+         departure_epoch, departure_offset, arrival_epoch, delay) = zip(*rows)
+
+        self.ids = np.concatenate([self.ids, np.array(ids, dtype=np.int64)])
+        self.airline = np.concatenate([self.airline, self.airlines.encode(airline)])
+        self.airline_name = np.concatenate([self.airline_name, self.airline_names.encode(airline_name)])
+        self.departure = np.concatenate([self.departure, self.airports.encode(departure)])
+        self.arrival = np.concatenate([self.arrival, self.airports.encode(arrival)])
+        self.status = np.concatenate([self.status, self.statuses.encode(status)])
+        self.flight_type = np.concatenate([self.flight_type, self.flight_types.encode(flight_type)])
+        self.departure_epoch = np.concatenate([self.departure_epoch, _times(departure_epoch)])
+        self.departure_offset = np.concatenate([
+            self.departure_offset,
+            np.array([offset or 0 for offset in departure_offset], dtype=np.int32)])
+        self.arrival_epoch = np.concatenate([self.arrival_epoch, _times(arrival_epoch)])
+        self.delay = np.concatenate([self.delay, np.array(delay, dtype=np.float64)])
+
+        self.last_seen_id = int(self.ids[-1])
+        return len(rows)
+
+    def reload(self) -> int:
+        """Discard the snapshot and load the whole table again."""
+        self.__init__(self.conn, self.pool)
+        return self.refresh()
+
+    def _count(self, codes: np.ndarray, size: int, weights: np.ndarray = None) -> np.ndarray:
+        return np.bincount(codes, weights=weights, minlength=size).astype(np.int64)
+
+    def _is(self, column: np.ndarray, codes: Codes, value: str) -> np.ndarray:
+        return column == codes.code(value)
+
+    def schedules_summary(self) -> Dict[str, int]:
+        """Same figures as AviationDatabase.get_schedules_summary()."""
+        def distinct(column, size):
+            return int(np.count_nonzero(self._count(column, size)[1:]))
+
+        airports = len(self.airports)
+        return {
+            'total_schedules': len(self),
+            'unique_airlines': distinct(self.airline, len(self.airlines)),
+            'unique_departure_airports': distinct(self.departure, airports),
+            'unique_arrival_airports': distinct(self.arrival, airports),
+            'active_flights': int(np.count_nonzero(self._is(self.status, self.statuses, 'active'))),
+            'landed_flights': int(np.count_nonzero(self._is(self.status, self.statuses, 'landed'))),
+            'scheduled_flights': int(np.count_nonzero(self._is(self.status, self.statuses, 'scheduled'))),
+            'departures': int(np.count_nonzero(self._is(self.flight_type, self.flight_types, 'departure'))),
+            'arrivals': int(np.count_nonzero(self._is(self.flight_type, self.flight_types, 'arrival'))),
+        }
+
+    def airport_traffic(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Same rows as AviationDatabase.get_airport_traffic()."""
+        airport = np.where(self.departure != 0, self.departure, self.arrival)
+        size = len(self.airports)
+        counts = self._count(airport, size)
+        departures = self._count(airport, size, self._is(self.flight_type, self.flight_types, 'departure'))
+        arrivals = self._count(airport, size, self._is(self.flight_type, self.flight_types, 'arrival'))
+        counts[0] = 0
+
+        return [{
+            'airport_code': self.airports.decode(code),
+            'flight_count': int(counts[code]),
+            'departures': int(departures[code]),
+            'arrivals': int(arrivals[code]),
+        } for code in _top(counts, limit)]
+
+    def airline_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Same rows as AviationDatabase.get_airline_activity()."""
+        names = len(self.airline_names)
+        key = self.airline.astype(np.int64) * names + self.airline_name
+        size = len(self.airlines) * names
+        counts = self._count(key, size)
+        active = self._count(key, size, self._is(self.status, self.statuses, 'active'))
+        counts[:names] = 0  # NULL airline_iata
+
+        return [{
+            'airline_iata': self.airlines.decode(code // names),
+            'airline_name': self.airline_names.decode(code % names),
+            'flight_count': int(counts[code]),
+            'active_flights': int(active[code]),
+        } for code in _top(counts, limit)]
+
+    def hourly_departures(self, airport_iata: str = None, utc: bool = False) -> List[int]:
+        """
+        Histogram of departures by hour of day.
+
+        Args:
+            airport_iata: Only count departures from this airport
+            utc: Bucket by UTC hour instead of the airport's local hour
+
+        Returns:
+            24 counts, index 0 being 00:00-00:59
+        """
+        mask = self.departure_epoch != NO_TIME
+        if airport_iata:
+            mask &= self.departure == self.airports.code(airport_iata)
+        seconds = self.departure_epoch[mask]
+        if not utc:
+            seconds = seconds + self.departure_offset[mask].astype(np.int64) * 60
+        hours = (seconds // 3600) % 24
+        return np.bincount(hours, minlength=24).tolist()
+
+    def route_frequency(self, limit: int = 10, airline_iata: str = None) -> List[Dict[str, Any]]:
+        """
+        Busiest departure/arrival airport pairs.
+
+        Args:
+            limit: Maximum number of routes
+            airline_iata: Only count flights of this airline
+
+        Returns:
+            Routes with flight_count and flights_per_day over the days they appear on
+        """
+        airports = len(self.airports)
+        mask = (self.departure != 0) & (self.arrival != 0)
+        if airline_iata:
+            mask &= self.airline == self.airlines.code(airline_iata)
+        key = self.departure[mask].astype(np.int64) * airports + self.arrival[mask]
+        routes, counts = np.unique(key, return_counts=True)
+
+        # Distinct (route, UTC day) pairs give the number of days each route operates
+        epochs = self.departure_epoch[mask]
+        timed = epochs != NO_TIME
+        route_days = np.zeros(len(routes), dtype=np.int64)
+        if timed.any():
+            days = epochs[timed] // 86400
+            span = int(days.max() - days.min()) + 1
+            pairs = np.unique(key[timed] * span + (days - days.min()))
+            np.add.at(route_days, np.searchsorted(routes, pairs // span), 1)
+
+        return [{
+            'departure_iata': self.airports.decode(int(routes[position] // airports)),
+            'arrival_iata': self.airports.decode(int(routes[position] % airports)),
+            'flight_count': int(counts[position]),
+            'flights_per_day': round(float(counts[position] / route_days[position]), 2)
+            if route_days[position] else None,
+        } for position in _top(counts, limit)]
+
+    def delay_percentiles(self, percentiles: Sequence[float] = (50, 90, 95, 99),
+                          by: str = None) -> Any:
+        """
+        Departure delay percentiles in minutes, over flights that report a delay.
+
+        Args:
+            percentiles: Percentiles to compute (0-100), linearly interpolated
+            by: None for overall figures, or 'airline' / 'departure' to group
+
+        Returns:
+            {'count': n, 'p50': ...} overall, or a list of such dicts with the
+            group key added, ordered by flight count
+        """
+        mask = ~np.isnan(self.delay)
+        if by is None:
+            delays = self.delay[mask]
+            if not len(delays):
+                return {'count': 0}
+            values = np.percentile(delays, percentiles)
+            return {'count': len(delays),
+                    **{f"p{p:g}": float(value) for p, value in zip(percentiles, values)}}
+
+        groups = {'airline': (self.airline, self.airlines, 'airline_iata'),
+                  'departure': (self.departure, self.airports, 'departure_iata')}
+        if by not in groups:
+            raise ValueError(f"Unknown grouping '{by}', expected one of {sorted(groups)}")
+        column, codes, label = groups[by]
+        mask &= column != 0
+        group, delays = column[mask], self.delay[mask]
+
+        # Sort by group then delay; each group is a contiguous sorted run
+        order = np.lexsort((delays, group))
+        group, delays = group[order], delays[order]
+        keys, starts, counts = np.unique(group, return_index=True, return_counts=True)
+
+        result = {}
+        for p in percentiles:
+            position = (counts - 1) * (p / 100)
+            low = np.floor(position).astype(np.int64)
+            high = np.ceil(position).astype(np.int64)
+            below, above = delays[starts + low], delays[starts + high]
+            result[f"p{p:g}"] = below + (above - below) * (position - low)
+
+        return [{
+            label: codes.decode(int(keys[position])),
+            'count': int(counts[position]),
+            **{name: float(values[position]) for name, values in result.items()},
+        } for position in _top(counts, len(counts))]
+
+
+def _times(values: Sequence[Optional[int]]) -> np.ndarray:
+    return np.array([NO_TIME if value is None else value for value in values], dtype=np.int64)
+
+
+def _top(counts: np.ndarray, limit: int) -> List[int]:
+    """Indexes of the largest non-zero counts, largest first."""
+    order = np.argsort(-counts, kind='stable')[:limit]
+    return [int(code) for code in order if counts[code]]
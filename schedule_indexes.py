@@ -0,0 +1,129 @@
+"""
+Index strategy for the flight_schedules table.
+
+Indexes are shaped after the queries AviationDatabase actually runs rather
+than one per column:
+
+- search_flights filters on any mix of departure, arrival, airline and status
+  and always orders by departure_scheduled_time, so each filter column leads
+  a composite index that ends in departure_scheduled_time. SQLite can then
+  walk the index in order instead of sorting in a temp B-tree.
+
+The single-column indexes these replace are dropped, since each is a prefix
+of a composite index and only slows down inserts. So are the covering
+indexes get_airline_activity and get_airport_traffic used to group over;
+they now read the rollup tables of schedule_rollups.
+"""
+
+import sqlite3
+from typing import Dict, List, Any, Optional, Sequence
+
+SCHEDULE_INDEXES: Dict[str, str] = {
+    # search_flights(departure_iata, arrival_iata)
+    'idx_schedules_route_time':
+        'flight_schedules(departure_iata, arrival_iata, departure_scheduled_time)',
+    # search_flights(departure_iata)
+    'idx_schedules_departure_time':
+        'flight_schedules(departure_iata, departure_scheduled_time)',
+    # search_flights(arrival_iata)
+    'idx_schedules_arrival_time':
+        'flight_schedules(arrival_iata, departure_scheduled_time)',
+    # search_flights(airline_iata)
+    'idx_schedules_airline_time':
+        'flight_schedules(airline_iata, departure_scheduled_time)',
+    # search_flights(status)
+    'idx_schedules_status_time':
+        'flight_schedules(status, departure_scheduled_time)',
+    # search_flights(departure_iata, departs_after/departs_before): UTC range scans
+    'idx_schedules_departure_epoch':
+        'flight_schedules(departure_iata, departure_epoch)',
+    'idx_schedules_arrival_epoch':
+        'flight_schedules(arrival_iata, arrival_epoch)',
+    # search_flights() without filters
+    'idx_schedules_time':
+        'flight_schedules(departure_scheduled_time)',
+}
+
+# Single-column indexes superseded by the composite ones above, and covering
+# indexes superseded by the rollup tables
+SUPERSEDED_INDEXES: Sequence[str] = (
+    'idx_schedules_departure',
+    'idx_schedules_arrival',
+    'idx_schedules_airline',
+    'idx_schedules_status',
+    'idx_schedules_type',
+    'idx_schedules_airline_activity',
+    'idx_schedules_airport_traffic',
+)
+
+
+def create_schedule_indexes(conn: sqlite3.Connection):
+    """Create the flight_schedules indexes and drop the ones they supersede."""
+    for name in SUPERSEDED_INDEXES:
+        conn.execute(f'DROP INDEX IF EXISTS {name}')
+    for name, definition in SCHEDULE_INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {definition}')
+
+
+def optimize(conn: sqlite3.Connection, analyze: bool = True, analysis_limit: int = 1000):
+    """
+    Refresh the query planner statistics after a bulk load.
+
+    Args:
+        conn: Open database connection
+        analyze: Run ANALYZE so the planner sees the new row distribution.
+                PRAGMA optimize alone only re-analyzes tables it judges stale.
+        analysis_limit: Rows sampled per index by ANALYZE (0 for a full scan)
+    """
+    conn.execute(f'PRAGMA analysis_limit = {int(analysis_limit)}')
+    if analyze:
+        conn.execute('ANALYZE')
+    conn.execute('PRAGMA optimize')
+    conn.commit()
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """
+    Get the EXPLAIN QUERY PLAN steps for a query.
+
+    Returns:
+        List of plan step descriptions, e.g. 'SEARCH flight_schedules USING INDEX ...'
+    """
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', tuple(params))]
+
+
+def plan_problems(plan: List[str], table: str = 'flight_schedules',
+                  allowed: Sequence[str] = ()) -> List[str]:
+    """
+    Find the plan steps that indicate a missing index.
+
+    Flags temp B-tree sorts and groupings and full scans of the table that
+    do not go through an index.
+
+    Args:
+        plan: Steps from explain_query_plan
+        table: Table that must not be scanned without an index
+        allowed: Plan steps that are expected, such as the final sort of an
+                aggregate ordered by a count, which no index can provide
+
+    Returns:
+        The offending plan steps; empty when the query is fully indexed
+    """
+    problems = []
+    for step in plan:
+        if step in allowed:
+            continue
+        if 'USE TEMP B-TREE' in step:
+            problems.append(step)
+        elif step.startswith(f'SCAN {table}') and 'INDEX' not in step:
+            problems.append(step)
+    return problems
+
+
+def index_used(plan: List[str]) -> Optional[str]:
+    """Get the name of the first index a query plan uses, if any."""
+    for step in plan:
+        for marker in ('USING COVERING INDEX ', 'USING INDEX '):
+            if marker in step:
+                return step.split(marker, 1)[1].split(' ', 1)[0]
+    return None
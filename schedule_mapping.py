@@ -0,0 +1,129 @@
+"""
+Declarative field mapping for Aviation Edge schedule payloads.
+
+The timetable and Future Schedules endpoints return the same nested shape
+with a few spelling differences ('codeshared' vs 'codeshare', aircraft
+'registration' vs 'reg'). SCHEDULE_FIELDS describes once where each
+flight_schedules column lives in a payload, and compile_mapper() turns a
+selection of those fields into a generated function that reads them all
+into a tuple:
+
+    extract = compile_mapper(SCHEDULE_FIELDS, defaults={'status': 'scheduled'})
+    extract(schedule)  # -> ('PR', 'PAL', 'Philippine Airlines', '102', ...)
+
+The generated code fetches each nested object once, shares one empty dict
+for missing objects instead of allocating a {} default per lookup, and
+resolves spelling aliases inline, so every ingestion path reads payloads
+the same way at the cost of plain dict.get calls. Plain obj.get(key) calls
+are kept on purpose: CPython specializes them, and calling a stored bound
+method measured slower.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+# A path step is a key, or a tuple of alternative spellings tried in order
+Step = Union[str, Tuple[str, ...]]
+Field = Tuple[str, Tuple[Step, ...]]
+
+CODESHARE = ('codeshared', 'codeshare')
+
+# flight_schedules columns in row order, with their place in a schedule payload
+SCHEDULE_FIELDS: Tuple[Field, ...] = (
+    ('airline_iata', ('airline', 'iataCode')),
+    ('airline_icao', ('airline', 'icaoCode')),
+    ('airline_name', ('airline', 'name')),
+    ('flight_number', ('flight', 'number')),
+    ('departure_iata', ('departure', 'iataCode')),
+    ('departure_icao', ('departure', 'icaoCode')),
+    ('departure_terminal', ('departure', 'terminal')),
+    ('departure_scheduled_time', ('departure', 'scheduledTime')),
+    ('departure_actual_time', ('departure', 'actualTime')),
+    ('arrival_iata', ('arrival', 'iataCode')),
+    ('arrival_icao', ('arrival', 'icaoCode')),
+    ('arrival_terminal', ('arrival', 'terminal')),
+    ('arrival_scheduled_time', ('arrival', 'scheduledTime')),
+    ('arrival_actual_time', ('arrival', 'actualTime')),
+    ('status', ('status',)),
+    ('flight_type', ('type',)),
+    ('codeshare_airline', (CODESHARE, 'airline', 'name')),
+    ('codeshare_flight', (CODESHARE, 'flight', 'number')),
+    ('aircraft_registration', ('aircraft', ('registration', 'reg'))),
+    ('gate', ('departure', 'gate')),
+    ('delay_minutes', ('departure', 'delay')),
+)
+
+_EMPTY: Dict[str, Any] = {}
+
+
+def select_fields(fields: Sequence[Field], names: Iterable[str]) -> Tuple[Field, ...]:
+    """
+    Pick fields by name, in the order given.
+
+    Raises:
+        KeyError: If a name is not in fields
+    """
+    by_name = dict(fields)
+    return tuple((name, by_name[name]) for name in names)
+
+
+def compile_mapper(fields: Sequence[Field], defaults: Optional[Dict[str, Any]] = None,
+                   name: str = 'extract') -> Callable[[Dict[str, Any]], Tuple]:
+    """
+    Compile fields into a function mapping a payload dict to a tuple.
+
+    Args:
+        fields: (name, path) pairs; every step but the last must lead to a
+               dict, and a missing or null one counts as empty
+        defaults: Value per field name used when its last key is absent
+        name: Name of the generated function
+
+    Returns:
+        The extractor; its source is kept on the function as .source
+    """
+    defaults = defaults or {}
+    namespace = {'_empty': _EMPTY}
+    containers = {(): 'record'}
+    lines = []
+
+    def container(path: Tuple[Step, ...]) -> str:
+        # Each nested object is fetched once and shared by all its fields
+        if path not in containers:
+            parent = container(path[:-1])
+            variable = f"_c{len(containers)}"
+            step = path[-1]
+            keys = (step,) if isinstance(step, str) else step
+            lookups = ' or '.join(f"{parent}.get({key!r})" for key in keys)
+            lines.append(f"    {variable} = {lookups} or _empty")
+            containers[path] = variable
+        return containers[path]
+
+    values = []
+    for index, (field, path) in enumerate(fields):
+        parent = container(tuple(path[:-1]))
+        step = path[-1]
+        keys = (step,) if isinstance(step, str) else step
+        if field in defaults:
+            namespace[f"_d{index}"] = defaults[field]
+            expression = f"_d{index}"
+        else:
+            expression = None
+        for key in reversed(keys):
+            expression = (f"{parent}.get({key!r}, {expression})" if expression
+                          else f"{parent}.get({key!r})")
+        values.append(expression)
+
+    source = '\n'.join([f"def {name}(record):", *lines,
+                        f"    return ({', '.join(values)}{',' if len(values) == 1 else ''})"])
+    exec(compile(source, f"<schedule_mapping {name}>", 'exec'), namespace)
+    mapper = namespace[name]
+    mapper.fields = tuple(field for field, _ in fields)
+    mapper.source = source
+    return mapper
+
+
+# Shared extractors for the ingestion paths (see AviationDatabase._schedule_to_row
+# and AviationEdgeFutureSchedulesClient._schedule_to_row)
+extract_schedule = compile_mapper(SCHEDULE_FIELDS, name='extract_schedule')
+extract_future_schedule = compile_mapper(
+    SCHEDULE_FIELDS, defaults={'status': 'scheduled', 'flight_type': 'passenger'},
+    name='extract_future_schedule')
@@ -0,0 +1,341 @@
+"""
+Parquet export and import of the schedule store.
+
+Tables are streamed out of SQLite in Arrow record batches, so exporting
+never holds more than one batch in memory, and written either as a single
+Parquet file or as a Hive-partitioned dataset
+(departure_date=2025-10-01/departure_iata=MNL/part-0.parquet). The Arrow
+schema is derived from the table's declared column types and the SQLite
+types are kept in the field metadata, so an export imports back into the
+same columns and types.
+
+flight_schedules rows carry their airline and airports as ids into the
+dimension tables, which mean nothing outside the database they came from.
+They are exported as the ICAO codes and names those ids point at, and the
+import turns them back into ids of the target database's own airlines and
+airports.
+
+Usage:
+    db.export_parquet('exports/schedules')
+    other_db.import_parquet('exports/schedules')
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from aviation_database import ensure_schedule_natural_key
+from dimension_cache import DimensionCache
+from schedule_indexes import SCHEDULE_INDEXES, create_schedule_indexes
+from schedule_rollups import drop_rollups, ensure_schedule_rollups
+
+DEFAULT_PARTITIONING = ('departure_date', 'departure_iata')
+
+# Columns computed during export for partitioning, with the table column they
+# are derived from; they are not table columns themselves
+DERIVED_COLUMNS = {
+    'departure_date': ('departure_scheduled_time', lambda batch: pc.utf8_slice_codeunits(
+        batch.column('departure_scheduled_time'), 0, 10)),
+}
+
+# flight_schedules dimension id column -> (dimension table, IATA column,
+# exported ICAO code column, exported name column)
+DIMENSION_COLUMNS = {
+    'airline_id': ('airlines', 'airline_iata', 'airline_icao', 'airline_name'),
+    'departure_airport_id': ('airports', 'departure_iata', 'departure_icao', 'departure_airport_name'),
+    'arrival_airport_id': ('airports', 'arrival_iata', 'arrival_icao', 'arrival_airport_name'),
+}
+
+_ARROW_TYPES = {
+    'INTEGER': pa.int64(),
+    'REAL': pa.float64(),
+    'TEXT': pa.string(),
+    'BLOB': pa.binary(),
+}
+
+
+def arrow_schema(conn: sqlite3.Connection, table: str = 'flight_schedules') -> pa.Schema:
+    """
+    Build the Arrow schema of a table from its declared column types.
+
+    Types without a direct Arrow equivalent (TIMESTAMP, BOOLEAN) are kept as
+    they are stored by SQLite: timestamps as text, booleans as integers.
+    """
+    fields = []
+    for column in conn.execute(f'PRAGMA table_info({table})').fetchall():
+        name, declared = column[1], (column[2] or '').upper()
+        arrow_type = _ARROW_TYPES.get(declared, pa.int64() if declared == 'BOOLEAN' else pa.string())
+        fields.append(pa.field(name, arrow_type, nullable=not column[3],
+                               metadata={'sqlite_type': declared}))
+    if not fields:
+        raise ValueError(f"Table '{table}' does not exist")
+    return pa.schema(fields, metadata={'sqlite_table': table})
+
+
+def export_schema(conn: sqlite3.Connection, table: str = 'flight_schedules') -> pa.Schema:
+    """
+    Build the Arrow schema a table is exported with.
+
+    For flight_schedules each dimension id column is replaced by the ICAO
+    code and name columns of the airline or airport it points at.
+    """
+    schema = arrow_schema(conn, table)
+    if table != 'flight_schedules':
+        return schema
+    for id_column, (_, _, icao_column, name_column) in DIMENSION_COLUMNS.items():
+        position = schema.get_field_index(id_column)
+        if position < 0:
+            continue
+        schema = schema.remove(position)
+        for offset, name in enumerate((icao_column, name_column)):
+            schema = schema.insert(position + offset, pa.field(name, pa.string(),
+                                                                metadata={'sqlite_type': 'TEXT'}))
+    return schema
+
+
+def _select_sql(table: str, schema: pa.Schema, order_by: str) -> str:
+    """SELECT of a table's export columns, joining in the dimension codes and names of flight_schedules."""
+    if table != 'flight_schedules':
+        return f"SELECT {', '.join(schema.names)} FROM {table} ORDER BY {order_by}"
+    expressions, joins = {}, []
+    for id_column, (dimension, _, icao_column, name_column) in DIMENSION_COLUMNS.items():
+        alias = id_column[:-len('_id')]
+        expressions[icao_column] = f'{alias}.icao_code'
+        expressions[name_column] = f'{alias}.name'
+        joins.append(f'LEFT JOIN {dimension} AS {alias} ON {alias}.id = {table}.{id_column}')
+    columns = ', '.join(expressions.get(name, f'{table}.{name}') for name in schema.names)
+    return f"SELECT {columns} FROM {table} {' '.join(joins)} ORDER BY {table}.{order_by}"
+
+
+def iter_record_batches(conn: sqlite3.Connection, table: str = 'flight_schedules',
+                        batch_size: int = 65536, schema: pa.Schema = None,
+                        order_by: str = 'rowid') -> Iterator[pa.RecordBatch]:
+    """
+    Stream a table out of SQLite as Arrow record batches.
+
+    Args:
+        conn: SQLite connection
+        table: Table to read
+        batch_size: Rows per record batch
+        schema: Arrow schema, the table's export schema if not given
+        order_by: Column to read the rows in
+    """
+    schema = schema or export_schema(conn, table)
+    # A dedicated cursor, so the connection's row_factory does not apply
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(_select_sql(table, schema, order_by))
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+            schema=schema)
+
+
+def export_parquet(conn: sqlite3.Connection, path: str, table: str = 'flight_schedules',
+                   partition_by: Optional[Sequence[str]] = DEFAULT_PARTITIONING,
+                   batch_size: int = 65536, compression: str = 'zstd') -> int:
+    """
+    Export a table to Parquet without materializing it.
+
+    Args:
+        conn: SQLite connection
+        path: Output directory for a partitioned dataset, or file if partition_by is empty
+        table: Table to export
+        partition_by: Hive partition columns; table columns or 'departure_date'
+        batch_size: Rows per record batch
+        compression: Parquet compression codec
+
+    Returns:
+        Number of rows exported
+    """
+    schema = export_schema(conn, table)
+    exported = 0
+
+    if not partition_by:
+        batches = iter_record_batches(conn, table, batch_size, schema)
+        with pq.ParquetWriter(path, schema, compression=compression) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                exported += batch.num_rows
+        return exported
+
+    derived = [name for name in partition_by if name not in schema.names]
+    for name in derived:
+        if name not in DERIVED_COLUMNS:
+            raise ValueError(f"Cannot partition by '{name}': not a column of {table}")
+    output_schema = schema
+    for name in derived:
+        output_schema = output_schema.append(pa.field(name, pa.string()))
+    partitioning = ds.partitioning(
+        pa.schema([output_schema.field(name) for name in partition_by]), flavor='hive')
+
+    # Reading in order of the first partition column keeps each of its values
+    # contiguous, so the writer can finish partitions instead of buffering all
+    # of them; this is what bounds memory for many small partitions
+    first = partition_by[0]
+    order_by = DERIVED_COLUMNS[first][0] if first in derived else first
+    batches = iter_record_batches(conn, table, batch_size, schema, order_by=order_by)
+
+    def with_partition_columns():
+        nonlocal exported
+        for batch in batches:
+            exported += batch.num_rows
+            if not derived:
+                yield batch
+                continue
+            yield pa.RecordBatch.from_arrays(
+                batch.columns + [DERIVED_COLUMNS[name][1](batch) for name in derived],
+                schema=output_schema)
+
+    def write(reader):
+        ds.write_dataset(
+            reader, path, format='parquet', partitioning=partitioning,
+            file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+            existing_data_behavior='delete_matching', max_partitions=1 << 20,
+            max_open_files=512)
+
+    _write_from_this_thread(write, output_schema, with_partition_columns())
+    return exported
+
+
+def _write_from_this_thread(write, schema: pa.Schema, batches: Iterator[pa.RecordBatch]):
+    """
+    Run a dataset write that pulls batches on Arrow's own threads.
+
+    SQLite connections may only be used by the thread that created them, so
+    batches are read here and handed to the writer through a small queue.
+    """
+    handoff = queue.Queue(maxsize=2)
+    errors = []
+
+    def consume():
+        try:
+            write(pa.RecordBatchReader.from_batches(schema, iter(handoff.get, None)))
+        except BaseException as error:
+            errors.append(error)
+            while handoff.get() is not None:
+                pass
+
+    writer = threading.Thread(target=consume, name='parquet-writer')
+    writer.start()
+    try:
+        for batch in batches:
+            if errors:
+                break
+            handoff.put(batch)
+    finally:
+        handoff.put(None)
+        writer.join()
+    if errors:
+        raise errors[0]
+
+
+def import_parquet(conn: sqlite3.Connection, path: str, table: str = 'flight_schedules',
+                   keep_ids: bool = True, batch_size: int = 65536,
+                   airlines: Optional[DimensionCache] = None,
+                   airports: Optional[DimensionCache] = None) -> int:
+    """
+    Bulk-load a Parquet file or partitioned dataset written by export_parquet.
+
+    Rows already present (same id, or same natural key for flight_schedules)
+    are skipped. Loading into an empty flight_schedules drops its secondary
+    indexes and rollup tables for the load and rebuilds them afterwards.
+    Schedules get their airline and airport ids from the target's dimension
+    tables: the exported codes and names are ensured there, never the
+    exported ids copied.
+
+    Args:
+        conn: SQLite connection
+        path: Parquet file or dataset directory
+        table: Table to load into
+        keep_ids: Keep the exported ids (restoring a database); False lets
+                  SQLite assign new ids (merging into one that has data)
+        batch_size: Rows per insert batch
+        airlines: DimensionCache of conn's airlines, a new one if not given
+        airports: DimensionCache of conn's airports, a new one if not given
+
+    Returns:
+        Number of rows inserted
+    """
+    schema = arrow_schema(conn, table)
+    dimensions = {}
+    if table == 'flight_schedules':
+        dimensions = {'airlines': airlines or DimensionCache(conn, 'airlines'),
+                      'airports': airports or DimensionCache(conn, 'airports')}
+    partitioning = None
+    if os.path.isdir(path):
+        partitioning = ds.partitioning(pa.schema(
+            [schema.field(name) if name in schema.names else pa.field(name, pa.string())
+             for name in _partition_names(path)]), flavor='hive')
+    dataset = ds.dataset(path, format='parquet', partitioning=partitioning)
+
+    exported_dimensions = [name for _, _, *names in DIMENSION_COLUMNS.values() for name in names
+                           if dimensions and name in dataset.schema.names]
+    unknown = [name for name in dataset.schema.names if name not in schema.names
+               and name not in DERIVED_COLUMNS and name not in exported_dimensions]
+    if unknown:
+        raise ValueError(f"Columns {unknown} do not exist in {table}")
+    columns = [name for name in schema.names if name in dataset.schema.names
+               and (keep_ids or name != 'id') and not (dimensions and name in DIMENSION_COLUMNS)]
+    inserted = columns + (list(DIMENSION_COLUMNS) if dimensions else [])
+
+    sql = f'''
+        INSERT OR IGNORE INTO {table} ({', '.join(inserted)})
+        VALUES ({', '.join('?' for _ in inserted)})
+    '''
+    rebuild = table == 'flight_schedules' and not conn.execute(
+        'SELECT 1 FROM flight_schedules LIMIT 1').fetchone()
+    if rebuild:
+        with conn:
+            for name in [*SCHEDULE_INDEXES, 'idx_schedules_natural_key']:
+                conn.execute(f'DROP INDEX IF EXISTS {name}')
+            drop_rollups(conn)
+
+    imported = 0
+    for batch in dataset.to_batches(columns=columns + exported_dimensions, batch_size=batch_size):
+        values = {name: batch.column(name).to_pylist() for name in batch.schema.names}
+        with conn:
+            ids = _dimension_ids(values, batch.num_rows, dimensions) if dimensions else []
+            imported += conn.executemany(sql, zip(*(values[name] for name in columns), *ids)).rowcount
+
+    if rebuild:
+        create_schedule_indexes(conn)
+        ensure_schedule_natural_key(conn)
+        ensure_schedule_rollups(conn)
+    return imported
+
+
+def _dimension_ids(values: Dict[str, list], num_rows: int,
+                   dimensions: Dict[str, DimensionCache]) -> List[list]:
+    """Ensure a batch's airlines and airports in the target; returns their id columns."""
+    ids = []
+    for dimension, iata_column, icao_column, name_column in DIMENSION_COLUMNS.values():
+        cache = dimensions[dimension]
+        codes = values.get(iata_column) or [None] * num_rows
+        cache.ensure(zip(codes, values.get(icao_column, repeat(None)), values.get(name_column, repeat(None))))
+        ids.append([cache.id(code) for code in codes])
+    return ids
+
+
+def _partition_names(path: str) -> Sequence[str]:
+    """Read the Hive partition column names from the first file's directory path."""
+    names = []
+    directory = path
+    while True:
+        entries = sorted(entry for entry in os.listdir(directory)
+                         if os.path.isdir(os.path.join(directory, entry)) and '=' in entry)
+        if not entries:
+            return names
+        names.append(entries[0].split('=', 1)[0])
+        directory = os.path.join(directory, entries[0])
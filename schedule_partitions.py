@@ -0,0 +1,285 @@
+"""
+Week-partitioned storage for flight schedules, with retention.
+
+The live flight_schedules table only holds the most recent weeks (the hot
+partition). Older weeks are moved, a whole week at a time, into partition
+files next to the database, one SQLite file per ISO week of UTC departure:
+
+    aviation_data_partitions/flight_schedules_2025-W40.db
+
+Partition files keep the table's columns and indexes, so searches over a
+departure window attach only the weeks it overlaps. After a further period
+they are gzip-compressed (.db.gz) and no longer searched; restore() brings
+one back. Rows without a departure_epoch (airports missing from the
+timezone table) are placed by the UTC time they were collected.
+"""
+
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import uuid
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from schedule_times import TimeLike, to_epoch
+
+WEEK = 7 * 86400
+# 1970-01-01 was a Thursday; ISO weeks start on Monday 1970-01-05
+_MONDAY = 4 * 86400
+
+# hot_weeks: weeks kept in the live table, including the current one
+# archive_after_weeks: age at which partition files are compressed
+# delete_after_weeks: age at which archives are deleted (None keeps them)
+RETENTION_POLICY = {
+    'hot_weeks': 2,
+    'archive_after_weeks': 8,
+    'delete_after_weeks': None,
+}
+
+# Timestamp used to place a row; departure_epoch, else when it was collected
+PARTITION_KEY = "COALESCE(departure_epoch, CAST(strftime('%s', created_at) AS INTEGER))"
+
+Partition = namedtuple('Partition', ['week', 'start', 'path', 'archived'])
+
+_FILE_PATTERN = re.compile(r'^flight_schedules_(\d{4}-W\d{2})\.db(\.gz)?$')
+
+
+def week_start(epoch: int) -> int:
+    """Epoch seconds of the Monday 00:00 UTC starting the week of epoch."""
+    return epoch - (epoch - _MONDAY) % WEEK
+
+
+def week_name(start: int) -> str:
+    """ISO week name ('2025-W40') of a week start."""
+    year, week, _ = datetime.fromtimestamp(start, timezone.utc).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_from_name(name: str) -> int:
+    """Week start epoch of an ISO week name."""
+    monday = datetime.strptime(f"{name}-1", '%G-W%V-%u').replace(tzinfo=timezone.utc)
+    return int(monday.timestamp())
+
+
+def _now(now: Optional[TimeLike]) -> int:
+    return to_epoch(now) if now is not None else int(datetime.now(timezone.utc).timestamp())
+
+
+class SchedulePartitions:
+    """Weekly partition files of flight_schedules next to a database."""
+
+    def __init__(self, conn: sqlite3.Connection, directory: str):
+        self.conn = conn
+        self.directory = directory
+
+    def path(self, start: int, archived: bool = False) -> str:
+        suffix = '.db.gz' if archived else '.db'
+        return os.path.join(self.directory, f"flight_schedules_{week_name(start)}{suffix}")
+
+    def list(self) -> List[Partition]:
+        """Partition files on disk, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        partitions = []
+        for name in sorted(os.listdir(self.directory)):
+            match = _FILE_PATTERN.match(name)
+            if match:
+                partitions.append(Partition(match.group(1), week_from_name(match.group(1)),
+                                            os.path.join(self.directory, name), bool(match.group(2))))
+        return partitions
+
+    def covering(self, after: Optional[TimeLike] = None, before: Optional[TimeLike] = None,
+                 archived: bool = False) -> List[Partition]:
+        """
+        Partitions whose week overlaps a UTC departure window.
+
+        Args:
+            after: Window start (inclusive), unbounded if None
+            before: Window end (exclusive), unbounded if None
+            archived: Return compressed partitions instead of searchable ones
+        """
+        low = to_epoch(after) if after is not None else None
+        high = to_epoch(before) if before is not None else None
+        return [partition for partition in self.list()
+                if partition.archived == archived
+                and (low is None or partition.start + WEEK > low)
+                and (high is None or partition.start < high)]
+
+    @contextmanager
+    def attach(self, partition: Partition, conn: Optional[sqlite3.Connection] = None) -> Iterator[str]:
+        """
+        Attach a partition file for the duration of the block; yields its schema name.
+
+        Args:
+            partition: Partition to attach
+            conn: Connection to attach it to, by default the live table's writer
+        """
+        conn = conn or self.conn
+        schema = f"partition_{uuid.uuid4().hex[:8]}"
+        conn.execute('ATTACH DATABASE ? AS ' + schema, (partition.path,))
+        try:
+            yield schema
+        finally:
+            conn.execute(f'DETACH DATABASE {schema}')
+
+    def _create(self, start: int) -> Partition:
+        """Create an empty partition file with the live table's schema and indexes."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(start)
+        # Not its triggers, which maintain rollup tables only the live database has
+        statements = [row[0] for row in self.conn.execute('''
+            SELECT sql FROM sqlite_master
+            WHERE tbl_name = 'flight_schedules' AND type IN ('table', 'index') AND sql IS NOT NULL
+            ORDER BY type DESC
+        ''')]
+        partition = sqlite3.connect(path)
+        try:
+            with partition:
+                for statement in statements:
+                    partition.execute(statement)
+        finally:
+            partition.close()
+        return Partition(week_name(start), start, path, False)
+
+    def _sync_columns(self, schema: str) -> List[str]:
+        """Add live columns missing from an older partition; returns the live column names."""
+        live = self.conn.execute('PRAGMA main.table_info(flight_schedules)').fetchall()
+        existing = {row[1] for row in self.conn.execute(f'PRAGMA {schema}.table_info(flight_schedules)')}
+        for column in live:
+            if column[1] not in existing:
+                self.conn.execute(f'ALTER TABLE {schema}.flight_schedules ADD COLUMN {column[1]} {column[2]}')
+        return [column[1] for column in live]
+
+    def roll(self, hot_weeks: int = RETENTION_POLICY['hot_weeks'], now: Optional[TimeLike] = None) -> int:
+        """
+        Move weeks older than the hot window out of the live table.
+
+        Each week is copied into its partition file and committed there first.
+        Only once every row of the week is found in the partition is it
+        removed from the live table, in a separate transaction: a transaction
+        spanning attached databases is not atomic in WAL mode, so a crash
+        between the two commits leaves the week in both files rather than in
+        neither. Rolling again is safe: rows re-collected for an already
+        rolled week replace their copy in the partition.
+
+        Returns:
+            Number of rows moved
+        """
+        boundary = week_start(_now(now)) - (hot_weeks - 1) * WEEK
+        weeks = [row[0] for row in self.conn.execute(f'''
+            SELECT DISTINCT ({PARTITION_KEY}) - (({PARTITION_KEY}) - {_MONDAY}) % {WEEK}
+            FROM main.flight_schedules
+            WHERE {PARTITION_KEY} < ?
+        ''', (boundary,))]
+
+        moved = 0
+        for start in sorted(weeks):
+            existing = [p for p in self.list() if p.start == start]
+            if existing and existing[0].archived:
+                self.restore(existing[0].week)
+            partition = self._create(start) if not existing else Partition(
+                week_name(start), start, self.path(start), False)
+            week = (start, start + WEEK)
+            with self.attach(partition) as schema:
+                columns = ', '.join(self._sync_columns(schema))
+                with self.conn:
+                    self.conn.execute(f'''
+                        INSERT OR REPLACE INTO {schema}.flight_schedules ({columns})
+                        SELECT {columns} FROM main.flight_schedules
+                        WHERE {PARTITION_KEY} >= ? AND {PARTITION_KEY} < ?
+                    ''', week)
+
+                copied = f'''
+                    {PARTITION_KEY} >= ? AND {PARTITION_KEY} < ?
+                    AND id IN (SELECT id FROM {schema}.flight_schedules)
+                '''
+                live, stored = self.conn.execute(f'''
+                    SELECT COUNT(*), COUNT(CASE WHEN {copied} THEN 1 END)
+                    FROM main.flight_schedules
+                    WHERE {PARTITION_KEY} >= ? AND {PARTITION_KEY} < ?
+                ''', week + week).fetchone()
+                if stored != live:
+                    print(f"⚠️  {partition.week}: {stored:,} of {live:,} rows found in the partition, "
+                          f"keeping the week in the live table")
+                    continue
+                with self.conn:
+                    moved += self.conn.execute(
+                        f'DELETE FROM main.flight_schedules WHERE {copied}', week).rowcount
+        return moved
+
+    def archive(self, archive_after_weeks: int = RETENTION_POLICY['archive_after_weeks'],
+                now: Optional[TimeLike] = None) -> List[str]:
+        """
+        Compress partition files older than archive_after_weeks.
+
+        Returns:
+            Weeks archived
+        """
+        cutoff = week_start(_now(now)) - archive_after_weeks * WEEK
+        archived = []
+        for partition in self.list():
+            if partition.archived or partition.start >= cutoff:
+                continue
+            with open(partition.path, 'rb') as source, \
+                    gzip.open(self.path(partition.start, archived=True), 'wb') as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+            os.remove(partition.path)
+            archived.append(partition.week)
+        return archived
+
+    def purge(self, delete_after_weeks: Optional[int] = RETENTION_POLICY['delete_after_weeks'],
+              now: Optional[TimeLike] = None) -> List[str]:
+        """
+        Delete compressed archives older than delete_after_weeks (None keeps them).
+
+        Returns:
+            Weeks deleted
+        """
+        if delete_after_weeks is None:
+            return []
+        cutoff = week_start(_now(now)) - delete_after_weeks * WEEK
+        deleted = []
+        for partition in self.list():
+            if partition.archived and partition.start < cutoff:
+                os.remove(partition.path)
+                deleted.append(partition.week)
+        return deleted
+
+    def restore(self, week: str) -> str:
+        """
+        Decompress an archived week so it is searchable again.
+
+        Returns:
+            Path of the restored partition file
+        """
+        start = week_from_name(week)
+        archive, path = self.path(start, archived=True), self.path(start)
+        if not os.path.exists(archive):
+            raise FileNotFoundError(f"No archived partition for {week}")
+        with gzip.open(archive, 'rb') as source, open(path, 'wb') as target:
+            shutil.copyfileobj(source, target, 1 << 20)
+        os.remove(archive)
+        return path
+
+    def apply(self, policy: Optional[Dict[str, Optional[int]]] = None,
+              now: Optional[TimeLike] = None) -> Dict[str, object]:
+        """
+        Run the retention policy: roll, archive, then purge.
+
+        Args:
+            policy: Overrides of RETENTION_POLICY
+            now: Reference time, the current time if None
+
+        Returns:
+            {'moved': rows, 'archived': [weeks], 'deleted': [weeks]}
+        """
+        settings = {**RETENTION_POLICY, **(policy or {})}
+        return {
+            'moved': self.roll(settings['hot_weeks'], now),
+            'archived': self.archive(settings['archive_after_weeks'], now),
+            'deleted': self.purge(settings['delete_after_weeks'], now),
+        }
@@ -0,0 +1,185 @@
+"""
+Incrementally maintained rollups of flight_schedules.
+
+get_airport_traffic and get_airline_activity used to GROUP BY over every
+schedule row. The counts they need are kept instead in small rollup tables,
+one row per group and departure day:
+
+    airport_daily_traffic   airport_iata, day, flight_type  -> flights
+    airline_daily_activity  airline_iata, day, status       -> flights
+    route_daily_frequency   departure_iata, arrival_iata, day -> flights
+
+Triggers on flight_schedules keep them current in the same transaction as
+the write that changed the schedules, whichever path it came through: the
+ingest upsert (a status change moves one flight between status groups),
+retention moving weeks out, compaction, Parquet imports or raw SQL. A
+report then reads a few hundred rollup rows instead of the whole table.
+
+The day is the local departure date of the timetable. Group columns are
+never NULL, since NULLs would defeat the primary key; a missing value is
+stored as ''. rebuild_rollups() recomputes the tables from flight_schedules
+and check_rollups() reports groups that drifted from it.
+"""
+
+import sqlite3
+from typing import Dict, Iterable, Optional, Tuple
+
+# Rollup table -> (group column, expression over a flight_schedules row {row}) pairs
+ROLLUPS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    'airport_daily_traffic': (
+        ('airport_iata', "COALESCE({row}.departure_iata, {row}.arrival_iata, '')"),
+        ('day', "COALESCE(substr({row}.departure_scheduled_time, 1, 10), '')"),
+        ('flight_type', "COALESCE({row}.flight_type, '')"),
+    ),
+    'airline_daily_activity': (
+        ('airline_iata', "COALESCE({row}.airline_iata, '')"),
+        ('day', "COALESCE(substr({row}.departure_scheduled_time, 1, 10), '')"),
+        ('status', "COALESCE({row}.status, '')"),
+    ),
+    'route_daily_frequency': (
+        ('departure_iata', "COALESCE({row}.departure_iata, '')"),
+        ('arrival_iata', "COALESCE({row}.arrival_iata, '')"),
+        ('day', "COALESCE(substr({row}.departure_scheduled_time, 1, 10), '')"),
+    ),
+}
+
+# flight_schedules columns each rollup is grouped by; updates to other columns skip it
+ROLLUP_SOURCES: Dict[str, Tuple[str, ...]] = {
+    'airport_daily_traffic': ('departure_iata', 'arrival_iata', 'departure_scheduled_time', 'flight_type'),
+    'airline_daily_activity': ('airline_iata', 'departure_scheduled_time', 'status'),
+    'route_daily_frequency': ('departure_iata', 'arrival_iata', 'departure_scheduled_time'),
+}
+
+ROLLUP_TABLES = tuple(ROLLUPS)
+
+
+def _expressions(table: str, row: str) -> str:
+    return ', '.join(expression.format(row=row) for _, expression in ROLLUPS[table])
+
+
+def _columns(table: str) -> str:
+    return ', '.join(column for column, _ in ROLLUPS[table])
+
+
+def _add(table: str, row: str) -> str:
+    return (f"INSERT INTO {table} ({_columns(table)}, flights) VALUES ({_expressions(table, row)}, 1) "
+            f"ON CONFLICT ({_columns(table)}) DO UPDATE SET flights = flights + 1;")
+
+
+def _remove(table: str, row: str) -> str:
+    match = ' AND '.join(f"{column} = {expression.format(row=row)}" for column, expression in ROLLUPS[table])
+    return (f"UPDATE {table} SET flights = flights - 1 WHERE {match};\n"
+            f"DELETE FROM {table} WHERE {match} AND flights = 0;")
+
+
+def _aggregate(table: str) -> str:
+    """The rollup's rows computed from scratch over flight_schedules."""
+    groups = ', '.join(str(position) for position in range(1, len(ROLLUPS[table]) + 1))
+    selected = ', '.join(f"{expression.format(row='flight_schedules')} AS {column}"
+                         for column, expression in ROLLUPS[table])
+    return f'''
+        SELECT {selected}, COUNT(*) AS flights FROM flight_schedules
+        GROUP BY {groups}
+    '''
+
+
+def create_rollup_triggers(conn: sqlite3.Connection, tables: Iterable[str] = ROLLUP_TABLES):
+    """Create the triggers that keep the rollup tables in step with flight_schedules."""
+    for table in tables:
+        sources = ROLLUP_SOURCES[table]
+        changed = ' OR '.join(f"OLD.{column} IS NOT NEW.{column}" for column in sources)
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON flight_schedules
+            BEGIN {_add(table, 'NEW')} END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON flight_schedules
+            BEGIN {_remove(table, 'OLD')} END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_update
+            AFTER UPDATE OF {', '.join(sources)} ON flight_schedules
+            WHEN {changed}
+            BEGIN {_remove(table, 'OLD')} {_add(table, 'NEW')} END
+        ''')
+
+
+def drop_rollups(conn: sqlite3.Connection):
+    """
+    Drop the rollup tables and their triggers, e.g. for a bulk load into an
+    empty flight_schedules; ensure_schedule_rollups() builds them again.
+    """
+    for table in ROLLUP_TABLES:
+        for event in ('insert', 'delete', 'update'):
+            conn.execute(f'DROP TRIGGER IF EXISTS {table}_{event}')
+        conn.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+def rebuild_rollups(conn: sqlite3.Connection, tables: Iterable[str] = ROLLUP_TABLES) -> int:
+    """
+    Recompute rollup tables from flight_schedules in one transaction.
+
+    Returns:
+        Number of rollup rows written
+    """
+    written = 0
+    with conn:
+        for table in tables:
+            conn.execute(f'DELETE FROM {table}')
+            cursor = conn.execute(f'INSERT INTO {table} ({_columns(table)}, flights) {_aggregate(table)}')
+            written += cursor.rowcount
+    return written
+
+
+def check_rollups(conn: sqlite3.Connection, tables: Iterable[str] = ROLLUP_TABLES) -> Dict[str, int]:
+    """
+    Compare rollup tables with flight_schedules.
+
+    Returns:
+        Number of groups whose stored count differs from the recomputed one, per table
+    """
+    drift = {}
+    for table in tables:
+        stored = f"SELECT {_columns(table)}, flights FROM {table}"
+        actual = _aggregate(table)
+        # A group with a wrong count shows up on both sides; UNION counts it once
+        drift[table] = conn.execute(f'''
+            SELECT COUNT(*) FROM (
+                SELECT {_columns(table)} FROM ({stored} EXCEPT {actual})
+                UNION
+                SELECT {_columns(table)} FROM ({actual} EXCEPT {stored})
+            )
+        ''').fetchone()[0]
+    return drift
+
+
+def ensure_schedule_rollups(conn: sqlite3.Connection) -> Optional[int]:
+    """
+    Create the rollup tables and their triggers.
+
+    Rollup tables that did not exist yet are filled from the schedules
+    already stored.
+
+    Returns:
+        Number of rollup rows built, or None if every rollup already existed
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    missing = [table for table in ROLLUP_TABLES if table not in existing]
+    with conn:
+        for table in missing:
+            columns = ', '.join(f"{column} TEXT NOT NULL" for column, _ in ROLLUPS[table])
+            conn.execute(f'''
+                CREATE TABLE {table} (
+                    {columns},
+                    flights INTEGER NOT NULL,
+                    PRIMARY KEY ({_columns(table)})
+                ) WITHOUT ROWID
+            ''')
+        create_rollup_triggers(conn)
+    if not missing:
+        return None
+
+    built = rebuild_rollups(conn, missing)
+    if built:
+        print(f"📈 Built {built:,} rollup rows for {', '.join(missing)}")
+    return built
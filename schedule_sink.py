@@ -0,0 +1,86 @@
+"""
+Shared write path for flattened schedule rows.
+
+Both API clients map their payloads to the same flight_schedules row tuple
+(see AviationDatabase._schedule_to_row and
+AviationEdgeFutureSchedulesClient._schedule_to_row). A ScheduleSink buffers
+those rows, whichever client produced them, and hands them to the one
+AviationDatabase that owns the schema, the connection and the dimension and
+delta caches, batch_size rows per transaction. Timetable and future
+schedules collected in the same run therefore share transactions instead of
+two connections taking turns on the write lock.
+
+The sink is not thread-safe; feed it from the thread that owns the database.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class ScheduleSink:
+    """Buffers schedule rows from any client and writes them in shared batches."""
+
+    def __init__(self, database, batch_size: int = 500, only_changed: bool = True):
+        """
+        Args:
+            database: AviationDatabase the rows are written to
+            batch_size: Number of rows written per transaction
+            only_changed: Skip flights whose fingerprint matches the stored one
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.database = database
+        self.batch_size = batch_size
+        self.only_changed = only_changed
+        self._pending: List[Tuple] = []
+        self.stats = {'received': 0, 'written': 0, 'batches': 0}
+
+    def add(self, rows: Iterable[Tuple]) -> int:
+        """
+        Buffer rows, writing every full batch.
+
+        Returns:
+            Number of rows written by the batches this call flushed
+        """
+        written = 0
+        for row in rows:
+            self._pending.append(row)
+            self.stats['received'] += 1
+            if len(self._pending) >= self.batch_size:
+                written += self.flush()
+        return written
+
+    def flush(self) -> int:
+        """
+        Write the buffered rows in one transaction.
+
+        The buffer is emptied even if the write fails, so one bad batch does
+        not poison the next.
+
+        Returns:
+            Number of rows inserted or refreshed
+        """
+        if not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        written = self.database.write_schedule_rows(rows, only_changed=self.only_changed)
+        self.stats['written'] += written
+        self.stats['batches'] += 1
+        return written
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get sink counters.
+
+        Returns:
+            Dictionary with received, written, batches and pending
+        """
+        stats = dict(self.stats)
+        stats['pending'] = len(self._pending)
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
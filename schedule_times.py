@@ -0,0 +1,174 @@
+"""
+Schedule time normalization.
+
+Aviation Edge reports scheduled times as wall-clock strings local to each
+airport ('2025-10-01T06:25:00.000', sometimes with a lowercase 't', or just
+'06:25' from flightsFuture). Comparing or subtracting those strings is wrong
+as soon as two timezones are involved, so ingestion converts them once into
+UTC epoch seconds plus the airport's UTC offset in minutes.
+
+Airport timezones come from the bundled airport_timezones.csv (IATA code to
+IANA zone) and are resolved offline with zoneinfo. Times at airports missing
+from the table are left unconverted (None) rather than guessed.
+"""
+
+import csv
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+TIMEZONE_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'airport_timezones.csv')
+
+TimeLike = Union[datetime, str, int, float]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@lru_cache(maxsize=1)
+def airport_timezones() -> Dict[str, str]:
+    """Load the bundled IATA code to IANA timezone table."""
+    with open(TIMEZONE_TABLE, newline='') as table:
+        return {row['iata_code']: row['timezone'] for row in csv.DictReader(table)}
+
+
+@lru_cache(maxsize=None)
+def airport_zone(iata_code: Optional[str]) -> Optional[ZoneInfo]:
+    """Get the timezone of an airport, or None if it is not in the table."""
+    name = airport_timezones().get((iata_code or '').upper())
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        return None
+
+
+def _is_bare_time(value: str) -> bool:
+    return len(value) <= 8 and ':' in value
+
+
+def dated_schedule_time(value: Optional[str], date: Optional[str], days: int = 0) -> Optional[str]:
+    """
+    Combine a bare 'HH:MM' time with its date into a local 'YYYY-MM-DDTHH:MM' timestamp.
+
+    Full timestamps, missing values and bare times without a (valid) date
+    are returned unchanged.
+
+    Args:
+        value: Schedule time as reported by the API
+        date: 'YYYY-MM-DD' the time is on
+        days: Days after date, e.g. 1 for an arrival past midnight
+    """
+    if not value or not date or not _is_bare_time(value.strip()):
+        return value
+    try:
+        day = datetime.fromisoformat(date).date() + timedelta(days=days)
+    except ValueError:
+        return value
+    return f"{day.isoformat()}T{value.strip()}"
+
+
+def parse_schedule_time(value: Optional[str], date: Optional[str] = None) -> Optional[datetime]:
+    """
+    Parse an API schedule time.
+
+    Args:
+        value: Full timestamp ('2025-10-01T06:25:00.000', optionally with an
+               offset) or a bare 'HH:MM' time
+        date: 'YYYY-MM-DD' to combine with bare times
+
+    Returns:
+        A naive local datetime, an aware datetime if the value carried an
+        offset, or None if it cannot be parsed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if _is_bare_time(value):
+            if not date:
+                return None
+            return datetime.fromisoformat(f"{date}T{value}")
+        value = value.replace('t', 'T').replace('z', '+00:00').replace('Z', '+00:00')
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def utc_fields(iata_code: Optional[str], value: Optional[str],
+               date: Optional[str] = None) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert a local schedule time at an airport to UTC.
+
+    Args:
+        iata_code: Airport the time is local to
+        value: Schedule time as reported by the API
+        date: 'YYYY-MM-DD' for bare 'HH:MM' times
+
+    Returns:
+        (UTC epoch seconds, UTC offset in minutes), or (None, None) when the
+        time or the airport's timezone is unknown
+    """
+    moment = parse_schedule_time(value, date)
+    if moment is None:
+        return None, None
+    if moment.tzinfo is not None:
+        return to_epoch(moment), int(moment.utcoffset().total_seconds() // 60)
+    offset = _local_offset(iata_code, moment.replace(minute=0, second=0, microsecond=0))
+    if offset is None:
+        return None, None
+    return int((moment - _EPOCH).total_seconds()) - offset * 60, offset
+
+
+@lru_cache(maxsize=65536)
+def _local_offset(iata_code: Optional[str], hour: datetime) -> Optional[int]:
+    # UTC offsets only change on hour boundaries, so one lookup per airport-hour
+    zone = airport_zone(iata_code)
+    if zone is None:
+        return None
+    return int(hour.replace(tzinfo=zone).utcoffset().total_seconds() // 60)
+
+
+def to_epoch(value: TimeLike) -> int:
+    """
+    Convert a time to UTC epoch seconds.
+
+    Naive datetimes and ISO strings without an offset are taken as UTC.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((value - _EPOCH).total_seconds())
+
+
+def from_epoch(seconds: int, utc_offset: Optional[int] = None) -> datetime:
+    """
+    Convert epoch seconds back to a datetime.
+
+    Args:
+        seconds: UTC epoch seconds
+        utc_offset: Offset in minutes; returns an aware local datetime when given,
+                    a naive UTC datetime otherwise
+    """
+    moment = _EPOCH + timedelta(seconds=seconds)
+    if utc_offset is None:
+        return moment
+    return moment.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(minutes=utc_offset)))
+
+
+def register_sqlite_functions(conn: sqlite3.Connection):
+    """
+    Expose the conversions to SQL as utc_epoch(time, iata) and utc_offset(time, iata).
+
+    Used to backfill the epoch columns of existing rows in a single UPDATE.
+    """
+    conn.create_function('utc_epoch', 2, lambda value, iata: utc_fields(iata, value)[0],
+                         deterministic=True)
+    conn.create_function('utc_offset', 2, lambda value, iata: utc_fields(iata, value)[1],
+                         deterministic=True)
@@ -0,0 +1,146 @@
+"""
+SQLite connection profiles for the aviation database.
+
+Every connection to aviation_data.db is tuned with one of these profiles
+instead of SQLite's defaults (rollback journal, full sync, ~2 MB page cache):
+
+- ingest: bulk collection runs. WAL so readers are never blocked by the writer,
+  synchronous=NORMAL (durable across crashes, may lose the last commits on
+  power loss), a large page cache and infrequent checkpoints.
+- serve: query workloads. WAL, synchronous=NORMAL and a large memory map so
+  hot pages are read without copying.
+- safe: WAL with synchronous=FULL and conservative memory use for machines
+  where every committed row must survive a power cut.
+
+Read-only connections (connect_readonly) take the same profiles but leave
+the journal mode and checkpointing, which belong to the writer, alone.
+"""
+
+import os
+import sqlite3
+from typing import Dict, Any, Union
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'ingest': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64 * 1024,            # KiB, i.e. 64 MB
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,               # ms
+        'wal_autocheckpoint': 10000,         # pages
+    },
+    'serve': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32 * 1024,
+        'mmap_size': 512 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'wal_autocheckpoint': 1000,
+    },
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8 * 1024,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 10000,
+        'wal_autocheckpoint': 1000,
+    },
+}
+
+DEFAULT_PROFILE = 'serve'
+
+# Pragmas only the writer sets: the journal mode belongs to the database file,
+# and automatic checkpoints run after commits
+WRITER_PRAGMAS = ('journal_mode', 'wal_autocheckpoint')
+
+
+def resolve_profile(profile: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """
+    Get the pragma settings for a profile.
+
+    Args:
+        profile: Profile name, a dict of pragma overrides applied on top of
+                the default profile, or None for SQLite's own defaults
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if profile is None:
+        return {}
+    if isinstance(profile, dict):
+        return {**PROFILES[DEFAULT_PROFILE], **profile}
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}'. Use one of: {', '.join(PROFILES)}")
+    return dict(PROFILES[profile])
+
+
+def apply_profile(conn: sqlite3.Connection,
+                  profile: Union[str, Dict[str, Any], None] = DEFAULT_PROFILE) -> Dict[str, Any]:
+    """
+    Apply a connection profile's pragmas to an open connection.
+
+    Args:
+        conn: Open SQLite connection
+        profile: Profile name, dict of overrides, or None to leave defaults
+
+    Returns:
+        The pragma values SQLite reports after applying the profile
+    """
+    settings = resolve_profile(profile)
+    for pragma, value in settings.items():
+        conn.execute(f'PRAGMA {pragma} = {value}')
+    effective = {}
+    for pragma in settings:
+        # Some pragmas (mmap_size on in-memory databases) report nothing
+        row = conn.execute(f'PRAGMA {pragma}').fetchone()
+        effective[pragma] = row[0] if row else None
+    return effective
+
+
+def connect(db_path: str, profile: Union[str, Dict[str, Any], None] = DEFAULT_PROFILE,
+            **kwargs) -> sqlite3.Connection:
+    """
+    Open a SQLite connection with a profile applied.
+
+    Args:
+        db_path: Path to the database file
+        profile: Profile name, dict of overrides, or None to leave defaults
+        **kwargs: Passed through to sqlite3.connect
+
+    Returns:
+        The configured connection
+    """
+    busy_timeout = resolve_profile(profile).get('busy_timeout')
+    if busy_timeout is not None:
+        kwargs.setdefault('timeout', busy_timeout / 1000)
+    conn = sqlite3.connect(db_path, **kwargs)
+    apply_profile(conn, profile)
+    return conn
+
+
+def connect_readonly(db_path: str, profile: Union[str, Dict[str, Any], None] = DEFAULT_PROFILE,
+                     **kwargs) -> sqlite3.Connection:
+    """
+    Open a read-only connection (a mode=ro URI) with a profile's connection pragmas applied.
+
+    Args:
+        db_path: Path to an existing database file
+        profile: Profile name, dict of overrides, or None to leave defaults
+        **kwargs: Passed through to sqlite3.connect
+
+    Returns:
+        The configured connection; writes through it raise sqlite3.OperationalError
+    """
+    # urllib.request pulls in http.client and email, too slow to import for every startup
+    from urllib.request import pathname2url
+    settings = resolve_profile(profile)
+    if settings.get('busy_timeout') is not None:
+        kwargs.setdefault('timeout', settings['busy_timeout'] / 1000)
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True, **kwargs)
+    for pragma, value in settings.items():
+        if pragma not in WRITER_PRAGMAS:
+            conn.execute(f'PRAGMA {pragma} = {value}')
+    return conn